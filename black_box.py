@@ -0,0 +1,263 @@
+"""
+블랙박스 기록기 (BlackBoxRecorder)
+점프마다 디버그 이미지를 저장하는 대신, 마지막 몇 초의 ROI 프레임과 감지 값/동작을 미리 할당한
+NumPy 링 버퍼에 계속 덮어쓰고, 게임 오버/run() 예외/수동 키(Enter) 같은 트리거가 있을 때만
+파일 하나로 저장한다. 프레임당 비용은 링 버퍼 슬롯 하나로의 복사와 값 몇 개 기록뿐이다.
+
+저장 파일은 frame_recorder 기록과 같은 seq/t/frame 필드에 감지 값 필드를 더한 구조체 배열(.npy)이므로
+replay.py와 파일 재생 캡처 백엔드로 그대로 재생할 수 있다.
+
+사용법 (저장 파일 요약, 프레임을 PNG로 풀기):
+    python black_box.py blackbox/blackbox_20250101_120000_game_over.npy
+    python black_box.py blackbox/blackbox_20250101_120000_game_over.npy --png blackbox_frames
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from frame_recorder import recording_dtype
+
+# 동작 코드 (action 필드)
+ACTIONS = ('none', 'jump', 'duck')
+ACTION_NONE = 0
+ACTION_JUMP = 1
+ACTION_DUCK = 2
+ACTION_CODES = {None: ACTION_NONE, 'jump': ACTION_JUMP, 'duck': ACTION_DUCK}  # decide()의 동작 → 동작 코드
+
+# Enter 키 트리거 (표준 입력 감시 스레드는 여러 게임이 하나를 공유)
+_enter_callbacks = []
+_enter_lock = threading.Lock()
+_enter_thread = None
+
+
+def black_box_dtype(frame_shape):
+    """저장 레코드 자료형: frame_recorder 필드 + 감지 값/동작"""
+    return np.dtype(recording_dtype(frame_shape).descr + [
+        ('detect_ratio', '<f4'),
+        ('brightness', '<f4'),
+        ('speed_factor', '<f4'),
+        ('ttc_ms', '<f4'),  # 열 프로파일 감지기의 충돌까지 남은 시간 (없으면 NaN)
+        ('action', 'u1')
+    ])
+
+
+def on_enter(callback):
+    """Enter 키를 누를 때마다 callback 호출 (표준 입력이 없으면 아무 일도 하지 않음)"""
+    global _enter_thread
+    with _enter_lock:
+        _enter_callbacks.append(callback)
+        if _enter_thread is None:
+            _enter_thread = threading.Thread(target=_watch_enter, name='black-box-key', daemon=True)
+            _enter_thread.start()
+
+
+def _watch_enter():
+    while True:
+        try:
+            line = sys.stdin.readline()
+        except (OSError, ValueError):
+            return
+        if not line:
+            return  # 표준 입력이 닫힘 (파이프 등)
+        with _enter_lock:
+            callbacks = list(_enter_callbacks)
+        for callback in callbacks:
+            callback()
+
+
+class BlackBoxRecorder:
+    """
+    링 버퍼 기반 블랙박스 기록기
+
+    Args:
+        frame_shape: ROI 프레임 크기 (높이, 너비, 3)
+        seconds: 저장할 구간 (마지막 기록 기준 초, 게임 오버 감지의 freeze_time만큼 멈춘 화면이 포함됨)
+        max_frames: 링 버퍼 슬롯 수 (체크 간격이 가장 짧을 때도 seconds를 담을 만큼, 기본 600 = 70x35 ROI 기준 약 4.4MB)
+        folder: 저장 폴더
+        name: 파일 이름에 붙일 게임 이름 (여러 게임 동시 실행 시 구분용)
+        manual_key: Enter 키로 저장할지 여부
+        notify: 저장 안내를 넘길 함수 (kind, data) - 감지 루프에서 콘솔에 직접 쓰지 않도록 봇의 notify를 연결
+    """
+
+    def __init__(self, frame_shape, seconds=8.0, max_frames=600, folder='blackbox', name=None, manual_key=True,
+                 notify=None):
+        self.frame_shape = tuple(frame_shape)
+        self.seconds = seconds
+        self.capacity = max_frames
+        self.folder = folder
+        self.name = name
+        self.manual_key = manual_key
+        self.notify = notify
+
+        # 필드별 배열 (구조체 배열보다 슬롯 기록이 빠름, 저장할 때만 구조체로 합침)
+        self.frames = np.zeros((max_frames,) + self.frame_shape, dtype=np.uint8)
+        self.times = np.zeros(max_frames, dtype=np.float64)
+        self.detect_ratios = np.zeros(max_frames, dtype=np.float32)
+        self.brightness = np.zeros(max_frames, dtype=np.float32)
+        self.speed_factors = np.zeros(max_frames, dtype=np.float32)
+        self.ttc_ms = np.full(max_frames, np.nan, dtype=np.float32)
+        self.actions = np.zeros(max_frames, dtype=np.uint8)
+        self.count = 0  # 이번 게임에 기록한 프레임 수 (다음 슬롯 = count % capacity)
+        self.skipped = 0
+
+        self.dumps = []  # 저장한 파일 경로
+        self.dump_time = 0.0
+        self._writers = []
+
+    def start(self):
+        """수동 키 트리거 연결"""
+        if self.manual_key:
+            on_enter(lambda: self.dump('manual'))
+        return self
+
+    def append(self, frame, t, detect_ratio, brightness, speed_factor, ttc=None, action=None):
+        """
+        프레임 하나와 감지 값을 다음 슬롯에 기록 (크기가 다른 프레임은 건너뜀)
+
+        Args:
+            action: decide()가 고른 동작 ('jump', 'duck' 또는 None)
+
+        Returns:
+            int: 기록한 슬롯 번호 (건너뛰면 -1)
+        """
+        if frame.shape != self.frame_shape:
+            self.skipped += 1
+            return -1
+        slot = self.count % self.capacity
+        self.frames[slot] = frame
+        self.times[slot] = t
+        self.detect_ratios[slot] = detect_ratio
+        self.brightness[slot] = brightness
+        self.speed_factors[slot] = speed_factor
+        self.ttc_ms[slot] = ttc * 1000 if ttc is not None else np.nan
+        self.actions[slot] = ACTION_CODES[action]
+        self.count += 1
+        return slot
+
+    def clear(self):
+        """새 게임 시작 시 이전 게임 기록 버림 (버퍼는 재사용)"""
+        self.count = 0
+
+    def snapshot(self, extra_seconds=0.0):
+        """
+        마지막 seconds초(+ extra_seconds초)를 오래된 순서의 구조체 배열로 복사
+
+        Returns:
+            numpy.ndarray: black_box_dtype 레코드 (seq는 1부터)
+        """
+        # 저장 중에도 다른 스레드가 계속 기록하므로 개수를 먼저 고정 (수동 키 트리거)
+        count = self.count
+        filled = min(count, self.capacity)
+        order = np.arange(count - filled, count) % self.capacity
+        if filled:
+            order = order[self.times[order] >= self.times[order[-1]] - self.seconds - extra_seconds]
+
+        records = np.zeros(len(order), dtype=black_box_dtype(self.frame_shape))
+        records['seq'] = np.arange(1, len(order) + 1)
+        records['t'] = self.times[order]
+        records['frame'] = self.frames[order]
+        records['detect_ratio'] = self.detect_ratios[order]
+        records['brightness'] = self.brightness[order]
+        records['speed_factor'] = self.speed_factors[order]
+        records['ttc_ms'] = self.ttc_ms[order]
+        records['action'] = self.actions[order]
+        return records
+
+    def dump(self, reason, extra_seconds=0.0):
+        """
+        마지막 seconds초를 파일 하나로 저장 (복사만 호출한 스레드에서 하고 디스크 쓰기는 백그라운드)
+
+        Args:
+            reason: 트리거 이름 ('game_over', 'error', 'manual' 등, 파일 이름에 포함)
+            extra_seconds: 저장 구간을 이만큼 더 늘림 (게임 오버를 늦게 판단한 만큼 충돌 전 구간 유지)
+
+        Returns:
+            str: 저장할 파일 경로 (기록이 없으면 None)
+        """
+        start = time.perf_counter()
+        records = self.snapshot(extra_seconds)
+        if len(records) == 0:
+            return None
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        prefix = f"blackbox_{self.name}" if self.name else "blackbox"
+        path = os.path.join(self.folder, f"{prefix}_{timestamp}_{reason}.npy")
+        index = 1
+        while path in self.dumps or os.path.exists(path):
+            index += 1
+            path = os.path.join(self.folder, f"{prefix}_{timestamp}_{reason}_{index}.npy")
+        self.dumps.append(path)
+
+        writer = threading.Thread(target=self._write, args=(path, records), name='black-box', daemon=True)
+        writer.start()
+        self._writers.append(writer)
+        self.dump_time += time.perf_counter() - start
+        if self.notify is not None:
+            duration = records['t'][-1] - records['t'][0]
+            self.notify('black_box_dump', {"reason": reason, "path": path, "frames": len(records),
+                                           "duration_seconds": round(float(duration), 2)})
+        return path
+
+    def _write(self, path, records):
+        os.makedirs(self.folder, exist_ok=True)
+        np.save(path, records)
+
+    def close(self):
+        """진행 중인 저장 완료 대기"""
+        for writer in self._writers:
+            writer.join()
+        self._writers = []
+
+    def get_stats(self):
+        """기록/저장 통계"""
+        return {
+            "capacity": self.capacity,
+            "seconds": self.seconds,
+            "frames": self.count,
+            "skipped": self.skipped,
+            "dumps": list(self.dumps),
+            "dump_copy_ms": round(self.dump_time * 1000, 1)
+        }
+
+
+def main():
+    """저장 파일 요약 출력 (선택: 프레임을 PNG로 풀기)"""
+    parser = argparse.ArgumentParser(description="블랙박스 저장 파일을 요약합니다.")
+    parser.add_argument('path', help="블랙박스 저장 파일 (.npy)")
+    parser.add_argument('--png', help="프레임을 PNG로 저장할 폴더")
+    parser.add_argument('--last', type=int, default=10, help="출력할 마지막 프레임 수")
+    args = parser.parse_args()
+
+    records = np.load(args.path)
+    if len(records) == 0:
+        print("기록된 프레임이 없습니다.")
+        return
+    times = records['t']
+    actions = records['action']
+    print(f"{args.path}: {len(records)}프레임, 게임 경과 {times[0]:.2f}초 ~ {times[-1]:.2f}초")
+    print(f"  - 프레임 크기: {records['frame'].shape[1]} x {records['frame'].shape[2]}")
+    print(f"  - 점프 {int(np.count_nonzero(actions == ACTION_JUMP))}번, 웅크리기 {int(np.count_nonzero(actions == ACTION_DUCK))}번")
+    print(f"\n마지막 {min(args.last, len(records))}프레임:")
+    for record in records[-args.last:]:
+        ttc = '' if np.isnan(record['ttc_ms']) else f" | TTC {record['ttc_ms']:.0f}ms"
+        print(f"  {record['t']:8.3f}초 | 비율 {record['detect_ratio']*100:5.1f}% | 밝기 {record['brightness']:5.1f}"
+              f" | 속도 {record['speed_factor']:.2f}x{ttc} | {ACTIONS[record['action']]}")
+
+    if args.png:
+        import cv2
+
+        os.makedirs(args.png, exist_ok=True)
+        for record in records:
+            name = f"{record['seq']:04d}_{record['t']:.3f}_{ACTIONS[record['action']]}.png"
+            cv2.imwrite(os.path.join(args.png, name), cv2.cvtColor(record['frame'], cv2.COLOR_RGB2BGR))
+        print(f"\nPNG {len(records)}개 저장: {args.png}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,115 @@
 """
 Chrome Dino Game ROI Calibration Tool
 마우스 드래그로 게임 화면의 ROI(Region of Interest)를 설정하는 프로그램
+--auto를 주면 공룡과 지면 선을 템플릿 매칭으로 찾아 ROI를 자동으로 저장한다.
+
+큰 화면에서도 가볍게 동작하도록 스크린샷은 축소본으로 한 번만 만들고,
+선택 영역이 바뀔 때만 이전에 그린 부분을 되돌린 뒤 새로 그린다.
+미리보기('p')를 켜면 선택한 ROI를 계속 다시 캡처해 감지 결과를 보여주고, 트랙바로 임계값을 조정할 수 있다.
 """
 
 import cv2
 import numpy as np
 import pyautogui
-from PIL import ImageGrab
+import argparse
 import json
 import os
+import time
+
+from frame_source import create_frame_source
+from roi_locator import ROILocator
+from detection_engine import DetectionEngine
+
+# 화면 표시용 축소본의 최대 크기 (긴 변, px)
+DISPLAY_MAX_SIZE = 1600
+
+# 미리보기 창 너비 (px)와 ROI 다시 캡처 간격 (초)
+PREVIEW_WIDTH = 480
+PREVIEW_INTERVAL = 0.1
+PREVIEW_WINDOW = 'ROI Preview'
+
+# 감지 파라미터 기본값 (DinoGameBot/SpeedController 기본값과 같음)
+DEFAULT_DETECTION = {'threshold': 128, 'dark_ratio': 0.05, 'min_dark_ratio': 0.03}
+
 
 class ROICalibrator:
-    def __init__(self):
+    def __init__(self, config_file='roi_config.json', game_name=None):
+        """
+        Args:
+            config_file: ROI 설정 파일
+            game_name: 여러 게임 모드용 게임 이름 (지정하면 'games' 목록의 해당 항목에 ROI 저장)
+        """
+        self.config_file = config_file
+        self.game_name = game_name
         self.roi_coords = None
         self.start_point = None
         self.end_point = None
         self.drawing = False
+        self.anchor = None  # 자동 찾기로 찾은 공룡 위치 (실행 중 창 이동 감지 기준)
         self.screenshot = None
-        self.display_img = None
-        
+        self.display_base = None  # 화면 표시용 축소 스크린샷 (캡처할 때 한 번만 만듦)
+        self.display_img = None  # 선택 영역을 그린 표시 이미지
+        self.display_scale = 1.0  # 표시 이미지 / 원본 화면 배율
+        self.drawn_areas = []  # 표시 이미지에서 덧그린 영역 (다시 그릴 때 이 부분만 되돌림)
+        self.needs_redraw = True
+
+        # 기존 설정이 있으면 캡처 백엔드 등 나머지 항목을 유지
+        self.config = self.load_existing_config()
+        self.frame_source = create_frame_source(self.config.get('capture'))
+
+        # 미리보기/감지 파라미터 조정 상태
+        self.detection = {**DEFAULT_DETECTION, **self.load_detection_config()}
+        self.detection_changed = False
+        self.preview_enabled = False
+        self.preview_dirty = True
+        self.next_preview_time = 0.0
+        self.preview_gray = None
+        self.preview_engine = DetectionEngine(threshold=self.detection['threshold'])
+        self.preview_obstacle = False
+
+    def load_existing_config(self):
+        """기존 설정 파일 로드 (없으면 빈 설정)"""
+        if not os.path.exists(self.config_file):
+            return {}
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"기존 설정 파일을 읽을 수 없습니다: {e}")
+            return {}
+
+    def load_detection_config(self):
+        """기존 감지 파라미터 (게임 이름이 있으면 해당 게임 항목 우선)"""
+        detection = dict(self.config.get('detection', {}))
+        if self.game_name:
+            for game in self.config.get('games', []):
+                if game.get('name') == self.game_name:
+                    detection.update(game.get('detection', {}))
+        return detection
+
+    def to_screen(self, x, y):
+        """표시 이미지 좌표 → 원본 화면 좌표"""
+        return int(round(x / self.display_scale)), int(round(y / self.display_scale))
+
+    def to_display(self, point):
+        """원본 화면 좌표 → 표시 이미지 좌표"""
+        return int(round(point[0] * self.display_scale)), int(round(point[1] * self.display_scale))
+
     def mouse_callback(self, event, x, y, flags, param):
-        """마우스 이벤트 콜백 함수"""
+        """마우스 이벤트 콜백 함수 (표시 이미지 좌표를 원본 화면 좌표로 변환해 저장)"""
+        x, y = self.to_screen(x, y)
         if event == cv2.EVENT_LBUTTONDOWN:
             # 마우스 왼쪽 버튼을 누르면 시작점 설정
             self.drawing = True
             self.start_point = (x, y)
             self.end_point = (x, y)
+            self.needs_redraw = True
             
         elif event == cv2.EVENT_MOUSEMOVE:
             # 마우스를 움직이면 끝점 업데이트
-            if self.drawing:
+            if self.drawing and self.end_point != (x, y):
                 self.end_point = (x, y)
+                self.needs_redraw = True
                 
         elif event == cv2.EVENT_LBUTTONUP:
             # 마우스 왼쪽 버튼을 떼면 그리기 종료
@@ -43,48 +122,187 @@ class ROICalibrator:
             x2 = max(self.start_point[0], self.end_point[0])
             y2 = max(self.start_point[1], self.end_point[1])
             
-            self.roi_coords = (x1, y1, x2, y2)
+            self.roi_coords = (x1, y1, x2, y2) if x2 > x1 and y2 > y1 else None
+            self.anchor = None  # 직접 고른 ROI는 공룡 위치와 무관
+            self.needs_redraw = True
+            self.preview_dirty = True
+            if self.roi_coords is None:
+                return
             print(f"\n선택된 ROI 좌표: ({x1}, {y1}, {x2}, {y2})")
             print(f"ROI 크기: {x2-x1} x {y2-y1}")
     
     def capture_screen(self):
         """현재 화면을 캡처"""
         print("화면을 캡처하는 중...")
-        screenshot = ImageGrab.grab()
-        self.screenshot = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-        self.display_img = self.screenshot.copy()
-        print(f"화면 캡처 완료: {self.screenshot.shape[1]} x {self.screenshot.shape[0]}")
+        screenshot = self.frame_source.grab()
+        self.screen_rgb = screenshot
+        self.screenshot = cv2.cvtColor(screenshot, cv2.COLOR_RGB2BGR)
+
+        # 표시용 축소본 (이후 다시 그릴 때는 이 이미지의 일부만 복사)
+        height, width = self.screenshot.shape[:2]
+        self.display_scale = min(1.0, DISPLAY_MAX_SIZE / max(height, width))
+        if self.display_scale < 1.0:
+            size = (int(round(width * self.display_scale)), int(round(height * self.display_scale)))
+            self.display_base = cv2.resize(self.screenshot, size, interpolation=cv2.INTER_AREA)
+        else:
+            self.display_base = self.screenshot
+        self.display_img = self.display_base.copy()
+        self.drawn_areas = []
+        self.needs_redraw = True
+        stats = self.frame_source.get_latency_stats()
+        print(f"화면 캡처 완료: {self.screenshot.shape[1]} x {self.screenshot.shape[0]} ({stats['backend']}, {stats['last_ms']:.1f}ms)")
         
+    def auto_locate(self):
+        """
+        현재 캡처에서 공룡과 지면 선을 찾아 ROI 설정 (설정의 'locator' 항목으로 템플릿/배율 지정)
+
+        Returns:
+            bool: 찾았는지 여부
+        """
+        locator_config = self.config.get('locator', {})
+        template_path = locator_config.get('template', 'dino_template.png')
+        locator = ROILocator(**{**locator_config, 'template': template_path})
+
+        start = time.perf_counter()
+        result = locator.calibrate(self.screen_rgb)
+        elapsed = time.perf_counter() - start
+        if result is None:
+            print(f"\n공룡을 찾지 못했습니다 ({elapsed*1000:.0f}ms). 게임 화면이 보이는지 확인하거나 마우스로 직접 선택하세요.")
+            return False
+
+        roi, anchor = result['roi'], result['anchor']
+        self.roi_coords = (roi['x1'], roi['y1'], roi['x2'], roi['y2'])
+        self.start_point = (roi['x1'], roi['y1'])
+        self.end_point = (roi['x2'], roi['y2'])
+        self.anchor = anchor
+        self.needs_redraw = True
+        self.preview_dirty = True
+        print(f"\n공룡 위치: ({anchor['x']}, {anchor['y']}) 크기 {anchor['width']} x {anchor['height']} "
+              f"(배율 {anchor['scale']}, 점수 {anchor['score']:.2f}), 지면 y={anchor['ground_y']} ({elapsed*1000:.0f}ms)")
+        print(f"자동 ROI 좌표: ({roi['x1']}, {roi['y1']}, {roi['x2']}, {roi['y2']})")
+
+        # 템플릿 파일이 없으면 찾은 공룡 모양을 저장해 실행 중 위치 보정에 사용
+        if not os.path.exists(template_path):
+            locator.save_template(self.screen_rgb, anchor, template_path)
+            print(f"공룡 템플릿 저장: {template_path}")
+        return True
+
     def draw_rectangle(self):
-        """현재 선택 영역을 화면에 표시"""
+        """현재 선택 영역을 화면에 표시 (이전에 그린 부분만 축소본으로 되돌린 뒤 새로 그림)"""
+        for x1, y1, x2, y2 in self.drawn_areas:
+            self.display_img[y1:y2, x1:x2] = self.display_base[y1:y2, x1:x2]
+        self.drawn_areas = []
+
         if self.start_point and self.end_point:
-            self.display_img = self.screenshot.copy()
-            cv2.rectangle(
-                self.display_img,
-                self.start_point,
-                self.end_point,
-                (0, 255, 0),  # 녹색
-                2
-            )
-            
+            # 미리보기에서 장애물이 감지되면 빨간색, 아니면 녹색
+            color = (0, 0, 255) if self.preview_enabled and self.preview_obstacle else (0, 255, 0)
+            start = self.to_display(self.start_point)
+            end = self.to_display(self.end_point)
+            cv2.rectangle(self.display_img, start, end, color, 2)
+            self.mark_drawn(min(start[0], end[0]) - 2, min(start[1], end[1]) - 2,
+                            max(start[0], end[0]) + 3, max(start[1], end[1]) + 3)
+
             # 좌표 텍스트 표시
             if self.roi_coords:
                 x1, y1, x2, y2 = self.roi_coords
                 text = f"ROI: ({x1},{y1}) to ({x2},{y2})"
-                cv2.putText(
-                    self.display_img,
-                    text,
-                    (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.7,
-                    (0, 255, 0),
-                    2
-                )
+                (text_width, text_height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)
+                cv2.putText(self.display_img, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+                self.mark_drawn(8, 28 - text_height, 12 + text_width, 32 + baseline)
+
+    def mark_drawn(self, x1, y1, x2, y2):
+        """덧그린 영역 기록 (표시 이미지 범위로 자름)"""
+        height, width = self.display_img.shape[:2]
+        self.drawn_areas.append((max(x1, 0), max(y1, 0), min(x2, width), min(y2, height)))
+
+    # ------------------------------------------------------------------
+    # 실시간 미리보기 / 감지 파라미터 조정
+    # ------------------------------------------------------------------
+
+    def toggle_preview(self):
+        """미리보기 창 켜기/끄기 (트랙바로 감지 파라미터 조정)"""
+        if not self.preview_enabled and not self.roi_coords:
+            print("\n먼저 ROI를 선택하세요.")
+            return
+        self.preview_enabled = not self.preview_enabled
+        self.needs_redraw = True
+        if not self.preview_enabled:
+            cv2.destroyWindow(PREVIEW_WINDOW)
+            print("\n미리보기를 껐습니다.")
+            return
+
+        cv2.namedWindow(PREVIEW_WINDOW, cv2.WINDOW_AUTOSIZE)
+        cv2.createTrackbar('threshold', PREVIEW_WINDOW, int(self.detection['threshold']), 255,
+                           lambda value: self.set_detection('threshold', value))
+        cv2.createTrackbar('ratio x1000', PREVIEW_WINDOW, int(round(self.detection['dark_ratio'] * 1000)), 300,
+                           lambda value: self.set_detection('dark_ratio', value / 1000))
+        cv2.createTrackbar('min ratio x1000', PREVIEW_WINDOW, int(round(self.detection['min_dark_ratio'] * 1000)), 300,
+                           lambda value: self.set_detection('min_dark_ratio', value / 1000))
+        self.preview_gray = None
+        self.preview_dirty = True
+        self.next_preview_time = 0.0
+        print("\n미리보기를 켰습니다. 트랙바로 밝기 임계값(threshold)과 픽셀 비율 임계값(시작/최대 속도)을 조정하세요.")
+
+    def set_detection(self, key, value):
+        """트랙바 값 변경 (값이 바뀐 경우만 다시 그림)"""
+        if self.detection[key] == value:
+            return
+        self.detection[key] = value
+        self.preview_engine.threshold = self.detection['threshold']
+        self.detection_changed = True
+        self.preview_dirty = True
+
+    def update_preview(self, now):
+        """
+        ROI를 다시 캡처해 감지 결과를 미리보기 창에 표시
+        (PREVIEW_INTERVAL마다 캡처하고, 화면이나 파라미터가 바뀐 경우만 다시 그림)
+        """
+        if now < self.next_preview_time:
+            return
+        self.next_preview_time = now + PREVIEW_INTERVAL
+
+        x1, y1, x2, y2 = self.roi_coords
+        frame = self.frame_source.grab({'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2})
+        engine = self.preview_engine
+        gray = engine.convert(frame)
+        if not self.preview_dirty and self.preview_gray is not None and np.array_equal(gray, self.preview_gray):
+            return
+        self.preview_gray = gray.copy()
+        self.preview_dirty = False
+
+        # DinoGameBot.is_obstacle_detected와 같은 감지 엔진으로 판단 (배경 밝기 추적/다크 모드 포함)
+        _, detect_ratio = engine.classify()
+        obstacle_mask = engine.mask.astype(bool)
+        dark_ratio = np.count_nonzero(gray < self.detection['threshold']) / gray.size
+        ratio_threshold = self.detection['dark_ratio']
+        is_obstacle = detect_ratio > ratio_threshold
+
+        # 확대한 ROI에 장애물로 판단한 픽셀을 빨간색으로 덧칠하고 아래에 결과 표시
+        scale = max(PREVIEW_WIDTH // gray.shape[1], 1)
+        view = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+        view[obstacle_mask] = (view[obstacle_mask] // 2 + np.array([0, 0, 127], dtype=np.uint8))
+        view = cv2.resize(view, (gray.shape[1] * scale, gray.shape[0] * scale), interpolation=cv2.INTER_NEAREST)
+        panel = np.zeros((60, view.shape[1], 3), dtype=np.uint8)
+        color = (0, 0, 255) if is_obstacle else (0, 255, 0)
+        status = "OBSTACLE" if is_obstacle else "clear"
+        mode = f"{'night' if engine.dark_mode else 'day'}, background {engine.background:.0f}"
+        cv2.putText(panel, f"{status} ({mode})", (8, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+        cv2.putText(panel, f"dark {dark_ratio*100:.1f}%  detect {detect_ratio*100:.1f}% > {ratio_threshold*100:.1f}%"
+                    f" (max speed {self.detection['min_dark_ratio']*100:.1f}%)",
+                    (8, 48), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
+        cv2.imshow(PREVIEW_WINDOW, np.vstack([view, panel]))
+
+        # 감지 결과가 바뀐 경우만 메인 창 사각형 색을 다시 그림
+        if is_obstacle != self.preview_obstacle:
+            self.preview_obstacle = is_obstacle
+            self.needs_redraw = True
     
-    def save_roi(self, filename='roi_config.json'):
-        """ROI 좌표를 JSON 파일로 저장"""
+    def save_roi(self, filename=None):
+        """ROI 좌표를 JSON 파일로 저장 (기존 설정의 다른 항목은 유지)"""
+        filename = filename or self.config_file
         if self.roi_coords:
-            config = {
+            config = dict(self.config)
+            roi_entry = {
                 'roi': {
                     'x1': self.roi_coords[0],
                     'y1': self.roi_coords[1],
@@ -94,11 +312,39 @@ class ROICalibrator:
                 'width': self.roi_coords[2] - self.roi_coords[0],
                 'height': self.roi_coords[3] - self.roi_coords[1]
             }
-            
+            # 자동으로 찾은 경우만 공룡 위치를 저장 (직접 고른 ROI에는 이전 위치를 남기지 않음)
+            if self.anchor is not None:
+                roi_entry['anchor'] = self.anchor
+            # 미리보기에서 조정한 감지 파라미터
+            if self.detection_changed:
+                roi_entry['detection'] = dict(self.detection)
+            if self.game_name:
+                # 여러 게임 모드: 같은 이름의 게임 항목을 갱신하거나 새로 추가
+                games = [dict(game) for game in config.get('games', [])]
+                for game in games:
+                    if game.get('name') == self.game_name:
+                        game.pop('anchor', None)
+                        game.update(roi_entry)
+                        break
+                else:
+                    games.append({'name': self.game_name, **roi_entry})
+                config['games'] = games
+            else:
+                config.pop('anchor', None)
+                config.update(roi_entry)
+                # 열 프로파일 감지기의 공룡 앞쪽 위치도 함께 갱신
+                if self.anchor is not None and 'detector' in config:
+                    config['detector'] = {**config['detector'], 'dino_x': self.anchor['x'] + self.anchor['width']}
+            self.config = config
+
             with open(filename, 'w', encoding='utf-8') as f:
                 json.dump(config, f, indent=4, ensure_ascii=False)
             
-            print(f"\nROI 설정이 '{filename}' 파일에 저장되었습니다.")
+            target = f" (게임 '{self.game_name}')" if self.game_name else ""
+            print(f"\nROI 설정이 '{filename}' 파일에 저장되었습니다{target}.")
+            if self.detection_changed:
+                print(f"감지 파라미터: 밝기 임계값 {self.detection['threshold']}, "
+                      f"픽셀 비율 {self.detection['dark_ratio']*100:.1f}% ~ {self.detection['min_dark_ratio']*100:.1f}%")
             return True
         else:
             print("\n저장할 ROI가 선택되지 않았습니다.")
@@ -117,6 +363,8 @@ class ROICalibrator:
         print("5. 's' 키를 눌러 ROI를 저장합니다")
         print("6. 'q' 키를 눌러 종료합니다")
         print("7. 'r' 키를 눌러 다시 캡처합니다")
+        print("8. 'a' 키를 누르면 공룡과 지면을 찾아 ROI를 자동으로 선택합니다")
+        print("9. 'p' 키를 누르면 선택한 ROI의 실시간 감지 결과를 보며 임계값을 조정합니다")
         print("=" * 60)
         
         input("\n준비가 되면 Enter 키를 눌러주세요...")
@@ -132,18 +380,23 @@ class ROICalibrator:
         print("\n마우스로 드래그하여 ROI 영역을 선택하세요...")
         print("- 's' 키: ROI 저장")
         print("- 'r' 키: 화면 다시 캡처")
+        print("- 'a' 키: ROI 자동 찾기")
+        print("- 'p' 키: 실시간 미리보기/임계값 조정 켜기/끄기 (게임 화면이 창에 가려지지 않게 배치)")
         print("- 'q' 키: 종료")
         
         while True:
-            # 사각형 그리기
-            if self.drawing or self.roi_coords:
+            # 실시간 미리보기 (간격마다 ROI 다시 캡처)
+            if self.preview_enabled and self.roi_coords:
+                self.update_preview(time.perf_counter())
+
+            # 바뀐 것이 있을 때만 다시 그려서 표시
+            if self.needs_redraw:
                 self.draw_rectangle()
+                cv2.imshow(window_name, self.display_img)
+                self.needs_redraw = False
             
-            # 화면 표시
-            cv2.imshow(window_name, self.display_img)
-            
-            # 키 입력 대기
-            key = cv2.waitKey(1) & 0xFF
+            # 키 입력 대기 (창 이벤트 처리 포함)
+            key = cv2.waitKey(15) & 0xFF
             
             if key == ord('q'):
                 # 종료
@@ -159,18 +412,57 @@ class ROICalibrator:
                 # 화면 다시 캡처
                 self.capture_screen()
                 self.roi_coords = None
+                self.anchor = None
                 self.start_point = None
                 self.end_point = None
+                if self.preview_enabled:
+                    self.toggle_preview()
                 print("\n화면을 다시 캡처했습니다. ROI를 다시 선택하세요.")
+
+            elif key == ord('a'):
+                # ROI 자동 찾기 (확인 후 's'로 저장)
+                if self.auto_locate():
+                    print("자동 선택 완료! 's'를 눌러 저장하거나 마우스로 다시 선택하세요.")
+
+            elif key == ord('p'):
+                # 실시간 미리보기 켜기/끄기
+                self.toggle_preview()
         
         cv2.destroyAllWindows()
+        self.frame_source.close()
         print("\n캘리브레이션이 완료되었습니다!")
 
+    def run_auto(self):
+        """창 없이 화면을 캡처해 ROI를 자동으로 찾아 저장"""
+        print("=" * 60)
+        print("Chrome Dino Game ROI 자동 캘리브레이션")
+        print("=" * 60)
+        print("Chrome 브라우저에서 chrome://dino 페이지를 열고 공룡이 보이게 해주세요.")
+        input("\n준비가 되면 Enter 키를 눌러주세요...")
+
+        try:
+            self.capture_screen()
+            found = self.auto_locate() and self.save_roi()
+        finally:
+            self.frame_source.close()
+        if not found:
+            print("자동 캘리브레이션에 실패했습니다. 'python calibrate.py'로 직접 선택하세요.")
+        return found
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="마우스 드래그 또는 자동 찾기로 게임 ROI를 설정합니다.")
+    parser.add_argument('--config', default='roi_config.json', help="ROI 설정 파일")
+    parser.add_argument('--game', help="여러 게임 모드: 'games' 목록에 저장할 게임 이름")
+    parser.add_argument('--auto', action='store_true', help="공룡과 지면 선을 찾아 ROI를 자동으로 저장")
+    args = parser.parse_args()
+
     try:
-        calibrator = ROICalibrator()
-        calibrator.run()
+        calibrator = ROICalibrator(args.config, game_name=args.game)
+        if args.auto:
+            calibrator.run_auto()
+        else:
+            calibrator.run()
     except KeyboardInterrupt:
         print("\n\n사용자에 의해 중단되었습니다.")
     except Exception as e:
@@ -0,0 +1,293 @@
+"""
+비동기 디버그 이미지 저장기 (DebugImageWriter)
+게임 루프는 이미지를 큐에 넣기만 하고, 인코딩과 디스크 쓰기는 백그라운드 스레드에서 처리한다.
+이전 세션 디버그 폴더 정리(DebugFolderArchiver)도 시작을 막지 않도록 백그라운드에서 처리한다.
+"""
+
+import io
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+import zipfile
+from datetime import datetime
+
+import numpy as np
+
+
+class DebugImageWriter:
+    """
+    크기가 제한된 큐를 가진 백그라운드 디버그 이미지 저장기
+
+    Args:
+        folder: 저장 폴더
+        format: 'png' (PNG, 압축 레벨 조절), 'npy' (RGB 원본 배열),
+                'archive' (세션당 하나의 .npz 파일에 순서대로 추가)
+        png_compression: PNG 압축 레벨 (0~9, 낮을수록 빠름)
+        queue_size: 대기 큐 최대 크기
+        drop_policy: 큐가 가득 찼을 때 동작
+            'drop_newest' - 새 이미지를 버림, 'drop_oldest' - 가장 오래된 이미지를 버림,
+            'block' - 자리가 날 때까지 대기
+        notify: 저장 실패 안내를 넘길 함수 (kind, data, level) - 저장 스레드에서 콘솔에 직접 쓰지 않도록 봇의 notify를 연결
+    """
+
+    FORMATS = ('png', 'npy', 'archive')
+    DROP_POLICIES = ('drop_newest', 'drop_oldest', 'block')
+
+    def __init__(self, folder, format='png', png_compression=1, queue_size=64, drop_policy='drop_newest',
+                 notify=None):
+        if format not in self.FORMATS:
+            raise ValueError(f"알 수 없는 디버그 이미지 형식: {format} (사용 가능: {', '.join(self.FORMATS)})")
+        if drop_policy not in self.DROP_POLICIES:
+            raise ValueError(f"알 수 없는 드롭 정책: {drop_policy} (사용 가능: {', '.join(self.DROP_POLICIES)})")
+
+        self.folder = folder
+        self.format = format
+        self.png_compression = png_compression
+        self.drop_policy = drop_policy
+        self.notify = notify
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.archive_path = os.path.join(folder, 'session.npz') if format == 'archive' else None
+        self._archive = None
+        self._thread = None
+
+        # 통계
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.max_queue_depth = 0
+        self.total_write_time = 0.0
+
+    def start(self):
+        """백그라운드 저장 스레드 시작"""
+        if self._thread is not None:
+            return
+        if self.format == 'archive':
+            self._archive = zipfile.ZipFile(self.archive_path, 'w', compression=zipfile.ZIP_STORED)
+        self._thread = threading.Thread(target=self._write_loop, name='debug-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, roi_img, jump_count, game=None):
+        """
+        디버그 이미지를 저장 큐에 추가 (디스크 쓰기는 기다리지 않음)
+
+        Args:
+            jump_count: 이번 게임의 동작 번호
+            game: 게임 번호 (게임 오버 감지로 여러 판을 이어서 실행할 때, 파일 이름 앞에 붙여 판별로 정렬되게 함)
+
+        Returns:
+            str: 저장될 파일 이름 (큐가 가득 차 버려진 경우 None)
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        name = f"jump_{jump_count:04d}_{timestamp}"
+        if game is not None:
+            name = f"g{game:02d}_{name}"
+        # 캡처 버퍼는 재사용될 수 있으므로 복사본을 넣음
+        item = (name, np.array(roi_img, copy=True))
+        self.submitted += 1
+
+        if self.drop_policy == 'block':
+            self.queue.put(item)
+        else:
+            try:
+                self.queue.put_nowait(item)
+            except queue.Full:
+                if self.drop_policy == 'drop_newest':
+                    self.dropped += 1
+                    return None
+                # drop_oldest: 가장 오래된 항목을 버리고 다시 시도
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+                try:
+                    self.queue.put_nowait(item)
+                except queue.Full:
+                    self.dropped += 1
+                    return None
+
+        depth = self.queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+        return self._target_name(name)
+
+    def _target_name(self, name):
+        if self.format == 'png':
+            return os.path.join(self.folder, f"{name}.png")
+        if self.format == 'npy':
+            return os.path.join(self.folder, f"{name}.npy")
+        return f"{self.archive_path}:{name}"
+
+    def _write(self, name, roi_img):
+        if self.format == 'png':
+            import cv2
+
+            # RGB를 BGR로 변환 (OpenCV 저장용)
+            roi_bgr = cv2.cvtColor(roi_img, cv2.COLOR_RGB2BGR)
+            cv2.imwrite(self._target_name(name), roi_bgr, [cv2.IMWRITE_PNG_COMPRESSION, self.png_compression])
+        elif self.format == 'npy':
+            np.save(self._target_name(name), roi_img)
+        else:
+            # np.load(session.npz)로 읽을 수 있도록 .npy 항목으로 추가
+            buffer = io.BytesIO()
+            np.save(buffer, roi_img)
+            self._archive.writestr(f"{name}.npy", buffer.getvalue())
+
+    def _write_loop(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    break
+                start = time.perf_counter()
+                try:
+                    self._write(*item)
+                    self.written += 1
+                except Exception as e:
+                    self.dropped += 1
+                    if self.notify is not None:
+                        self.notify('debug_write_failed', {"name": item[0], "error": str(e)}, level='warning')
+                self.total_write_time += time.perf_counter() - start
+            finally:
+                self.queue.task_done()
+
+    def close(self):
+        """남은 이미지를 모두 저장한 뒤 스레드 종료"""
+        if self._thread is None:
+            return
+        self.queue.put(None)
+        self._thread.join()
+        self._thread = None
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def get_stats(self):
+        """저장기 통계 반환"""
+        return {
+            "format": self.format,
+            "submitted": self.submitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "avg_write_ms": round(self.total_write_time / self.written * 1000, 3) if self.written else 0.0
+        }
+
+
+class DebugFolderArchiver:
+    """
+    이전 세션 디버그 폴더 정리
+    기존 폴더는 같은 위치에서 타임스탬프 이름으로 바꾸기만 하고 (같은 파일 시스템이므로 즉시 끝남),
+    압축과 오래된 폴더 삭제는 백그라운드 스레드에서 처리한다.
+    압축은 임시 파일에 쓴 뒤 이름을 바꾸므로 도중에 종료되어도 다음 실행에서 다시 압축한다.
+
+    Args:
+        folder: 디버그 폴더
+        compress: True이면 이전 세션 폴더를 .zip으로 압축한 뒤 원본 폴더 삭제
+        keep: 남겨 둘 이전 세션 수 (폴더/압축 파일, None이면 모두 보관)
+        notify: 백그라운드 정리 실패 안내를 넘길 함수 (kind, data, level)
+    """
+
+    def __init__(self, folder, compress=False, keep=None, notify=None):
+        self.folder = os.path.normpath(folder)
+        self.compress = compress
+        self.keep = keep
+        self.notify = notify
+        self.archived_folder = None
+        self.compressed = 0
+        self.removed = 0
+        self.total_time = 0.0
+        self._thread = None
+        # 이전 세션 이름: '<폴더>_YYYYMMDD_HHMMSS' (같은 초에 겹치면 '_2' 등), 압축 시 '.zip'
+        self._pattern = re.compile(re.escape(os.path.basename(self.folder)) + r'_\d{8}_\d{6}(_\d+)?(\.zip)?$')
+
+    def prepare(self):
+        """기존 폴더 이름 변경 후 새 폴더 생성, 압축/정리할 이전 세션이 있으면 백그라운드 스레드 시작"""
+        if os.path.exists(self.folder):
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            target = f"{self.folder}_{timestamp}"
+            suffix = 2
+            while os.path.exists(target) or os.path.exists(f"{target}.zip"):
+                target = f"{self.folder}_{timestamp}_{suffix}"
+                suffix += 1
+            try:
+                os.rename(self.folder, target)
+            except OSError:
+                # 이름 변경이 안 되는 경우 (예: Windows에서 다른 프로그램이 폴더 안 파일을 열고 있음)
+                shutil.move(self.folder, target)
+            self.archived_folder = target
+            print(f"기존 디버그 폴더 이동: {self.folder} → {target}")
+
+        os.makedirs(self.folder)
+        print(f"디버그 폴더 생성: {self.folder}")
+
+        if self.compress or self.keep is not None:
+            self._thread = threading.Thread(target=self._archive_loop, name='debug-archive', daemon=True)
+            self._thread.start()
+
+    def _sessions(self):
+        """이전 세션 폴더/압축 파일 경로 (오래된 순)"""
+        parent = os.path.dirname(self.folder) or '.'
+        names = sorted(name for name in os.listdir(parent) if self._pattern.match(name))
+        return [os.path.join(parent, name) for name in names]
+
+    def _archive_loop(self):
+        start = time.perf_counter()
+        try:
+            sessions = self._sessions()
+            if self.keep is not None:
+                # 오래된 세션부터 삭제 (압축하기 전에 지워서 불필요한 압축을 피함)
+                excess = sessions[:max(len(sessions) - self.keep, 0)]
+                for path in excess:
+                    if os.path.isdir(path):
+                        shutil.rmtree(path, ignore_errors=True)
+                    else:
+                        os.remove(path)
+                    self.removed += 1
+                sessions = sessions[len(excess):]
+            if self.compress:
+                for path in sessions:
+                    if os.path.isdir(path):
+                        self._compress(path)
+        except Exception as e:
+            if self.notify is not None:
+                self.notify('debug_archive_failed', {"folder": self.folder, "error": str(e)}, level='warning')
+        self.total_time = time.perf_counter() - start
+
+    def _compress(self, path):
+        """폴더 하나를 .zip으로 압축 후 원본 삭제 (압축 중 종료되면 원본이 남아 다음 실행에서 다시 압축)"""
+        temp_path = f"{path}.zip.tmp"
+        with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    file_path = os.path.join(root, name)
+                    archive.write(file_path, os.path.relpath(file_path, path))
+        os.replace(temp_path, f"{path}.zip")
+        shutil.rmtree(path, ignore_errors=True)
+        self.compressed += 1
+
+    def wait(self, timeout=None):
+        """백그라운드 정리 완료 대기 (끝났으면 True)"""
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def is_busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_stats(self):
+        """정리 결과"""
+        return {
+            "archived_folder": self.archived_folder,
+            "compressed": self.compressed,
+            "removed": self.removed,
+            "busy": self.is_busy(),
+            "time_ms": round(self.total_time * 1000, 1)
+        }
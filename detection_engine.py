@@ -0,0 +1,219 @@
+"""
+할당 없는 감지 엔진 (DetectionEngine)
+ROI 크기에 맞춘 그레이스케일/차이/마스크/열 프로파일 버퍼를 한 번만 만들어 두고,
+매 프레임 OpenCV 연산을 dst= 인자로 같은 버퍼에 기록하므로 프레임마다 새 배열을 만들지 않는다.
+
+배경 밝기는 장애물이 아닌 픽셀 평균의 이동 평균(background)으로 추적한다. 배경과의 밝기 차이가
+(배경 ~ 밝기 임계값 거리, 최소 min_contrast)보다 큰 픽셀을 장애물로 보므로,
+낮에는 '임계값보다 어두운 픽셀', 밤에는 '임계값보다 밝은 픽셀'이 되어 기존 규칙과 같고
+낮/밤 전환 중의 중간 밝기도 배경을 따라가며 처리한다.
+배경이 임계값을 넘어가야 판단이 바뀌므로 큰 장애물이 잠깐 ROI를 덮어도 낮/밤이 뒤집히지 않고,
+ROI 대부분이 배경과 다르면(reseed_ratio 이상) 화면이 한 번에 바뀐 것으로 보고 배경을 바로 다시 잡는다.
+
+사용법 (프레임당 처리 시간과 임시 메모리 측정):
+    python detection_engine.py --frames 5000
+    python detection_engine.py --frames 5000 --stride 2
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+
+class DetectionEngine:
+    """
+    버퍼 재사용 장애물 픽셀 감지 + 배경 밝기 추적
+
+    Args:
+        threshold: 밝기 임계값 (0-255, 배경과 이 값의 거리가 장애물 판단 기준)
+        stride: 행 간격 (2 이상이면 행을 건너뛰어 처리, 열 해상도는 유지하여 열 프로파일/속도 측정에 영향 없음)
+        background_rate: 배경 밝기 추적 비율 (프레임당, 0~1, 낮/밤 전환 애니메이션을 따라갈 만큼 커야 함)
+        min_contrast: 배경과 이보다 가까운 밝기는 장애물로 보지 않음 (낮/밤 전환 중 노이즈 방지)
+        reseed_ratio: 장애물 픽셀 비율이 이 값 이상이면 배경을 이번 프레임 평균으로 다시 잡음
+    """
+
+    def __init__(self, threshold=128, stride=1, background_rate=0.3, min_contrast=40, reseed_ratio=0.95):
+        self.threshold = threshold
+        self.stride = max(int(stride), 1)
+        self.background_rate = background_rate
+        self.min_contrast = min_contrast
+        self.reseed_ratio = reseed_ratio
+
+        self.shape = None
+        self.gray = None  # 그레이스케일 (행 간격 적용)
+        self.mask = None  # 장애물 픽셀 마스크 (0/1 uint8)
+        self._diff = None  # 배경과의 밝기 차이
+        self._profile = None  # 열별 장애물 픽셀 수 (1, 너비) int32
+        self.allocation_count = 0  # 버퍼를 (다시) 만든 횟수 (ROI 크기가 바뀔 때만 증가)
+        self.frame_count = 0
+        self.reseed_count = 0
+        self.reset()
+
+    def reset(self):
+        """배경 추정 초기화 (새 게임 시작 시, 첫 프레임 평균으로 다시 잡음)"""
+        self.background = None
+        self.dark_mode = False
+
+    def _ensure_buffers(self, height, width):
+        """ROI 크기가 바뀐 경우만 버퍼 재할당"""
+        shape = ((height + self.stride - 1) // self.stride, width)
+        if self.shape == shape:
+            return
+        self.shape = shape
+        self.gray = np.empty(shape, dtype=np.uint8)
+        self._diff = np.empty(shape, dtype=np.uint8)
+        self.mask = np.empty(shape, dtype=np.uint8)
+        self._profile = np.empty((1, width), dtype=np.int32)
+        self.allocation_count += 1
+
+    def convert(self, roi_img):
+        """
+        그레이스케일 변환 (행 간격은 복사 없는 뷰로 적용)
+
+        Args:
+            roi_img: ROI 영역 이미지 (RGB)
+        """
+        self._ensure_buffers(roi_img.shape[0], roi_img.shape[1])
+        source = roi_img[::self.stride] if self.stride > 1 else roi_img
+        cv2.cvtColor(source, cv2.COLOR_RGB2GRAY, dst=self.gray)
+        return self.gray
+
+    def classify(self):
+        """
+        convert()한 프레임에서 장애물 픽셀 마스크 계산 후 배경 밝기 갱신
+
+        Returns:
+            tuple: (평균 밝기, 장애물 픽셀 비율)
+        """
+        gray = self.gray
+        total_pixels = gray.size
+        total = cv2.sumElems(gray)[0]
+        avg_brightness = total / total_pixels
+        if self.background is None:
+            self.background = avg_brightness
+
+        obstacle_pixels = self._update_mask()
+        if obstacle_pixels >= total_pixels * self.reseed_ratio:
+            # 화면 전체가 바뀜 (낮/밤 즉시 전환): 배경을 다시 잡고 같은 프레임을 다시 판단
+            self.background = avg_brightness
+            self.reseed_count += 1
+            obstacle_pixels = self._update_mask()
+        elif obstacle_pixels < total_pixels:
+            # 장애물이 아닌 픽셀 평균 = (전체 합 - 장애물 픽셀 합) / 나머지 픽셀 수
+            # (장애물 픽셀 합은 0/1 마스크를 곱한 차이 버퍼의 합, 마스크 평균 cv2.mean(mask=)보다 빠름)
+            obstacle_sum = 0.0
+            if obstacle_pixels:
+                cv2.multiply(gray, self.mask, dst=self._diff)
+                obstacle_sum = cv2.sumElems(self._diff)[0]
+            sample = (total - obstacle_sum) / (total_pixels - obstacle_pixels)
+            self.background += (sample - self.background) * self.background_rate
+        self.dark_mode = self.background < self.threshold
+        detect_ratio = obstacle_pixels / total_pixels
+
+        self.frame_count += 1
+        return avg_brightness, detect_ratio
+
+    def _update_mask(self):
+        """배경과의 밝기 차이가 (배경 ~ 임계값 거리) 이상인 픽셀을 장애물로 표시하고 개수 반환"""
+        contrast = max(abs(self.background - self.threshold), self.min_contrast)
+        cv2.absdiff(self.gray, self.background, dst=self._diff)
+        cv2.threshold(self._diff, contrast, 1, cv2.THRESH_BINARY, dst=self.mask)
+        return cv2.countNonZero(self.mask)
+
+    def process(self, roi_img):
+        """convert() + classify()"""
+        self.convert(roi_img)
+        return self.classify()
+
+    def column_profile(self):
+        """
+        열별 장애물 픽셀 수 (재사용 버퍼의 1차원 뷰, 다음 프레임에 덮어써짐)
+        행 간격을 쓰면 건너뛴 행은 세지 않는다.
+        """
+        cv2.reduce(self.mask, 0, cv2.REDUCE_SUM, dst=self._profile, dtype=cv2.CV_32S)
+        return self._profile[0]
+
+    def get_stats(self):
+        """버퍼/배경 추정 상태"""
+        return {
+            "frames": self.frame_count,
+            "buffer_allocations": self.allocation_count,
+            "reseeds": self.reseed_count,
+            "stride": self.stride,
+            "background": round(self.background, 1) if self.background is not None else None,
+            "dark_mode": self.dark_mode
+        }
+
+
+def measure_frames(step, frames):
+    """
+    프레임별 처리 시간과 임시 메모리 측정 (tracemalloc은 NumPy 배열 할당도 추적함)
+
+    Returns:
+        tuple: (프레임당 평균 시간 µs, 프레임당 최대 임시 메모리 bytes, 프레임당 평균 임시 메모리 bytes)
+    """
+    for frame in frames[:10]:
+        step(frame)  # 버퍼 준비
+
+    tracemalloc.start()
+    peaks = []
+    start = time.perf_counter()
+    for frame in frames:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        step(frame)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    return elapsed / len(frames) * 1e6, max(peaks), sum(peaks) / len(peaks)
+
+
+def main():
+    """기존 방식(매 프레임 새 배열)과 감지 엔진의 프레임당 비용 비교"""
+    from simulator import DinoSimulator
+
+    parser = argparse.ArgumentParser(description="감지 엔진의 프레임당 처리 시간과 메모리 할당을 측정합니다.")
+    parser.add_argument('--frames', type=int, default=2000, help="측정할 프레임 수")
+    parser.add_argument('--stride', type=int, default=1, help="행 간격")
+    parser.add_argument('--seed', type=int, default=0, help="시뮬레이터 시드")
+    args = parser.parse_args()
+
+    # 시뮬레이터로 ROI 프레임 생성 (게임 오버 시 다시 시작)
+    simulator = DinoSimulator(seed=args.seed)
+    roi = simulator.default_config()['roi']
+    frames = []
+    for _ in range(args.frames):
+        simulator.advance(0.05)
+        if simulator.game_over:
+            simulator.reset()
+        frames.append(simulator.render(roi).copy())
+
+    def legacy(frame):
+        # 기존 is_obstacle_detected: 변환/마스크/평균마다 새 배열
+        gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        avg_brightness = np.mean(gray)
+        dark_mask = gray < 128
+        dark_ratio = np.count_nonzero(dark_mask) / gray.size
+        profile = np.count_nonzero(dark_mask, axis=0)
+        return avg_brightness, dark_ratio, profile
+
+    engine = DetectionEngine(stride=args.stride)
+
+    def engine_step(frame):
+        result = engine.process(frame)
+        engine.column_profile()
+        return result
+
+    print(f"ROI {roi['x2'] - roi['x1']} x {roi['y2'] - roi['y1']}, {len(frames)}프레임")
+    for name, step in (("기존 방식", legacy), (f"감지 엔진 (행 간격 {engine.stride})", engine_step)):
+        per_frame_us, peak_bytes, mean_bytes = measure_frames(step, frames)
+        print(f"  - {name}: {per_frame_us:.1f}µs/프레임 | 임시 메모리 평균 {mean_bytes:.0f}B, 최대 {peak_bytes}B")
+    stats = engine.get_stats()
+    print(f"  - 버퍼 할당 {stats['buffer_allocations']}회, 배경 재설정 {stats['reseeds']}회")
+
+
+if __name__ == "__main__":
+    main()
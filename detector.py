@@ -0,0 +1,146 @@
+"""
+열 프로파일 장애물 감지기 (ColumnProfileDetector)
+ROI를 한 번의 벡터 연산으로 열별 장애물 픽셀 수 프로파일로 줄인 뒤,
+가장 가까운 장애물의 앞쪽 가장자리/폭/높이를 구하고 충돌까지 남은 시간(TTC)으로 점프 시점을 정한다.
+"""
+
+import numpy as np
+
+
+class ObstacleInfo:
+    """가장 가까운 장애물 측정 결과 (ROI 좌표, 픽셀 단위)"""
+
+    def __init__(self, leading_edge, width, height, pixel_ratio):
+        self.leading_edge = leading_edge  # ROI 왼쪽에서 장애물 앞쪽 가장자리까지 거리
+        self.width = width
+        self.height = height  # ROI 아래쪽부터 장애물 꼭대기까지 높이
+        self.pixel_ratio = pixel_ratio  # ROI 전체 대비 장애물 픽셀 비율
+        self.next_edge = None  # 그 뒤에 보이는 다음 장애물의 앞쪽 가장자리 (없으면 None)
+        self.distance = None  # 공룡 앞쪽까지 거리 (화면 좌표)
+        self.ttc = None  # 충돌까지 남은 시간 (초)
+
+
+class ColumnProfileDetector:
+    """
+    열 프로파일 기반 장애물 감지기
+
+    Args:
+        threshold: 밝기 임계값 (0-255, 감지 엔진이 장애물 마스크를 만들 때 사용)
+        min_column_pixels: 장애물 열로 인정할 최소 픽셀 수 (노이즈 제거)
+        gap_tolerance: 같은 장애물로 볼 열 사이 최대 빈 칸 수
+        base_speed: 속도 배율 1.0일 때 장애물 이동 속도 (화면 px/초)
+        dino_x: 공룡 앞쪽 가장자리의 화면 x 좌표 (None이면 기본 ROI의 왼쪽 가장자리)
+        jump_lead_time: 충돌까지 남은 시간이 이 값 이하가 되면 점프 (초, 입력 지연 포함)
+        strong_height_ratio: ROI 높이 대비 이 비율 이상 높은 장애물은 강한 점프
+        strong_width: 이 폭(px) 이상인 장애물(선인장 무리)은 강한 점프
+        min_check_interval: 장애물이 가까울 때 최소 체크 간격 (초)
+        max_idle_multiplier: 장애물이 멀 때 체크 간격을 최대 몇 배까지 늘릴지
+    """
+
+    def __init__(self, threshold=128, min_column_pixels=2, gap_tolerance=3, base_speed=360.0,
+                 dino_x=None, jump_lead_time=0.15, strong_height_ratio=0.9, strong_width=45,
+                 min_check_interval=0.005, max_idle_multiplier=3.0):
+        self.threshold = threshold
+        self.min_column_pixels = min_column_pixels
+        self.gap_tolerance = gap_tolerance
+        self.base_speed = base_speed
+        self.dino_x = dino_x
+        self.jump_lead_time = jump_lead_time
+        self.strong_height_ratio = strong_height_ratio
+        self.strong_width = strong_width
+        self.min_check_interval = min_check_interval
+        self.max_idle_multiplier = max_idle_multiplier
+
+        self.roi_height = 0
+        self.last_obstacle = None
+        self.last_profile = None
+        self.last_far_ttc = None  # 다음 장애물(ROI에 보이지 않으면 ROI 오른쪽 끝)의 TTC
+
+    def measure(self, obstacle_mask, profile=None, row_stride=1):
+        """
+        장애물 마스크를 열 프로파일로 줄여 가장 가까운 장애물 측정
+
+        Args:
+            obstacle_mask: 장애물 픽셀 마스크 (DetectionEngine.mask, 다크 모드도 이미 장애물 기준인 0/1 마스크)
+            profile: 미리 계산한 열별 장애물 픽셀 수 (None이면 마스크에서 계산)
+            row_stride: 마스크의 행 간격 (높이를 원래 픽셀 단위로 환산)
+
+        Returns:
+            ObstacleInfo 또는 장애물이 없으면 None
+        """
+        self.roi_height = obstacle_mask.shape[0] * row_stride
+
+        # 열별 장애물 픽셀 수 (한 번의 축소 연산)
+        if profile is None:
+            profile = np.count_nonzero(obstacle_mask, axis=0)
+        self.last_profile = profile
+        pixel_ratio = profile.sum() / obstacle_mask.size
+
+        columns = np.flatnonzero(profile >= self.min_column_pixels)
+        if len(columns) == 0:
+            return None
+
+        # 앞쪽 가장자리부터 빈 칸이 gap_tolerance를 넘기 전까지를 같은 장애물로 봄
+        leading_edge = int(columns[0])
+        gaps = np.flatnonzero(np.diff(columns) > self.gap_tolerance + 1)
+        trailing_edge = int(columns[gaps[0]]) if len(gaps) else int(columns[-1])
+
+        rows = np.flatnonzero(obstacle_mask[:, leading_edge:trailing_edge + 1].any(axis=1))
+        height = self.roi_height - int(rows[0]) * row_stride
+
+        obstacle = ObstacleInfo(leading_edge, trailing_edge - leading_edge + 1, height, pixel_ratio)
+        if len(gaps):
+            obstacle.next_edge = int(columns[gaps[0] + 1])
+        return obstacle
+
+    def estimate_ttc(self, obstacle, roi, base_roi, speed_factor):
+        """
+        장애물까지 거리와 충돌까지 남은 시간 계산 (장애물이 없으면 ROI 오른쪽 끝 기준 TTC만 갱신)
+
+        Args:
+            obstacle: measure() 결과 (None 가능)
+            roi: 현재(동적) ROI 화면 좌표
+            base_roi: 기본 ROI 화면 좌표
+            speed_factor: 현재 속도 배율
+        """
+        dino_x = self.dino_x if self.dino_x is not None else base_roi['x1']
+        speed = self.base_speed * speed_factor
+
+        next_x = roi['x2']
+        if obstacle is not None:
+            obstacle.distance = roi['x1'] + obstacle.leading_edge - dino_x
+            obstacle.ttc = obstacle.distance / speed
+            if obstacle.next_edge is not None:
+                next_x = roi['x1'] + obstacle.next_edge
+        self.last_far_ttc = (next_x - dino_x) / speed
+        self.last_obstacle = obstacle
+        return obstacle
+
+    def should_jump(self, obstacle):
+        """충돌까지 남은 시간이 점프 선행 시간 이하이면 점프"""
+        return obstacle is not None and obstacle.ttc <= self.jump_lead_time
+
+    def is_strong_jump(self, obstacle):
+        """높거나 넓은 장애물은 강한 점프"""
+        if obstacle is None:
+            return False
+        return (obstacle.height >= self.roi_height * self.strong_height_ratio
+                or obstacle.width >= self.strong_width)
+
+    def next_check_delay(self, check_interval):
+        """
+        다음 체크까지 대기 시간
+        장애물이 점프 시점에 가까우면 더 자주, 멀거나 없으면 덜 자주 확인하여 CPU를 절약
+        """
+        obstacle = self.last_obstacle
+        if obstacle is not None and obstacle.ttc is not None and obstacle.ttc > self.jump_lead_time:
+            until_jump = obstacle.ttc - self.jump_lead_time
+        elif self.last_far_ttc is not None:
+            # 가장 가까운 장애물은 이미 점프 시점을 지남 → 다음 장애물(또는 ROI 오른쪽 끝) 기준
+            until_jump = self.last_far_ttc - self.jump_lead_time
+        else:
+            return check_interval
+
+        if until_jump <= 0:
+            return check_interval
+        return min(max(until_jump, self.min_check_interval), check_interval * self.max_idle_multiplier)
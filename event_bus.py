@@ -0,0 +1,332 @@
+"""
+비블로킹 이벤트 버스 (EventBus)
+감지 루프는 점프/상태/모드 전환 같은 이벤트를 작은 레코드(종류, 수준, 게임 이름, 값)로 큐에 넣기만 하고,
+문자열 포맷팅, 수준 필터, 종류별 출력 빈도 제한, 콘솔 쓰기, JSON Lines 로그 파일 기록은
+백그라운드 스레드가 처리한다. 터미널이 느리거나 파이프가 막혀도 감지 루프는 기다리지 않는다.
+
+live_status를 켜면 상태 이벤트는 새 줄 대신 콘솔 마지막 한 줄을 덮어써서 표시한다 (다른 출력은 그 위로 올라감).
+
+설정 예 (roi_config.json):
+    "console": {"level": "info", "rate_limit": 5, "live_status": true, "status_interval": 1, "log_file": "events.jsonl"}
+
+사용법 (로그 파일 요약):
+    python event_bus.py events.jsonl
+    python event_bus.py events.jsonl --kind jump --last 20
+"""
+
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+
+from stage_timer import STAGE_LABELS
+
+# 로그 수준 (콘솔 출력 기준, 로그 파일에는 모든 수준 기록)
+LEVELS = {'debug': 10, 'info': 20, 'warning': 30, 'error': 40}
+
+
+def _format_status(data):
+    stages = " ".join(f"{STAGE_LABELS.get(stage, stage)} {p95:.2f}" for stage, p95 in data['stage_p95_ms'].items())
+    source_str = "측정" if data['speed_source'] == 'measured' else "시간"
+    return (f"[속도] {data['elapsed_seconds']:.0f}초 | {data['speed_factor']:.2f}x({source_str}) | "
+            f"모드: {'다크' if data['dark_mode'] else '라이트'} | ROI이동: +{data['roi_shift_px']}px | "
+            f"체크: {data['check_interval_ms']:.0f}ms | 캡처: {data['capture_avg_ms']:.1f}ms | "
+            f"마감초과: {data['overrun_ratio']*100:.1f}% | 지터: {data['avg_jitter_ms']:.2f}ms"
+            f"{f' | p95(ms) {stages}' if stages else ''}")
+
+
+def _format_detail(data):
+    mode_str = "밝은" if data['dark_mode'] else "어두운"
+    lines = [f"  - 평균 밝기: {data['brightness']:.1f}, {mode_str} 픽셀 비율: {data['detect_ratio']*100:.1f}%"]
+    if 'zone' in data:
+        lines.append(f"  - 구역: {data['zone']}")
+    if 'ttc_ms' in data:
+        lines.append(f"  - 장애물: 거리 {data['distance']}px, 폭 {data['width']}px, 높이 {data['height']}px, TTC {data['ttc_ms']:.0f}ms")
+    if 'debug_file' in data:
+        lines.append(f"  - 디버그 이미지 저장: {data['debug_file'] or '버림 (큐 가득 참 또는 처리 지연)'}")
+    return "\n".join(lines)
+
+
+# 이벤트 종류별 콘솔 메시지 (str.format 템플릿 또는 값 dict를 받는 함수, 없으면 종류와 값을 그대로 출력)
+MESSAGES = {
+    'jump': "{type} 점프! (총 {jump}번, {duration_ms:.0f}ms)",
+    'duck': "웅크리기! (총 {duck}번, {duration_ms:.0f}ms)",
+    'action_detail': _format_detail,
+    'status': _format_status,
+    'pipeline': ("[파이프라인] 캡처: {frames_captured} ({capture_fps:.1f}fps) | 처리: {frames_processed} | "
+                 "버림: {frames_dropped} | 지연: 평균 {avg_staleness_ms:.1f}ms / 최대 {max_staleness_ms:.1f}ms"),
+    'mode': lambda data: ("[모드 전환] 다크 모드 감지 → 밝은 픽셀 감지로 전환" if data['dark_mode']
+                          else "[모드 전환] 라이트 모드 감지 → 어두운 픽셀 감지로 전환"),
+    'drift': "[위치 보정] 창 이동 감지: ({dx:+d}, {dy:+d})px → ROI ({roi[x1]}, {roi[y1]}) ~ ({roi[x2]}, {roi[y2]})",
+    'game_over': "게임 오버 감지! ({game}판째, 생존 {survival_seconds:.1f}초, 점프 {jump_count}번) → {idle_interval_ms:.0f}ms 간격으로 대기",
+    'game_start': "새 게임 시작 ({game}판째)",
+    'games_done': "{max_games}판을 모두 마쳤습니다.",
+    'profile_reload': "속도 프로필 다시 불러옴: {name}",
+    'profile_reload_failed': "속도 프로필 다시 불러오기 실패 (이전 프로필 유지): {error}",
+    'debug_write_failed': "디버그 이미지 저장 실패: {name} ({error})",
+    'debug_archive_failed': "이전 디버그 폴더 정리 실패: {folder} ({error})",
+    'profiler_start': "샘플링 프로파일러 시작 (간격 {interval_ms:.1f}ms)",
+    'profiler_saved': "프로파일 저장: {output} ({samples}회 샘플링)",
+    'black_box_dump': "블랙박스 저장 ({reason}): {path} ({frames}프레임, {duration_seconds:.1f}초)",
+    'session_start': "세션 기록 시작: {path} (세션 #{run_id})",
+    'session_end': "플레이 결과 저장: {path} (세션 #{run_id}, 이벤트 {events}개, 버림 {dropped}개)",
+    'first_frame': "시작 시간: {startup}"
+}
+
+
+class EventBus:
+    """
+    큐 기반 이벤트 출력기 (콘솔 + JSON Lines 로그 파일)
+
+    Args:
+        level: 콘솔에 출력할 최소 수준 ('debug', 'info', 'warning', 'error')
+        rate_limit: 게임/종류별 초당 최대 콘솔 출력 수 (넘으면 건너뛰고 다음 출력에 생략 수 표시, 0이면 제한 없음)
+        live_status: 상태 이벤트를 콘솔 마지막 한 줄에 덮어써서 표시 (None이면 터미널일 때만)
+        status_interval: 상태 이벤트 간격 (초, 감지 루프가 참고, 한 줄 상태 표시일 때는 짧게)
+        log_file: 모든 이벤트를 기록할 JSON Lines 파일 경로 (None이면 기록하지 않음)
+        queue_size: 대기 이벤트 최대 개수 (가득 차면 새 이벤트를 버림)
+        stream: 콘솔 출력 대상 (None이면 sys.stdout)
+    """
+
+    def __init__(self, level='info', rate_limit=5.0, live_status=False, status_interval=None, log_file=None,
+                 queue_size=4096, stream=None):
+        if level not in LEVELS:
+            raise ValueError(f"알 수 없는 로그 수준: {level} (사용 가능: {', '.join(LEVELS)})")
+        self.level = level
+        self.min_level = LEVELS[level]
+        self.rate_limit = rate_limit
+        self.stream = stream
+        if live_status is None:
+            live_status = (stream or sys.stdout).isatty()
+        self.live_status = live_status
+        self.status_interval = status_interval if status_interval is not None else (1.0 if live_status else 10.0)
+        self.log_file = log_file
+        self.messages = dict(MESSAGES)
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._log = None
+        self._lock = threading.Lock()  # 백그라운드 스레드가 없을 때 바로 처리하는 경우용
+        self._buckets = {}  # (게임 이름, 종류) → [남은 출력 수, 마지막 충전 시각, 건너뛴 수]
+        self._status_parts = {}  # 게임 이름 → 상태 문자열 (live_status, 여러 게임이면 한 줄에 나란히)
+        self._status_line = ""  # 화면 마지막 줄에 표시 중인 상태
+
+        # 통계
+        self.emitted = 0
+        self.dropped = 0
+        self.printed = 0
+        self.suppressed = 0
+        self.max_queue_depth = 0
+
+    def start(self):
+        """백그라운드 출력 스레드 시작 (이전에는 emit()이 호출한 스레드에서 바로 처리)"""
+        if self._thread is not None:
+            return self
+        if self.log_file and self._log is None:
+            self._log = open(self.log_file, 'a', encoding='utf-8')
+        self._thread = threading.Thread(target=self._run, name='event-bus', daemon=True)
+        self._thread.start()
+        return self
+
+    def emit(self, kind, data=None, level='info', source=None, t=None):
+        """
+        이벤트 하나를 큐에 넣음 (포맷팅/출력은 기다리지 않음, 큐가 가득 차면 버림)
+
+        Args:
+            kind: 이벤트 종류 (MESSAGES의 키)
+            data: 메시지/로그 파일에 쓸 값 (JSON으로 바꿀 수 있는 dict)
+            level: 로그 수준
+            source: 게임 이름 (여러 게임 실행 시 출력 앞에 붙음)
+            t: 게임 경과 시간 (초, 로그 파일용)
+        """
+        self.emitted += 1
+        item = (time.time(), t, kind, level, source, data)
+        if self._thread is None:
+            with self._lock:
+                self._handle(item)
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            return
+        depth = self._queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+            try:
+                self._handle(item)
+            except Exception as e:
+                # 메시지 템플릿 오류로 출력 스레드가 멈추지 않도록 종류만 남김
+                self._write_line(f"[이벤트 출력 오류] {item[2]}: {e}")
+            finally:
+                self._queue.task_done()
+            if self._queue.empty():
+                self._flush()
+
+    def _handle(self, item):
+        """이벤트 하나 처리: 로그 파일 기록 → 수준/빈도 확인 → 포맷팅 후 콘솔 출력"""
+        wall, t, kind, level, source, data = item
+        if self._log is not None:
+            record = {"ts": round(wall, 3), "t": round(t, 3) if t is not None else None, "game": source,
+                      "kind": kind, "level": level, "data": data}
+            self._log.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        # 한 줄 상태는 제자리에서 덮어쓰므로 수준과 관계없이 표시 (조용한 콘솔에서도 진행 상황 확인용)
+        live = self.live_status and kind == 'status'
+        if not live and LEVELS.get(level, LEVELS['info']) < self.min_level:
+            return
+        skipped = 0
+        if not live:
+            skipped = self._take_token((source, kind), wall)
+            if skipped is None:
+                self.suppressed += 1
+                return
+
+        message = self.messages.get(kind)
+        if message is None:
+            text = f"{kind}: {json.dumps(data, ensure_ascii=False)}" if data else kind
+        elif callable(message):
+            text = message(data)
+        else:
+            text = message.format(**data) if data else message
+        prefix = f"[{source}] " if source else ""
+        if live:
+            self._status_parts[source] = prefix + text
+            self._show_status("  ||  ".join(self._status_parts.values()))
+            return
+        if skipped:
+            text += f" (이전 {skipped}개 생략)"
+        self._write_line("\n".join(prefix + line if line.strip() else line for line in text.split("\n")))
+
+    def _take_token(self, key, now):
+        """
+        종류별 출력 빈도 제한 (초당 rate_limit개, 같은 수만큼 몰아서 출력 가능)
+
+        Returns:
+            int: 출력 가능하면 직전에 건너뛴 수, 제한에 걸리면 None
+        """
+        if not self.rate_limit:
+            return 0
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.rate_limit, now, 0]
+        bucket[0] = min(bucket[0] + (now - bucket[1]) * self.rate_limit, self.rate_limit)
+        bucket[1] = now
+        if bucket[0] < 1.0:
+            bucket[2] += 1
+            return None
+        bucket[0] -= 1.0
+        skipped, bucket[2] = bucket[2], 0
+        return skipped
+
+    def _write_line(self, text):
+        """한 줄(또는 여러 줄) 출력, 한 줄 상태 표시 중이면 지우고 출력한 뒤 다시 그림"""
+        stream = self.stream or sys.stdout
+        if self._status_line:
+            stream.write("\r" + " " * len(self._status_line) + "\r")
+        stream.write(text + "\n")
+        if self._status_line:
+            stream.write(self._status_line)
+        if self._thread is None:
+            stream.flush()
+        self.printed += 1
+
+    def _show_status(self, text):
+        """콘솔 마지막 줄을 상태 줄로 덮어씀"""
+        stream = self.stream or sys.stdout
+        padding = max(len(self._status_line) - len(text), 0)
+        stream.write("\r" + text + " " * padding)
+        if self._thread is None:
+            stream.flush()
+        self._status_line = text
+        self.printed += 1
+
+    def _flush(self):
+        """큐가 비었을 때 콘솔/로그 파일 버퍼 비우기"""
+        try:
+            (self.stream or sys.stdout).flush()
+        except (OSError, ValueError):
+            pass
+        if self._log is not None:
+            self._log.flush()
+
+    def flush(self):
+        """지금까지 넣은 이벤트가 모두 출력될 때까지 대기 (종료 요약처럼 순서가 중요한 직접 출력 전에 호출)"""
+        if self._thread is not None:
+            self._queue.join()
+        self._flush()
+
+    def close(self):
+        """남은 이벤트를 출력하고 스레드/로그 파일 종료 (이후 emit()은 호출한 스레드에서 바로 처리)"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self._status_line:
+            # 한 줄 상태 표시를 남겨 두고 다음 출력은 새 줄에서 시작
+            (self.stream or sys.stdout).write("\n")
+            self._status_line = ""
+        self._flush()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def describe(self):
+        """설정 요약 (시작 안내용)"""
+        rate_str = f"종류별 초당 {self.rate_limit:g}줄" if self.rate_limit else "빈도 제한 없음"
+        if self.live_status:
+            status_str = f"한 줄 상태 ({self.status_interval:g}초마다)"
+        else:
+            status_str = f"상태 {self.status_interval:g}초마다"
+        log_str = f", 로그 파일 {self.log_file}" if self.log_file else ""
+        return f"수준 {self.level}, {rate_str}, {status_str}{log_str} (백그라운드 출력)"
+
+    def get_stats(self):
+        """출력 통계"""
+        return {
+            "level": self.level,
+            "emitted": self.emitted,
+            "printed": self.printed,
+            "suppressed": self.suppressed,
+            "dropped": self.dropped,
+            "max_queue_depth": self.max_queue_depth,
+            "log_file": self.log_file
+        }
+
+
+def main():
+    """JSON Lines 로그 파일 요약 (종류별 개수, 마지막 이벤트)"""
+    parser = argparse.ArgumentParser(description="이벤트 로그 파일(JSON Lines)을 요약합니다.")
+    parser.add_argument('path', help="이벤트 로그 파일 (.jsonl)")
+    parser.add_argument('--kind', help="이 종류의 이벤트만 출력")
+    parser.add_argument('--last', type=int, default=10, help="출력할 마지막 이벤트 수")
+    args = parser.parse_args()
+
+    with open(args.path, 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    counts = Counter((record['game'], record['kind']) for record in records)
+    print(f"{args.path}: 이벤트 {len(records)}개")
+    for (game, kind), count in sorted(counts.items(), key=lambda item: (str(item[0][0]), item[0][1])):
+        print(f"  - {f'[{game}] ' if game else ''}{kind}: {count}개")
+
+    if args.kind:
+        records = [record for record in records if record['kind'] == args.kind]
+    print(f"\n마지막 {min(args.last, len(records))}개:")
+    for record in records[-args.last:]:
+        t = f"{record['t']:8.2f}초" if record['t'] is not None else " " * 10
+        game = f"[{record['game']}] " if record['game'] else ""
+        print(f"  {t} | {record['level']:7s} | {game}{record['kind']} {json.dumps(record['data'], ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+프레임 기록기 (FrameRecorder)
+라이브 세션의 ROI 원본 프레임을 타임스탬프와 함께 메모리 맵 .npy 파일 하나에 기록한다.
+기록된 파일은 replay.py로 화면 없이 재생/벤치마크할 수 있다.
+"""
+
+import numpy as np
+
+
+def recording_dtype(frame_shape):
+    """기록 레코드 자료형: 프레임 번호(1부터, 0은 빈 레코드), 게임 경과 시간(초), 프레임"""
+    return np.dtype([
+        ('seq', '<u4'),
+        ('t', '<f8'),
+        ('frame', 'u1', tuple(frame_shape))
+    ])
+
+
+class FrameRecorder:
+    """
+    메모리 맵 프레임 기록기
+    파일 크기는 max_frames 기준으로 미리 할당되며, 가득 차면 기록을 멈춘다.
+
+    Args:
+        path: 기록 파일 경로 (.npy)
+        frame_shape: ROI 프레임 크기 (높이, 너비, 3)
+        max_frames: 최대 기록 프레임 수
+    """
+
+    def __init__(self, path, frame_shape, max_frames=20000):
+        self.path = path
+        self.frame_shape = tuple(frame_shape)
+        self.max_frames = max_frames
+        self.count = 0
+        self.skipped = 0
+        self._records = np.lib.format.open_memmap(
+            path, mode='w+', dtype=recording_dtype(self.frame_shape), shape=(max_frames,)
+        )
+        print(f"프레임 기록 시작: {path} (최대 {max_frames}프레임)")
+
+    def append(self, frame, timestamp):
+        """프레임 하나를 기록 (가득 찼거나 크기가 다르면 건너뜀)"""
+        if self._records is None or self.count >= self.max_frames or frame.shape != self.frame_shape:
+            self.skipped += 1
+            return False
+
+        self._records['frame'][self.count] = frame
+        self._records['t'][self.count] = timestamp
+        self._records['seq'][self.count] = self.count + 1
+        self.count += 1
+        return True
+
+    def close(self):
+        """기록 내용을 디스크에 반영하고 파일을 닫음"""
+        if self._records is None:
+            return
+        self._records.flush()
+        self._records = None
+        print(f"프레임 기록 저장: {self.path} ({self.count}프레임, 건너뜀 {self.skipped}개)")
+
+
+def load_recording(path):
+    """
+    기록 파일을 메모리 맵으로 열기
+
+    Returns:
+        numpy.ndarray: 실제로 기록된 레코드만 포함한 구조체 배열 (필드: seq, t, frame)
+    """
+    records = np.load(path, mmap_mode='r')
+    # 기록되지 않은 레코드(seq == 0)는 파일 끝에만 있으므로 앞부분만 사용
+    count = int(np.count_nonzero(records['seq']))
+    return records[:count]
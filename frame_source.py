@@ -0,0 +1,351 @@
+"""
+화면 캡처 백엔드 (FrameSource)
+설정(roi_config.json의 'capture' 항목)에 따라 캡처 방식을 선택하고,
+백엔드마다 캡처 1회당 지연 시간을 기록한다.
+
+모든 백엔드는 RGB uint8 배열 (높이, 너비, 3)을 반환한다.
+"""
+
+import glob
+import os
+import time
+
+import numpy as np
+
+
+class FrameSource:
+    """프레임 소스 기본 클래스 (캡처 지연 시간 측정 포함)"""
+
+    name = 'base'
+
+    def __init__(self):
+        self.grab_count = 0
+        self.total_grab_time = 0.0
+        self.last_grab_time = 0.0
+        self.max_grab_time = 0.0
+
+    def grab(self, region=None):
+        """
+        지정한 영역을 캡처
+
+        Args:
+            region: {'x1', 'y1', 'x2', 'y2'} 형식의 화면 좌표 (None이면 전체 화면)
+
+        Returns:
+            numpy.ndarray: RGB 이미지
+        """
+        start = time.perf_counter()
+        frame = self._grab(region)
+        elapsed = time.perf_counter() - start
+
+        self.grab_count += 1
+        self.total_grab_time += elapsed
+        self.last_grab_time = elapsed
+        if elapsed > self.max_grab_time:
+            self.max_grab_time = elapsed
+
+        return frame
+
+    def _grab(self, region):
+        raise NotImplementedError
+
+    def probe(self, region):
+        """
+        감지 루프의 캡처와 별개로 영역 하나를 캡처 (창 이동 감지용)
+        재생 위치, 재사용 버퍼, 캡처 지연 통계를 건드리지 않는다. 기본 구현은 매번 새 배열을 반환하는 백엔드용.
+
+        Returns:
+            numpy.ndarray: RGB 이미지
+        """
+        return self._grab(region)
+
+    def warm_up(self, region=None):
+        """
+        첫 캡처를 미리 수행 (백엔드 초기화 비용이 첫 프레임에 들어가지 않도록, 지연 통계에는 넣지 않음)
+
+        Returns:
+            numpy.ndarray: 캡처한 이미지 (감지 워밍업용)
+        """
+        frame = self.grab(region)
+        self.reset_stats()
+        return frame
+
+    def reset_stats(self):
+        """캡처 지연 통계 초기화"""
+        self.grab_count = 0
+        self.total_grab_time = 0.0
+        self.last_grab_time = 0.0
+        self.max_grab_time = 0.0
+
+    def get_latency_stats(self):
+        """캡처 지연 시간 통계 반환 (ms 단위)"""
+        avg = self.total_grab_time / self.grab_count if self.grab_count else 0.0
+        return {
+            "backend": self.name,
+            "grab_count": self.grab_count,
+            "avg_ms": round(avg * 1000, 3),
+            "last_ms": round(self.last_grab_time * 1000, 3),
+            "max_ms": round(self.max_grab_time * 1000, 3)
+        }
+
+    def close(self):
+        """백엔드 자원 해제"""
+        pass
+
+
+class FullScreenGrabSource(FrameSource):
+    """기존 방식: 전체 화면을 캡처한 뒤 ROI를 잘라냄 (비교용)"""
+
+    name = 'fullscreen'
+
+    def _grab(self, region):
+        from PIL import ImageGrab
+
+        screenshot_np = np.asarray(ImageGrab.grab().convert('RGB'))
+        if region is None:
+            return screenshot_np
+        return screenshot_np[region['y1']:region['y2'], region['x1']:region['x2']]
+
+
+class BBoxGrabSource(FrameSource):
+    """ImageGrab의 bbox 옵션으로 ROI 영역만 캡처"""
+
+    name = 'bbox'
+
+    def _grab(self, region):
+        from PIL import ImageGrab
+
+        if region is None:
+            image = ImageGrab.grab()
+        else:
+            image = ImageGrab.grab(bbox=(region['x1'], region['y1'], region['x2'], region['y2']))
+        # 이미 RGB이면 convert()의 이미지 복사를 건너뜀
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        return np.asarray(image)
+
+
+class MSSFrameSource(FrameSource):
+    """
+    mss 기반 캡처 (X11에서는 XShm 공유 메모리 사용)
+    미리 할당한 버퍼 하나에 결과를 기록하므로, 반환된 배열은 다음 grab() 호출 시 덮어써진다.
+    프레임을 보관하려면 호출 측에서 복사해야 한다.
+    """
+
+    name = 'mss'
+
+    def __init__(self, monitor=1):
+        super().__init__()
+        try:
+            import mss
+        except ImportError:
+            raise ImportError("'mss' 캡처 백엔드를 사용하려면 'pip install mss'로 설치해주세요.")
+
+        self._sct = mss.mss()
+        self.monitor = self._sct.monitors[monitor]
+        self._buffer = None
+
+    def _grab(self, region):
+        import cv2
+
+        bgra = self._shot(region)
+
+        # ROI 크기가 바뀔 때만 버퍼 재할당
+        if self._buffer is None or self._buffer.shape[:2] != bgra.shape[:2]:
+            self._buffer = np.empty(bgra.shape[:2] + (3,), dtype=np.uint8)
+
+        cv2.cvtColor(bgra, cv2.COLOR_BGRA2RGB, dst=self._buffer)
+        return self._buffer
+
+    def probe(self, region):
+        """감지 루프가 보고 있는 버퍼를 덮어쓰지 않도록 새 배열로 변환"""
+        import cv2
+
+        return cv2.cvtColor(self._shot(region), cv2.COLOR_BGRA2RGB)
+
+    def _shot(self, region):
+        if region is None:
+            area = self.monitor
+        else:
+            area = {
+                'left': region['x1'],
+                'top': region['y1'],
+                'width': region['x2'] - region['x1'],
+                'height': region['y2'] - region['y1']
+            }
+
+        shot = self._sct.grab(area)
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+    def close(self):
+        self._sct.close()
+
+
+class FileFrameSource(FrameSource):
+    """
+    파일 재생 소스 (화면 없이 테스트용)
+    이미지 폴더(png/jpg), .npy 파일(프레임 배열) 또는 frame_recorder 기록 파일에서 순서대로 프레임을 읽는다.
+
+    Args:
+        path: 이미지 폴더 또는 .npy 파일 경로
+        loop: 마지막 프레임 이후 처음부터 다시 재생할지 여부
+        crop: 프레임이 전체 화면 캡처인 경우 True (region으로 잘라냄)
+    """
+
+    name = 'file'
+
+    def __init__(self, path, loop=True, crop=False):
+        super().__init__()
+        self.path = path
+        self.loop = loop
+        self.crop = crop
+        self.index = 0
+
+        if os.path.isdir(path):
+            files = []
+            for pattern in ('*.png', '*.jpg', '*.jpeg', '*.bmp'):
+                files.extend(glob.glob(os.path.join(path, pattern)))
+            self._files = sorted(files)
+            self._frames = None
+            self.frame_count = len(self._files)
+        else:
+            self._files = None
+            self._frames = np.load(path, mmap_mode='r')
+            if self._frames.dtype.names:
+                # frame_recorder로 기록한 파일 (seq, t, frame 구조체)
+                from frame_recorder import load_recording
+
+                self._frames = load_recording(path)['frame']
+            self.frame_count = len(self._frames)
+
+        if self.frame_count == 0:
+            raise ValueError(f"재생할 프레임이 없습니다: {path}")
+
+    def _read_frame(self, index):
+        if self._frames is not None:
+            return np.asarray(self._frames[index])
+
+        import cv2
+
+        bgr = cv2.imread(self._files[index], cv2.IMREAD_COLOR)
+        return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+    def _grab(self, region):
+        if self.index >= self.frame_count:
+            if not self.loop:
+                raise EOFError("재생할 프레임이 더 이상 없습니다.")
+            self.index = 0
+
+        frame = self._read_frame(self.index)
+        self.index += 1
+
+        if self.crop and region is not None:
+            return frame[region['y1']:region['y2'], region['x1']:region['x2']]
+        return frame
+
+    def probe(self, region):
+        """재생 위치는 그대로 두고 마지막으로 재생한 프레임에서 잘라냄 (전체 화면 기록일 때만 의미 있음)"""
+        frame = self._read_frame(max(self.index - 1, 0))
+        if self.crop and region is not None:
+            return frame[region['y1']:region['y2'], region['x1']:region['x2']]
+        return frame
+
+    def warm_up(self, region=None):
+        """재생 위치는 그대로 두고 첫 프레임으로 워밍업"""
+        index = self.index
+        frame = super().warm_up(region)
+        self.index = index
+        return frame
+
+
+class SharedCapture:
+    """
+    여러 게임이 화면 캡처 한 번을 나눠 쓰기 위한 공유 캡처
+    매 틱마다 모든 ROI를 포함하는 최소 영역을 한 번만 캡처하고, 게임별 ROI는 복사 없이 잘라낸 뷰로 제공한다.
+
+    Args:
+        frame_source: 실제 캡처 백엔드
+    """
+
+    def __init__(self, frame_source):
+        self.frame_source = frame_source
+        self.frame = None
+        self.region = None
+
+    def grab(self, regions):
+        """
+        ROI 목록을 모두 포함하는 영역을 한 번 캡처
+
+        Args:
+            regions: {'x1', 'y1', 'x2', 'y2'} 목록
+        """
+        self.region = {
+            'x1': min(region['x1'] for region in regions),
+            'y1': min(region['y1'] for region in regions),
+            'x2': max(region['x2'] for region in regions),
+            'y2': max(region['y2'] for region in regions)
+        }
+        self.frame = self.frame_source.grab(self.region)
+        return self.frame
+
+    def view(self, region):
+        """마지막 캡처에서 ROI 부분을 잘라낸 뷰 (복사하지 않음)"""
+        origin = self.region
+        if (origin is None or region['x1'] < origin['x1'] or region['y1'] < origin['y1']
+                or region['x2'] > origin['x2'] or region['y2'] > origin['y2']):
+            raise ValueError(f"공유 캡처 영역 밖의 ROI입니다: {region}")
+        return self.frame[region['y1'] - origin['y1']:region['y2'] - origin['y1'],
+                          region['x1'] - origin['x1']:region['x2'] - origin['x1']]
+
+    def close(self):
+        self.frame_source.close()
+
+
+class SharedSliceSource(FrameSource):
+    """
+    공유 캡처의 게임별 ROI 뷰를 반환하는 소스 (캡처는 SharedCapture.grab()이 틱마다 한 번 수행)
+    설정의 'capture' 백엔드로는 선택할 수 없고, MultiGameRunner가 게임마다 직접 만들어 apply_config()에 넘긴다.
+    """
+
+    name = 'shared'
+
+    def __init__(self, shared):
+        super().__init__()
+        self.shared = shared
+
+    def _grab(self, region):
+        return self.shared.view(region)
+
+    def get_latency_stats(self):
+        """실제 캡처 지연은 공유 캡처 백엔드 기준"""
+        stats = self.shared.frame_source.get_latency_stats()
+        stats['backend'] = f"shared({stats['backend']})"
+        return stats
+
+
+FRAME_SOURCES = {
+    'fullscreen': FullScreenGrabSource,
+    'bbox': BBoxGrabSource,
+    'mss': MSSFrameSource,
+    'file': FileFrameSource
+}
+
+
+def create_frame_source(capture_config=None):
+    """
+    설정에 맞는 FrameSource 생성
+
+    Args:
+        capture_config: roi_config.json의 'capture' 항목
+            예) {"backend": "mss"}, {"backend": "file", "path": "debug_captures", "loop": true}
+
+    Returns:
+        FrameSource: 선택된 캡처 백엔드 (기본값: bbox)
+    """
+    options = dict(capture_config or {})
+    backend = options.pop('backend', 'bbox')
+
+    if backend not in FRAME_SOURCES:
+        raise ValueError(f"알 수 없는 캡처 백엔드: {backend} (사용 가능: {', '.join(FRAME_SOURCES)})")
+
+    return FRAME_SOURCES[backend](**options)
@@ -0,0 +1,134 @@
+"""
+게임 오버 감지와 자동 재시작 (GameMonitor)
+공룡이 부딪히면 Chrome 공룡 게임은 화면 전체가 멈추므로, ROI를 sample_step 간격으로 솎아낸 픽셀의
+체크섬(CRC32)이 freeze_time초 동안 바뀌지 않으면 게임 오버로 본다. 프레임당 비용은 수백 바이트의
+체크섬 한 번뿐이라 감지 루프에 영향이 없다.
+
+장애물 사이 빈 구간이나 게임 시작 직후(처음 몇 초는 장애물이 없음)도 ROI가 멈춰 보이므로,
+첫 점프 이후 또는 게임 시작 후 arm_time초가 지난 뒤에만 판단한다. 판단을 시작한 뒤에도 멈춘 화면만으로는
+게임 오버로 보지 않고 두 번째 신호가 있어야 한다.
+- 멈춘 화면에 장애물이 보이면 (감지 비율이 임계값 이상) freeze_time초
+- 장애물이 보이지 않으면 (빈 구간과 구분되지 않음) 그보다 훨씬 긴 long_freeze_time초
+
+게임 오버 중에는 감지/점프를 건너뛰고 idle_interval 간격으로 화면만 확인하며,
+auto_restart이면 restart_delay초 후 스페이스바를 눌러 다음 게임을 시작한다.
+직접 다시 시작해 화면이 바뀐 경우에도 새 게임으로 이어진다.
+
+설정 예 (roi_config.json):
+    "game_over": {"enabled": true, "freeze_time": 2.0, "long_freeze_time": 6.0, "auto_restart": true, "max_games": 50}
+"""
+
+import zlib
+
+
+class GameMonitor:
+    """
+    멈춘 화면 감지 기반 게임 오버/재시작 상태 관리
+
+    Args:
+        freeze_time: 장애물이 보이는 ROI가 이 시간(초) 동안 바뀌지 않으면 게임 오버
+        long_freeze_time: 장애물이 보이지 않는 ROI는 이 시간(초) 동안 바뀌지 않아야 게임 오버 (장애물 사이 최대 간격보다 길어야 함)
+        arm_time: 점프가 없어도 이 시간(초)이 지나면 판단 시작 (시작 직후 빈 화면 구간 제외)
+        sample_step: 체크섬에 사용할 픽셀 간격 (행/열)
+        idle_interval: 게임 오버 중 화면 확인 간격 (초)
+        auto_restart: 게임 오버 후 스페이스바를 눌러 자동으로 다시 시작
+        restart_delay: 게임 오버 감지 후 재시작 키를 누르기까지 대기 시간 (초, Chrome은 직후 입력을 무시함)
+        max_games: 이 판수를 마치면 종료 (0이면 제한 없음)
+    """
+
+    PLAYING = 'playing'
+    OVER = 'over'
+    RESTART_KEY_DURATION = 0.05  # 재시작 키를 누르고 있는 시간 (초, Chrome은 키를 뗄 때 다시 시작)
+
+    def __init__(self, freeze_time=2.0, long_freeze_time=6.0, arm_time=8.0, sample_step=4, idle_interval=0.25,
+                 auto_restart=True, restart_delay=1.0, max_games=0):
+        self.freeze_time = freeze_time
+        self.long_freeze_time = max(long_freeze_time, freeze_time)
+        self.arm_time = arm_time
+        self.sample_step = max(int(sample_step), 1)
+        self.idle_interval = idle_interval
+        self.auto_restart = auto_restart
+        self.restart_delay = restart_delay
+        self.max_games = max_games
+
+        self.state = self.PLAYING
+        self.game_start = None
+        self.last_change = None  # 마지막으로 화면이 바뀐 시각 (게임 오버 시 충돌 시각)
+        self.last_checksum = None
+        self.over_at = None
+        self.games = 0  # 끝난 게임 수
+        self.restarts = 0  # 자동 재시작 키 입력 횟수
+        self.survival_times = []
+
+    def checksum(self, frame):
+        """솎아낸 픽셀의 CRC32 (ROI 70x35 기준 약 500바이트)"""
+        step = self.sample_step
+        return zlib.crc32(frame[::step, ::step].tobytes())
+
+    def start_game(self, now):
+        """새 게임 시작 (판단 대기 시간부터 다시 셈)"""
+        self.state = self.PLAYING
+        self.game_start = now
+        self.last_change = now
+        self.over_at = None
+
+    def update(self, frame, now, jumped=False, obstacle=False):
+        """
+        프레임 하나로 상태 갱신
+
+        Args:
+            frame: ROI 이미지
+            now: 현재 시각 (초)
+            jumped: 이번 게임에서 점프한 적이 있는지 (있으면 arm_time을 기다리지 않음)
+            obstacle: 이 프레임에 장애물이 보이는지 (멈춘 화면이면 직전 판단의 감지 비율 기준, 있으면 freeze_time만 기다림)
+
+        Returns:
+            str: 'game_over' (방금 게임 오버), 'resumed' (게임 오버 중 화면이 바뀜), 아니면 None
+        """
+        checksum = self.checksum(frame)
+        changed = checksum != self.last_checksum
+        self.last_checksum = checksum
+
+        if self.state == self.OVER:
+            return 'resumed' if changed else None
+
+        if changed:
+            self.last_change = now
+            return None
+        armed = jumped or now - self.game_start >= self.arm_time
+        # 빈 구간도 화면이 멈추므로 장애물이 보이지 않으면 더 오래 멈춰야 게임 오버
+        freeze_time = self.freeze_time if obstacle else self.long_freeze_time
+        if armed and now - self.last_change >= freeze_time:
+            self.state = self.OVER
+            self.over_at = now
+            self.games += 1
+            self.survival_times.append(self.survival_time())
+            return 'game_over'
+        return None
+
+    def survival_time(self):
+        """게임 시작 → 마지막 화면 변화(충돌)까지의 시간 (초)"""
+        return max(self.last_change - self.game_start, 0.0)
+
+    def is_idle(self):
+        """게임 오버 대기 중 여부"""
+        return self.state == self.OVER
+
+    def is_finished(self):
+        """정해진 판수를 모두 마쳤는지 여부"""
+        return bool(self.max_games) and self.games >= self.max_games
+
+    def restart_due(self, now):
+        """자동 재시작 키를 누를 때인지 여부"""
+        return (self.auto_restart and self.state == self.OVER and not self.is_finished()
+                and now - self.over_at >= self.restart_delay)
+
+    def get_stats(self):
+        """판수/생존 시간 통계"""
+        times = self.survival_times
+        return {
+            "games": self.games,
+            "restarts": self.restarts,
+            "mean_survival_seconds": round(sum(times) / len(times), 1) if times else None,
+            "max_survival_seconds": round(max(times), 1) if times else None
+        }
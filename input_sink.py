@@ -0,0 +1,288 @@
+"""
+키 입력 백엔드 (InputSink)와 비동기 입력 스케줄러 (InputScheduler)
+키를 즉시 누르고, 지정한 시각(deadline)에 떼는 동작을 감지 루프와 분리해서 처리한다.
+"""
+
+import json
+import threading
+import time
+
+
+class InputSink:
+    """키 입력 백엔드 기본 클래스"""
+
+    name = 'base'
+
+    def key_down(self, key):
+        raise NotImplementedError
+
+    def key_up(self, key):
+        raise NotImplementedError
+
+    def warm_up(self):
+        """키를 누르지 않고 백엔드 호출 경로를 미리 준비 (카운트다운 중 호출)"""
+        pass
+
+    def close(self):
+        """백엔드 자원 해제"""
+        pass
+
+
+class PyAutoGUISink(InputSink):
+    """
+    pyautogui 기반 실제 키 입력
+
+    Args:
+        pause: pyautogui 호출마다 붙는 대기 시간 (pyautogui 기본값 0.1초는 입력 지연이 되므로 0 권장)
+        focus: 키 입력 전에 클릭해 포커스를 옮길 화면 좌표 [x, y] (여러 게임 창을 동시에 실행할 때)
+    """
+
+    name = 'pyautogui'
+
+    # 여러 게임이 입력 백엔드를 나눠 쓸 때 포커스 이동과 키 입력을 한 번에 처리
+    _focus_lock = threading.Lock()
+    _focused = None
+
+    def __init__(self, pause=0.0, focus=None):
+        import pyautogui
+
+        self._pyautogui = pyautogui
+        self.focus = tuple(focus) if focus else None
+        if pause is not None:
+            pyautogui.PAUSE = pause
+
+    def _send(self, action, key):
+        if self.focus is None:
+            action(key)
+            return
+        with PyAutoGUISink._focus_lock:
+            if PyAutoGUISink._focused != self.focus:
+                self._pyautogui.click(*self.focus)
+                PyAutoGUISink._focused = self.focus
+            action(key)
+
+    def key_down(self, key):
+        self._send(self._pyautogui.keyDown, key)
+
+    def key_up(self, key):
+        self._send(self._pyautogui.keyUp, key)
+
+    def warm_up(self):
+        # 마우스 위치 조회로 플랫폼 백엔드(디스플레이 연결 등) 초기화 (입력은 보내지 않음)
+        self._pyautogui.position()
+
+
+class RecordingSink(InputSink):
+    """
+    화면 없이 테스트하기 위한 기록용 입력 백엔드
+    실제 키를 누르지 않고 (시각, 동작, 키) 이벤트를 기록한다.
+
+    Args:
+        log_file: 종료 시 이벤트를 JSONL로 저장할 파일 (None이면 저장하지 않음)
+        clock: 시각 함수 (시뮬레이션 시간을 쓰려면 교체)
+    """
+
+    name = 'recording'
+
+    def __init__(self, log_file=None, clock=time.perf_counter):
+        self.log_file = log_file
+        self.clock = clock
+        self.events = []
+        self.held = set()
+
+    def key_down(self, key):
+        self.events.append((self.clock(), 'down', key))
+        self.held.add(key)
+
+    def key_up(self, key):
+        self.events.append((self.clock(), 'up', key))
+        self.held.discard(key)
+
+    def close(self):
+        if not self.log_file:
+            return
+        with open(self.log_file, 'w', encoding='utf-8') as f:
+            for timestamp, action, key in self.events:
+                f.write(json.dumps({"t": round(timestamp, 6), "action": action, "key": key}) + "\n")
+        print(f"입력 이벤트 기록 저장: {self.log_file} ({len(self.events)}개)")
+
+
+INPUT_SINKS = {
+    'pyautogui': PyAutoGUISink,
+    'recording': RecordingSink
+}
+
+
+def create_input_sink(input_config=None):
+    """
+    설정에 맞는 InputSink 생성
+
+    Args:
+        input_config: roi_config.json의 'input' 항목
+            예) {"backend": "pyautogui"}, {"backend": "recording", "log_file": "input_log.jsonl"}
+
+    Returns:
+        InputSink: 선택된 입력 백엔드 (기본값: pyautogui)
+    """
+    options = dict(input_config or {})
+    backend = options.pop('backend', 'pyautogui')
+    options.pop('threaded', None)
+
+    if backend not in INPUT_SINKS:
+        raise ValueError(f"알 수 없는 입력 백엔드: {backend} (사용 가능: {', '.join(INPUT_SINKS)})")
+
+    return INPUT_SINKS[backend](**options)
+
+
+class InputScheduler:
+    """
+    키 누름/뗌 예약 스케줄러
+    press()는 키를 즉시 누르고 떼는 시각만 예약한 뒤 바로 반환한다.
+    threaded=True이면 백그라운드 스레드가 예약 시각에 키를 떼고,
+    False이면 호출 측이 poll()을 주기적으로 불러야 한다 (시뮬레이션 시간용).
+
+    Args:
+        sink: InputSink 인스턴스
+        clock: 시각 함수
+        threaded: 백그라운드 해제 스레드 사용 여부
+    """
+
+    def __init__(self, sink, clock=time.perf_counter, threaded=True):
+        self.sink = sink
+        self.clock = clock
+        self.threaded = threaded
+        self.deadlines = {}  # 누르고 있는 키 → 뗄 시각
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+        # 통계
+        self.press_count = 0
+        self.total_press_latency = 0.0
+        self.max_press_latency = 0.0
+        self.release_count = 0
+        self.total_release_lag = 0.0
+        self.max_release_lag = 0.0
+
+    def start(self):
+        """백그라운드 해제 스레드 시작"""
+        if not self.threaded or self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._release_loop, name='input-release', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """누르고 있는 키를 모두 떼고 스레드 종료"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.release_all()
+
+    def is_held(self, key):
+        """키를 누르고 있는지 여부"""
+        with self._cond:
+            return key in self.deadlines
+
+    def press(self, key, duration):
+        """
+        키를 즉시 누르고 duration초 후에 떼도록 예약
+        이미 누르고 있는 키면 떼는 시각만 늦춤
+
+        Returns:
+            float: 키를 뗄 예정 시각
+        """
+        with self._cond:
+            now = self.clock()
+            deadline = now + duration
+            if key in self.deadlines:
+                self.deadlines[key] = max(self.deadlines[key], deadline)
+            else:
+                self.sink.key_down(key)
+                latency = self.clock() - now
+                self.press_count += 1
+                self.total_press_latency += latency
+                if latency > self.max_press_latency:
+                    self.max_press_latency = latency
+                self.deadlines[key] = deadline
+            self._cond.notify_all()
+            return self.deadlines[key]
+
+    def extend(self, key, extra):
+        """누르고 있는 키의 떼는 시각을 extra초 연장 (누르고 있지 않으면 False)"""
+        with self._cond:
+            if key not in self.deadlines:
+                return False
+            self.deadlines[key] += extra
+            self._cond.notify_all()
+            return True
+
+    def cancel(self, key):
+        """누르고 있는 키를 즉시 뗌 (누르고 있지 않으면 False)"""
+        with self._cond:
+            if key not in self.deadlines:
+                return False
+            del self.deadlines[key]
+            self.sink.key_up(key)
+            self._cond.notify_all()
+            return True
+
+    def jump(self, duration):
+        """점프: 웅크리기 중이면 먼저 해제하고 스페이스바를 누름"""
+        self.cancel('down')
+        return self.press('space', duration)
+
+    def duck(self, duration):
+        """웅크리기: 점프 중이면 스페이스바를 떼고 아래 화살표를 누름 (공중에서는 빠른 착지)"""
+        self.cancel('space')
+        return self.press('down', duration)
+
+    def poll(self):
+        """예약 시각이 지난 키를 뗌 (threaded=False일 때 루프에서 호출)"""
+        with self._cond:
+            now = self.clock()
+            for key, deadline in list(self.deadlines.items()):
+                if now >= deadline:
+                    self._release(key, deadline, now)
+            return self._next_deadline()
+
+    def release_all(self):
+        """누르고 있는 키를 모두 뗌"""
+        with self._cond:
+            for key in list(self.deadlines):
+                self.cancel(key)
+
+    def _release(self, key, deadline, now):
+        del self.deadlines[key]
+        self.sink.key_up(key)
+        lag = now - deadline
+        self.release_count += 1
+        self.total_release_lag += lag
+        if lag > self.max_release_lag:
+            self.max_release_lag = lag
+
+    def _next_deadline(self):
+        return min(self.deadlines.values()) if self.deadlines else None
+
+    def _release_loop(self):
+        with self._cond:
+            while self._running:
+                next_deadline = self.poll()
+                if next_deadline is None:
+                    self._cond.wait()
+                else:
+                    self._cond.wait(max(0.0, next_deadline - self.clock()))
+
+    def get_stats(self):
+        """입력 지연 통계 반환 (ms 단위)"""
+        return {
+            "backend": self.sink.name,
+            "press_count": self.press_count,
+            "avg_press_latency_ms": round(self.total_press_latency / self.press_count * 1000, 3) if self.press_count else 0.0,
+            "max_press_latency_ms": round(self.max_press_latency * 1000, 3),
+            "avg_release_lag_ms": round(self.total_release_lag / self.release_count * 1000, 3) if self.release_count else 0.0,
+            "max_release_lag_ms": round(self.max_release_lag * 1000, 3)
+        }
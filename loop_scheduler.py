@@ -0,0 +1,118 @@
+"""
+마감 시각 기반 루프 스케줄러 (LoopScheduler)
+작업이 끝난 뒤 체크 간격만큼 자는 대신, perf_counter로 다음 프레임 마감 시각을 정해
+작업에 걸린 시간을 빼고 남은 시간만 대기한다. 마지막 구간은 선택적으로 바쁜 대기(spin)로 맞추고,
+마감 초과(overrun)와 깨어난 시각의 오차(jitter)를 기록하며,
+마감을 자주 넘기면 선택 작업(상태 출력, 디버그 이미지 저장)을 건너뛰도록 알려준다.
+"""
+
+import time
+
+
+class LoopScheduler:
+    """
+    고정 마감 시각 루프 스케줄러
+
+    Args:
+        spin_wait: 마감 직전 이 시간(초)은 sleep 대신 바쁜 대기 (0이면 sleep만 사용)
+        shed_overrun_ratio: 최근 마감 초과 비율이 이 값 이상이면 선택 작업을 건너뜀
+        overrun_smoothing: 최근 마감 초과 비율의 지수 평활 계수
+        clock: 시각 함수 (기본값: time.perf_counter)
+    """
+
+    def __init__(self, spin_wait=0.0005, shed_overrun_ratio=0.2, overrun_smoothing=0.1,
+                 clock=time.perf_counter):
+        self.spin_wait = spin_wait
+        self.shed_overrun_ratio = shed_overrun_ratio
+        self.overrun_smoothing = overrun_smoothing
+        self.clock = clock
+
+        self.deadline = None
+        self.overrun_rate = 0.0  # 최근 마감 초과 비율 (지수 평활)
+        self.tick_count = 0
+        self.overrun_count = 0
+        self.total_overrun = 0.0
+        self.max_overrun = 0.0
+        self.wait_count = 0
+        self.total_jitter = 0.0
+        self.max_jitter = 0.0
+        self.shed_counts = {}
+
+    def start(self):
+        """첫 프레임의 기준 시각 설정 (루프 시작 직전에 호출)"""
+        self.deadline = self.clock()
+
+    def wait_next(self, period, sleep=time.sleep):
+        """
+        이전 마감 시각 + period까지 대기 (작업 시간은 자동으로 차감)
+
+        Args:
+            period: 이번 프레임 간격 (초)
+            sleep: 대기 함수 (파이프라인 캡처 스레드는 종료 이벤트의 wait 사용)
+
+        Returns:
+            bool: 마감 안에 작업을 끝냈으면 True, 마감을 넘겼으면 False
+        """
+        if self.deadline is None:
+            self.start()
+
+        self.deadline += period
+        self.tick_count += 1
+        remaining = self.deadline - self.clock()
+
+        if remaining <= 0:
+            # 마감 초과: 밀린 프레임을 몰아서 처리하지 않고 지금부터 다시 계산
+            overrun = -remaining
+            self.overrun_count += 1
+            self.total_overrun += overrun
+            if overrun > self.max_overrun:
+                self.max_overrun = overrun
+            self.overrun_rate += self.overrun_smoothing * (1.0 - self.overrun_rate)
+            self.deadline = self.clock()
+            return False
+
+        self.overrun_rate -= self.overrun_smoothing * self.overrun_rate
+
+        if remaining > self.spin_wait:
+            sleep(remaining - self.spin_wait)
+        if self.deadline - self.clock() > self.spin_wait:
+            # 대기가 중간에 끝남 (종료 요청)
+            return True
+        while self.clock() < self.deadline:
+            pass
+
+        jitter = self.clock() - self.deadline
+        self.wait_count += 1
+        self.total_jitter += jitter
+        if jitter > self.max_jitter:
+            self.max_jitter = jitter
+        return True
+
+    def is_behind(self):
+        """최근 마감을 자주 넘기고 있는지 여부"""
+        return self.overrun_rate >= self.shed_overrun_ratio
+
+    def should_shed(self, kind):
+        """
+        선택 작업을 건너뛸지 판단 (건너뛰면 종류별로 집계)
+
+        Args:
+            kind: 작업 종류 (예: 'status', 'debug')
+        """
+        if not self.is_behind():
+            return False
+        self.shed_counts[kind] = self.shed_counts.get(kind, 0) + 1
+        return True
+
+    def get_stats(self):
+        """마감 초과/지터 통계 반환 (ms 단위)"""
+        return {
+            "ticks": self.tick_count,
+            "overrun_count": self.overrun_count,
+            "overrun_ratio": round(self.overrun_count / self.tick_count, 4) if self.tick_count else 0.0,
+            "avg_overrun_ms": round(self.total_overrun / self.overrun_count * 1000, 3) if self.overrun_count else 0.0,
+            "max_overrun_ms": round(self.max_overrun * 1000, 3),
+            "avg_jitter_ms": round(self.total_jitter / self.wait_count * 1000, 4) if self.wait_count else 0.0,
+            "max_jitter_ms": round(self.max_jitter * 1000, 4),
+            "shed": dict(self.shed_counts)
+        }
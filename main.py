@@ -1,96 +1,196 @@
 """
 Chrome Dino Game Automation - Main Program
 ROI 영역에서 어두운 색상(장애물)을 감지하면 스페이스바를 눌러 점프
+
+cv2/numpy를 쓰는 모듈은 봇을 만들 때 불러온다. main()은 준비 안내를 먼저 띄우고
+Enter를 기다리는 동안 백그라운드에서 미리 불러오며, 카운트다운 동안 캡처/감지/입력 백엔드를 워밍업한다.
 """
 
-import cv2
-import numpy as np
-import pyautogui
-from PIL import ImageGrab
-import json
-import os
 import time
-import shutil
+
+STARTED_AT = time.perf_counter()  # 시작 시간 계측 기준 (모듈 로드 시작)
+
+import json
 from datetime import datetime
-import math
+
+from game_monitor import GameMonitor
+from input_sink import create_input_sink, InputScheduler
+from loop_scheduler import LoopScheduler
+from session_store import SessionStore
+from speed_profile import CompiledProfile, SpeedProfileReloader, compile_profile
+from startup import ModulePreloader, StartupTimer, modules_for_config
 
 
 class SpeedController:
-    """게임 속도에 따른 동적 파라미터 관리"""
+    """
+    게임 속도에 따른 동적 파라미터 관리
+    속도 프로필(speed_profile.py)을 조회 테이블로 미리 계산해 두고, 루프마다 tick()을 한 번 호출하면
+    경과 시간(또는 측정한 속도)으로 테이블을 한 번 조회해 모든 파라미터를 갱신한다.
+    get_*() 메서드는 마지막 tick() 결과를 반환한다.
+    속도 추정기(SpeedEstimator)가 연결되어 있으면 측정한 속도를 사용하고,
+    측정값이 없을 때만 경과 시간 기반 속도 곡선을 사용
+
+    Args:
+        clock: 시각 함수 (리플레이에서는 시뮬레이션 시간으로 교체)
+        estimator: 측정 기반 속도 추정기 (없으면 시간 곡선만 사용)
+        profile: 속도 프로필 (CompiledProfile 또는 프로필 항목 dict, None이면 기본 프로필)
+    """
 
-    def __init__(self):
+    def __init__(self, clock=time.perf_counter, estimator=None, profile=None):
+        self.clock = clock
+        self.estimator = estimator
         self.start_time = None
-        self.MAX_SPEED_FACTOR = 2.17
-        self.TIME_TO_MAX = 180.0  # 3분
+        self.profile = None
+        self.params = None  # 마지막 tick() 결과 (SpeedParams)
+        self.set_profile(profile)
 
-        # 기본 파라미터
-        self.BASE_CHECK_INTERVAL = 0.05
-        self.BASE_JUMP_COOLDOWN = 0.30
-        self.BASE_DARK_RATIO = 0.05
-        self.MIN_DARK_RATIO = 0.03
-        self.MAX_ROI_EXPAND_RATIO = 0.5  # 최대 50% ROI 확장
+    def set_profile(self, profile):
+        """
+        속도 프로필 교체 (실행 중 다시 불러오기에도 사용, 다음 tick()부터 적용)
+        테이블 참조 하나만 바꾸므로 다른 스레드의 tick()과 동시에 호출해도 안전하다.
+        """
+        if not isinstance(profile, CompiledProfile):
+            profile = compile_profile(profile)
+        settings = profile.profile
+        # 출력/스윕 도구용 기준값
+        self.MAX_SPEED_FACTOR = settings['max_speed_factor']
+        self.TIME_TO_MAX = profile.duration
+        self.BASE_CHECK_INTERVAL = settings['check_interval']
+        self.BASE_JUMP_COOLDOWN = settings['jump_cooldown']
+        self.BASE_DARK_RATIO = settings['dark_ratio']
+        self.MIN_DARK_RATIO = settings['min_dark_ratio']
+        self.MAX_ROI_EXPAND_RATIO = settings['max_roi_expand']
+        self.profile = profile
+        if self.params is None:
+            self.params = profile.time_table[0]
 
     def start(self):
         """게임 시작 시 호출"""
-        self.start_time = time.time()
+        self.start_time = self.clock()
+        self.tick()
+
+    def tick(self):
+        """
+        현재 속도의 파라미터를 테이블에서 한 번 조회해 갱신 (루프마다 한 번 호출)
+
+        Returns:
+            SpeedParams: (speed_factor, check_interval, jump_cooldown, dark_ratio, roi_expand, progress)
+        """
+        profile = self.profile
+        measured = self.get_measured_speed_factor()
+        if measured is not None:
+            params = profile.at_factor(measured)
+        elif self.start_time is None:
+            params = profile.time_table[0]
+        else:
+            params = profile.at_time(self.clock() - self.start_time)
+        self.params = params
+        return params
 
     def get_speed_factor(self):
-        """현재 속도 배율 계산 (1.0 ~ 2.17)"""
+        """현재 속도 배율 (1.0 ~ 최대 속도 배율, 측정값 우선, 마지막 tick() 기준)"""
+        return self.params.speed_factor
+
+    def get_measured_speed_factor(self):
+        """속도 추정기가 측정한 속도 배율 (측정값이 없거나 오래되었으면 None)"""
+        if self.estimator is None:
+            return None
+        return self.estimator.get_speed_factor()
+
+    def get_time_curve_speed_factor(self):
+        """경과 시간 기반 속도 곡선 (측정값이 없을 때 사용)"""
         if self.start_time is None:
             return 1.0
-        elapsed = time.time() - self.start_time
-        if elapsed >= self.TIME_TO_MAX:
-            return self.MAX_SPEED_FACTOR
-        progress = elapsed / self.TIME_TO_MAX
-        return 1.0 + (self.MAX_SPEED_FACTOR - 1.0) * (math.log(1 + 2 * progress) / math.log(3))
+        return self.profile.factor_at(self.clock() - self.start_time)
 
     def get_check_interval(self):
         """동적 체크 간격 반환"""
-        return self.BASE_CHECK_INTERVAL / self.get_speed_factor()
+        return self.params.check_interval
 
     def get_jump_cooldown(self):
         """동적 점프 쿨다운 반환"""
-        return self.BASE_JUMP_COOLDOWN / self.get_speed_factor()
+        return self.params.jump_cooldown
 
-    def get_dark_ratio_threshold(self):
-        """동적 어두운 픽셀 비율 임계값 반환"""
-        factor = self.get_speed_factor()
-        return self.BASE_DARK_RATIO - (self.BASE_DARK_RATIO - self.MIN_DARK_RATIO) * (factor - 1.0) / (self.MAX_SPEED_FACTOR - 1.0)
+    def get_dark_ratio_threshold(self, base_ratio=None, min_ratio=None):
+        """
+        동적 어두운 픽셀 비율 임계값 반환
+
+        Args:
+            base_ratio: 시작 속도 기준 비율 (None이면 프로필 값, 설정의 'detection' 항목으로 조정)
+            min_ratio: 최대 속도 기준 비율 (None이면 프로필 값)
+        """
+        params = self.params
+        if base_ratio is None and min_ratio is None:
+            return params.dark_ratio
+        base_ratio = self.BASE_DARK_RATIO if base_ratio is None else base_ratio
+        min_ratio = self.MIN_DARK_RATIO if min_ratio is None else min_ratio
+        return base_ratio - (base_ratio - min_ratio) * params.progress
 
     def get_roi_expand_ratio(self):
-        """동적 ROI 확장 비율 반환 (속도에 비례하여 ROI 확장)"""
-        factor = self.get_speed_factor()
-        # 속도 1.0일 때 0%, 최대 속도일 때 MAX_ROI_EXPAND_RATIO%
-        return self.MAX_ROI_EXPAND_RATIO * (factor - 1.0) / (self.MAX_SPEED_FACTOR - 1.0)
+        """동적 ROI 확장 비율 반환 (속도 1.0일 때 0%, 최대 속도일 때 MAX_ROI_EXPAND_RATIO)"""
+        return self.params.roi_expand
 
 
 class DinoGameBot:
-    def __init__(self, config_file='roi_config.json'):
-        """초기화"""
+    def __init__(self, config_file='roi_config.json', debug_folder='debug_captures'):
+        """
+        초기화
+
+        Args:
+            config_file: ROI 설정 파일 (None이면 로드하지 않음, apply_config()로 직접 적용)
+            debug_folder: 디버그 이미지 폴더 (None이면 폴더를 만들지 않음, 리플레이/시뮬레이션용)
+        """
+        from detection_engine import DetectionEngine
+        from event_bus import EventBus
+        from stage_timer import StageTimer
+
         self.config_file = config_file
+        self.name = None  # 게임 이름 (여러 게임 동시 실행 시 출력/세션 기록 구분용)
         self.roi = None
         self.base_roi = None  # 기본 ROI (동적 확장의 기준)
         self.running = False
         self.jump_count = 0
-        self.debug_folder = 'debug_captures'
+        self.duck_count = 0
+        self.debug_folder = debug_folder
         self.speed_controller = SpeedController()
         self.dark_mode = False  # 다크 모드 여부
         self.play_start_time = None  # 플레이 시작 시간
-        self.report_file = 'report.json'
-
-        # 기존 디버그 폴더가 있으면 타임스탬프로 이동
-        if os.path.exists(self.debug_folder):
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            new_folder_name = f"{self.debug_folder}_{timestamp}"
-            shutil.move(self.debug_folder, new_folder_name)
-            print(f"기존 디버그 폴더 이동: {self.debug_folder} → {new_folder_name}")
-
-        # 새 디버그 폴더 생성
-        os.makedirs(self.debug_folder)
-        print(f"디버그 폴더 생성: {self.debug_folder}")
+        self.session_store = None  # 세션 기록 저장소 (설정의 'session_store' 항목, 리플레이/시뮬레이션은 없음)
+        self.config = {}
+        self.frame_source = None  # 캡처 백엔드 (설정의 'capture' 항목으로 선택)
+        self.pipeline_config = {}  # 파이프라인 모드 설정 (설정의 'pipeline' 항목)
+        self.pipeline_stats = None
+        self.input_scheduler = None  # 키 입력 스케줄러 (설정의 'input' 항목으로 백엔드 선택)
+        self.debug_writer = None  # 비동기 디버그 이미지 저장기 (설정의 'debug' 항목)
+        self.recorder = None  # 프레임 기록기 (설정의 'record' 항목, 리플레이 벤치마크용)
+        self.next_jump_time = 0.0  # 쿨다운이 끝나는 시각 (쿨다운 중에도 감지는 계속)
+        self.detector = None  # 열 프로파일/TTC 감지기 (설정의 'detector' 항목, 없으면 픽셀 비율 방식)
+        self.zone_detector = None  # 띠/구간별 점프·웅크리기 판단 (설정의 'detector' 항목 type 'zones')
+        self.last_obstacle = None  # 마지막으로 측정한 가장 가까운 장애물 (열 프로파일 감지기 사용 시)
+        self.last_detect_ratio = 0.0  # 마지막 판단의 감지 비율 (게임 오버 감지에서 멈춘 화면에 장애물이 보이는지 확인)
+        self.speed_estimator = None  # 측정 기반 속도 추정기 (설정의 'speed_estimator' 항목)
+        self.last_profile = None  # 픽셀 비율 방식에서 속도 추정용 열 프로파일
+        self.loop_scheduler = LoopScheduler()  # 마감 시각 기반 루프 스케줄러 (설정의 'scheduler' 항목)
+        self.stage_timer = StageTimer()  # 구간별 처리 시간 히스토그램 (설정의 'timing' 항목)
+        self.profiler = None  # 샘플링 프로파일러 (설정의 'profiler' 항목, 선택)
+        self.drift_checker = None  # 창 이동 감지/ROI 보정 (설정의 'drift_check' 항목, calibrate.py --auto의 'anchor' 필요)
+        # 픽셀 비율 감지 파라미터 (설정의 'detection' 항목, calibrate.py 미리보기에서 조정)
+        self.brightness_threshold = 128
+        self.base_dark_ratio = None  # None이면 SpeedController 기본값
+        self.min_dark_ratio = None
+        self.detection_engine = DetectionEngine()  # 버퍼 재사용 감지 + 배경 밝기 추적 (설정의 'detection' 항목)
+        self.profile_reloader = None  # 속도 프로필 파일 감시 (설정의 'speed_profile' 항목, 실행 중 다시 불러오기)
+        self.debug_archiver = None  # 이전 디버그 폴더 정리 (설정의 'debug_archive' 항목, 압축/삭제는 백그라운드)
+        self.startup_timer = None  # 시작 단계별 시간 (main()에서 연결, 첫 프레임까지 기록)
+        self.first_frame_pending = False
+        self.game_monitor = None  # 게임 오버 감지/자동 재시작 (설정의 'game_over' 항목, 라이브 루프 전용)
+        self.black_box = None  # 마지막 몇 초 링 버퍼 기록 (설정의 'black_box' 항목, 트리거 시에만 저장)
+        self.events = EventBus()  # 콘솔/로그 파일 출력 (설정의 'console' 항목, 감지 루프는 큐에 넣기만 함)
+        self.owns_events = True  # shutdown()에서 출력 스레드를 닫을지 (여러 게임 모드의 공유 출력은 실행기가 닫음)
 
         # ROI 설정 로드
-        self.load_roi_config()
+        if self.config_file is not None:
+            self.load_roi_config()
         
     def load_roi_config(self):
         """ROI 설정 파일 로드"""
@@ -98,11 +198,7 @@ class DinoGameBot:
             with open(self.config_file, 'r', encoding='utf-8') as f:
                 config = json.load(f)
 
-            self.roi = config['roi']
-            self.base_roi = dict(self.roi)  # 기본 ROI 복사 저장
-            print(f"ROI 설정 로드 완료:")
-            print(f"  좌표: ({self.roi['x1']}, {self.roi['y1']}) ~ ({self.roi['x2']}, {self.roi['y2']})")
-            print(f"  크기: {config['width']} x {config['height']}")
+            self.apply_config(config)
             return True
             
         except FileNotFoundError:
@@ -112,7 +208,184 @@ class DinoGameBot:
         except Exception as e:
             print(f"ROI 설정 로드 중 오류 발생: {e}")
             return False
+
+    def apply_config(self, config, frame_source=None):
+        """
+        설정 내용을 적용하여 캡처/입력/디버그 백엔드 생성
+
+        Args:
+            config: 설정 내용 (roi_config.json 형식)
+            frame_source: 이미 만든 캡처 백엔드 (여러 게임 모드의 공유 캡처 뷰, None이면 'capture' 항목으로 생성)
+        """
+        from frame_source import create_frame_source
+        from black_box import BlackBoxRecorder
+        from debug_writer import DebugFolderArchiver, DebugImageWriter
+        from frame_recorder import FrameRecorder
+        from detector import ColumnProfileDetector
+        from zones import ZoneDetector
+        from detection_engine import DetectionEngine
+        from event_bus import EventBus
+        from speed_estimator import SpeedEstimator
+        from stage_timer import StageTimer
+
+        # 캡처 백엔드 선택 (기본값: bbox)
+        self.frame_source = frame_source if frame_source is not None else create_frame_source(config.get('capture'))
+
+        # 키 입력 백엔드 선택 (기본값: pyautogui)
+        input_config = config.get('input', {})
+        self.input_scheduler = InputScheduler(
+            create_input_sink(input_config),
+            threaded=input_config.get('threaded', True)
+        )
+
+        # 블랙박스 기록 (선택, 기본적으로 점프마다 저장하는 디버그 이미지를 대체)
+        black_box_config = dict(config.get('black_box', {}))
+        replace_debug = False
+        if black_box_config.pop('enabled', False):
+            replace_debug = black_box_config.pop('replace_debug', True)
+            black_box_config.setdefault('name', config.get('name'))
+            roi = config['roi']
+            self.black_box = BlackBoxRecorder((roi['y2'] - roi['y1'], roi['x2'] - roi['x1'], 3),
+                                              notify=self.notify, **black_box_config)
+
+        # 디버그 이미지 저장 형식/큐 설정 (기본값: PNG 압축 레벨 1)
+        if self.debug_folder is not None and not replace_debug:
+            # 기존 디버그 폴더는 이름만 바꾸고, 압축/오래된 세션 삭제는 백그라운드에서 처리
+            self.debug_archiver = DebugFolderArchiver(self.debug_folder, notify=self.notify, **config.get('debug_archive', {}))
+            self.debug_archiver.prepare()
+            self.debug_writer = DebugImageWriter(self.debug_folder, notify=self.notify, **config.get('debug', {}))
+
+        # 프레임 기록 (리플레이 벤치마크용, 선택)
+        record_config = config.get('record')
+        if record_config:
+            roi = config['roi']
+            self.recorder = FrameRecorder(
+                record_config.get('path', 'session_frames.npy'),
+                (roi['y2'] - roi['y1'], roi['x2'] - roi['x1'], 3),
+                max_frames=record_config.get('max_frames', 20000)
+            )
+
+        # 감지 방식 선택 ('column': 열 프로파일 + TTC, 'zones': 띠/구간별 점프·웅크리기, 기본값: 픽셀 비율)
+        detector_config = dict(config.get('detector', {}))
+        detector_type = detector_config.pop('type', 'ratio')
+        if detector_type == 'column':
+            self.detector = ColumnProfileDetector(**detector_config)
+        elif detector_type == 'zones':
+            self.zone_detector = ZoneDetector(**detector_config)
+
+        # 측정 기반 속도 추정 (선택, 없으면 경과 시간 곡선 사용)
+        estimator_config = dict(config.get('speed_estimator', {}))
+        if estimator_config.pop('enabled', False):
+            if 'base_speed' not in estimator_config and 'base_speed' in detector_config:
+                estimator_config['base_speed'] = detector_config['base_speed']
+            self.speed_estimator = SpeedEstimator(**estimator_config)
+            self.speed_controller.estimator = self.speed_estimator
+
+        # 속도 프로필 (선택, 파일로 지정하면 실행 중 수정 시 다시 불러옴)
+        profile_config = dict(config.get('speed_profile', {}))
+        if 'file' in profile_config:
+            reloader = SpeedProfileReloader(
+                profile_config['file'], name=profile_config.get('name'),
+                on_reload=self.apply_speed_profile, interval=profile_config.get('reload_interval', 1.0),
+                notify=self.notify
+            )
+            self.speed_controller.set_profile(reloader.load())
+            if profile_config.get('hot_reload', True):
+                self.profile_reloader = reloader
+        elif 'profile' in profile_config:
+            self.speed_controller.set_profile(compile_profile(profile_config['profile'], profile_config.get('name', 'config')))
+
+        # 루프 스케줄러 (마감 직전 바쁜 대기, 선택 작업 건너뛰기 기준)
+        self.loop_scheduler = LoopScheduler(**config.get('scheduler', {}))
+
+        # 게임 오버 감지 (선택, 게임 오버 후 느린 간격으로 대기하다 자동 재시작)
+        game_over_config = dict(config.get('game_over', {}))
+        if game_over_config.pop('enabled', False):
+            self.game_monitor = GameMonitor(**game_over_config)
+
+        # 세션 기록 저장소 (기본값: sessions.db, 파일은 run() 시작 시 열림)
+        self.session_store = SessionStore(notify=self.notify, **config.get('session_store', {}))
+
+        # 콘솔/이벤트 로그 출력 (출력 스레드는 run() 시작 시 시작, 그 전에는 바로 출력)
+        self.events = EventBus(**config.get('console', {}))
+
+        # 구간별 처리 시간 계측 (기본값: 켜짐)
+        self.stage_timer = StageTimer(**config.get('timing', {}))
+
+        # 샘플링 프로파일러 (선택)
+        profiler_config = dict(config.get('profiler', {}))
+        if profiler_config.pop('enabled', False):
+            from sampling_profiler import SamplingProfiler
+
+            self.profiler = SamplingProfiler(notify=self.notify, **profiler_config)
+
+        # 창 이동 감지 (선택, 자동 캘리브레이션으로 저장한 공룡 위치 기준)
+        drift_config = dict(config.get('drift_check', {}))
+        if drift_config.pop('enabled', False):
+            if 'anchor' in config:
+                from roi_locator import DriftChecker
+
+                template = config.get('locator', {}).get('template', 'dino_template.png')
+                self.drift_checker = DriftChecker(config['anchor'], template=template, **drift_config)
+            else:
+                print("창 이동 감지를 사용하려면 먼저 'python calibrate.py --auto'로 공룡 위치를 저장해주세요.")
+
+        # 픽셀 비율 감지 파라미터 (선택)
+        detection_config = dict(config.get('detection', {}))
+        self.brightness_threshold = detection_config.pop('threshold', 128)
+        self.base_dark_ratio = detection_config.pop('dark_ratio', None)
+        self.min_dark_ratio = detection_config.pop('min_dark_ratio', None)
+
+        # 감지 엔진 (나머지 'detection' 항목: stride, background_rate, min_contrast, reseed_ratio)
+        engine_threshold = self.detector.threshold if self.detector is not None else self.brightness_threshold
+        self.detection_engine = DetectionEngine(threshold=engine_threshold, **detection_config)
+
+        self.config = config
+        self.name = config.get('name')
+        self.pipeline_config = config.get('pipeline', {})
+        self.roi = config['roi']
+        self.base_roi = dict(self.roi)  # 기본 ROI 복사 저장
+        print("ROI 설정 로드 완료:")
+        print(f"  좌표: ({self.roi['x1']}, {self.roi['y1']}) ~ ({self.roi['x2']}, {self.roi['y2']})")
+        print(f"  크기: {config['width']} x {config['height']}")
+        print(f"  캡처 백엔드: {self.frame_source.name}")
+        print(f"  입력 백엔드: {self.input_scheduler.sink.name}")
+        if self.zone_detector is not None:
+            zone_detector = self.zone_detector
+            bands_str = ', '.join(f"{band['name']}→{band['action'] or '없음'}" for band in zone_detector.bands)
+            print(f"  감지 방식: 구역 ({bands_str} | 구간 {len(zone_detector.slices)}개 중 가까운 {zone_detector.act_slices}개에서 동작)")
+        else:
+            print(f"  감지 방식: {'열 프로파일 + TTC' if self.detector else '픽셀 비율'}")
+        print(f"  속도 기준: {'장애물 이동 측정 (시간 곡선 대체)' if self.speed_estimator else '경과 시간 곡선'}")
+        print(f"  속도 프로필: {self.speed_controller.profile.name}"
+              f"{f' ({self.profile_reloader.path} 수정 시 다시 불러옴)' if self.profile_reloader else ''}")
+        if self.drift_checker is not None:
+            print(f"  창 이동 감지: {self.drift_checker.interval:.0f}초마다 공룡 위치 주변 ±{self.drift_checker.margin}px 확인")
+        if self.black_box is not None:
+            debug_str = ", 디버그 이미지 대체" if self.debug_writer is None else ""
+            print(f"  블랙박스: 마지막 {self.black_box.seconds:.0f}초 (최대 {self.black_box.capacity}프레임){debug_str}")
+        if self.game_monitor is not None:
+            monitor = self.game_monitor
+            restart_str = f"{monitor.restart_delay:.1f}초 후 자동 재시작" if monitor.auto_restart else "직접 재시작"
+            limit_str = f", {monitor.max_games}판 후 종료" if monitor.max_games else ""
+            print(f"  게임 오버 감지: 화면이 {monitor.freeze_time:.1f}초 (장애물이 보이지 않으면 {monitor.long_freeze_time:.1f}초) "
+                  f"멈추면 게임 오버 → {restart_str}{limit_str}")
     
+    def reset_game_state(self):
+        """새 게임 시작 시 게임별 상태 초기화 (속도 컨트롤러 재시작 포함)"""
+        self.jump_count = 0
+        self.duck_count = 0
+        self.dark_mode = False
+        self.detection_engine.reset()
+        self.next_jump_time = 0.0
+        self.last_obstacle = None
+        self.last_detect_ratio = 0.0
+        if self.speed_estimator is not None:
+            self.speed_estimator.reset()
+        if self.black_box is not None:
+            self.black_box.clear()
+        self.speed_controller.start()
+
     def get_dynamic_roi(self):
         """속도에 따라 동적으로 이동된 ROI 반환 (오른쪽으로 이동)"""
         if self.base_roi is None:
@@ -131,35 +404,70 @@ class DinoGameBot:
             'y2': self.base_roi['y2']
         }
 
-    def capture_roi(self):
-        """ROI 영역만 캡처 (속도에 따라 동적 확장)"""
-        # 전체 화면 캡처
-        screenshot = ImageGrab.grab()
-        screenshot_np = np.array(screenshot)
+    def check_roi_drift(self):
+        """
+        주기적으로 공룡 위치를 다시 찾아 창이 움직였으면 기본 ROI를 같은 만큼 이동
+        (확인 주기가 아니거나 마감을 자주 넘기면 바로 반환)
+        """
+        if self.drift_checker is None or not self.drift_checker.due(time.perf_counter()):
+            return
+        if self.loop_scheduler.should_shed('drift'):
+            return
+
+        shift = self.drift_checker.check(self.frame_source, time.perf_counter())
+        if shift is None:
+            return
+
+        dx, dy = shift
+        self.shift_roi(dx, dy)
+        self.log_event('drift', {"dx": dx, "dy": dy, "roi": self.base_roi}, level='warning')
+
+    def shift_roi(self, dx, dy):
+        """기본 ROI와 감지기 기준 위치를 (dx, dy)만큼 이동 (다른 스레드가 읽는 중이므로 새 dict로 교체)"""
+        self.base_roi = {
+            'x1': self.base_roi['x1'] + dx,
+            'y1': self.base_roi['y1'] + dy,
+            'x2': self.base_roi['x2'] + dx,
+            'y2': self.base_roi['y2'] + dy
+        }
+        self.roi = dict(self.base_roi)
+        if self.detector is not None and self.detector.dino_x is not None:
+            self.detector.dino_x += dx
+        # 이전 프레임의 열 위치와 비교할 수 없으므로 속도 측정은 새로 시작
+        if self.speed_estimator is not None:
+            self.speed_estimator.reset()
+
+    def capture_roi(self, dynamic_roi=None):
+        """
+        ROI 영역만 캡처 (속도에 따라 동적 확장)
 
+        Args:
+            dynamic_roi: 캡처할 영역 (None이면 현재 동적 ROI, 여러 게임 모드는 공유 캡처에 맞춘 영역을 전달)
+        """
         # 동적 ROI 가져오기
-        dynamic_roi = self.get_dynamic_roi()
+        if dynamic_roi is None:
+            dynamic_roi = self.get_dynamic_roi()
 
-        # ROI 영역 추출
-        roi_img = screenshot_np[
-            dynamic_roi['y1']:dynamic_roi['y2'],
-            dynamic_roi['x1']:dynamic_roi['x2']
-        ]
+        # 선택된 백엔드로 ROI 영역만 캡처
+        start = time.perf_counter()
+        roi_img = self.frame_source.grab(dynamic_roi)
+        self.stage_timer.record('capture', time.perf_counter() - start)
+
+        # 프레임 기록 (게임 경과 시간과 함께)
+        if self.recorder is not None:
+            self.recorder.append(roi_img, self.speed_controller.clock() - self.speed_controller.start_time)
 
         return roi_img
     
-    def check_dark_mode(self, dark_ratio):
+    def check_dark_mode(self):
         """
         다크 모드 전환 감지
-        어두운 픽셀 비율이 95% 이상이면 다크 모드로 전환
-        밝은 픽셀 비율이 95% 이상이면 라이트 모드로 전환
+        감지 엔진이 추적하는 배경 밝기가 밝기 임계값보다 어두워지면 다크 모드 (밝은 픽셀이 장애물)
         """
-        if not self.dark_mode and dark_ratio >= 0.95:
-            self.dark_mode = True
-            print("\n[모드 전환] 다크 모드 감지 → 밝은 픽셀 감지로 전환\n")
-        elif self.dark_mode and dark_ratio <= 0.05:
-            self.dark_mode = False
-            print("\n[모드 전환] 라이트 모드 감지 → 어두운 픽셀 감지로 전환\n")
+        if self.detection_engine.dark_mode == self.dark_mode:
+            return
+        self.dark_mode = self.detection_engine.dark_mode
+        self.notify('mode', {"dark_mode": self.dark_mode})
 
     def is_obstacle_detected(self, roi_img, threshold=128, ratio_threshold=0.05):
         """
@@ -173,100 +481,490 @@ class DinoGameBot:
         Returns:
             tuple: (장애물 감지 여부, 평균 밝기, 감지 비율)
         """
-        # RGB를 그레이스케일로 변환
-        gray = cv2.cvtColor(roi_img, cv2.COLOR_RGB2GRAY)
+        engine = self.detection_engine
+        engine.threshold = threshold
 
-        # 평균 밝기 계산
-        avg_brightness = np.mean(gray)
+        # RGB를 그레이스케일로 변환 (엔진의 재사용 버퍼에 기록)
+        start = time.perf_counter()
+        engine.convert(roi_img)
+        converted = time.perf_counter()
+        self.stage_timer.record('grayscale', converted - start)
 
-        # 어두운 픽셀 비율 계산
-        dark_pixels = np.sum(gray < threshold)
-        total_pixels = gray.size
-        dark_ratio = dark_pixels / total_pixels
+        # 배경 밝기와 반대쪽 픽셀(라이트 모드: 어두운 픽셀, 다크 모드: 밝은 픽셀)의 비율
+        avg_brightness, detect_ratio = engine.classify()
 
         # 다크 모드 전환 체크
-        self.check_dark_mode(dark_ratio)
+        self.check_dark_mode()
 
-        if self.dark_mode:
-            # 다크 모드: 밝은 픽셀(장애물)을 감지
-            light_ratio = 1.0 - dark_ratio
-            is_obstacle = light_ratio > ratio_threshold
-            return is_obstacle, avg_brightness, light_ratio
-        else:
-            # 라이트 모드: 어두운 픽셀(장애물)을 감지
-            is_obstacle = dark_ratio > ratio_threshold
-            return is_obstacle, avg_brightness, dark_ratio
+        # 속도 추정용 열별 장애물 픽셀 수
+        if self.speed_estimator is not None:
+            self.last_profile = engine.column_profile()
+
+        is_obstacle = detect_ratio > ratio_threshold
+        self.stage_timer.record('detect', time.perf_counter() - converted)
+        return is_obstacle, avg_brightness, detect_ratio
     
+    def decide(self, roi_img, now, captured_at=None):
+        """
+        한 프레임에 대한 감지 + 점프 판단 (라이브 루프와 리플레이가 공유)
+
+        Args:
+            roi_img: ROI 영역 이미지 (RGB)
+            now: 현재 시각 (쿨다운 판단 기준, 라이브는 perf_counter / 리플레이는 시뮬레이션 시간)
+            captured_at: 프레임 캡처 시각 (속도 측정 기준, None이면 now)
+
+        Returns:
+            tuple: (장애물 감지 여부, 평균 밝기, 감지 비율, 동작) - 동작은 'jump', 'duck' 또는 None
+        """
+        if captured_at is None:
+            captured_at = now
+
+        if self.detector is not None:
+            # 열 프로파일 감지: 장애물 위치/크기 측정 후 충돌까지 남은 시간으로 판단
+            is_obstacle, avg_brightness, detect_ratio, jump_due = self.measure_obstacle(roi_img, captured_at)
+            action_due = 'jump' if jump_due else None
+        elif self.zone_detector is not None:
+            # 구역 감지: 장애물이 있는 띠에 따라 점프/웅크리기/동작 없음
+            is_obstacle, avg_brightness, detect_ratio, action_due = self.measure_zones(roi_img, captured_at, now)
+        else:
+            ratio_threshold = self.speed_controller.get_dark_ratio_threshold(self.base_dark_ratio, self.min_dark_ratio)
+
+            # 장애물 감지 (라이트/다크 모드 자동 대응)
+            is_obstacle, avg_brightness, detect_ratio = self.is_obstacle_detected(
+                roi_img, threshold=self.brightness_threshold, ratio_threshold=ratio_threshold
+            )
+            self.update_speed_estimate(self.last_profile, captured_at)
+            action_due = 'jump' if is_obstacle else None
+
+        action = action_due if action_due is not None and now >= self.next_jump_time else None
+        if action is not None:
+            # 동적 쿨다운 적용 (대기하지 않고 다음 동작 가능 시각만 기록)
+            self.next_jump_time = now + self.speed_controller.get_jump_cooldown()
+
+        if self.black_box is not None:
+            # 블랙박스 링 버퍼에 프레임과 판단 결과 기록 (슬롯 복사 한 번)
+            controller = self.speed_controller
+            obstacle = self.last_obstacle
+            self.black_box.append(
+                roi_img, controller.clock() - controller.start_time if controller.start_time is not None else 0.0,
+                detect_ratio, avg_brightness, self.speed_controller.get_speed_factor(),
+                obstacle.ttc if obstacle is not None else None, action
+            )
+
+        if self.first_frame_pending:
+            self.mark_first_frame()
+
+        self.last_detect_ratio = detect_ratio
+        return is_obstacle, avg_brightness, detect_ratio, action
+
+    def mark_first_frame(self):
+        """시작 → 첫 프레임 판단까지의 시간 기록 (main()에서 시작 시간 계측을 연결한 경우 한 번만)"""
+        self.first_frame_pending = False
+        self.startup_timer.mark('first_frame')
+        self.notify('first_frame', {"startup": self.startup_timer.format()})
+
+    def track_startup(self, startup_timer):
+        """시작 시간 계측 연결 (첫 프레임 판단 시 'first_frame' 단계 기록, 세션 요약에 포함)"""
+        self.startup_timer = startup_timer
+        self.first_frame_pending = True
+
+    def warm_up(self):
+        """
+        카운트다운 동안 캡처/감지/입력 백엔드 준비 (첫 프레임이 느려지지 않도록)
+        첫 캡처(백엔드 초기화), 감지 버퍼 할당과 OpenCV 초기화, 입력 해제 스레드 시작을 미리 해 두고
+        감지 상태와 구간 통계는 되돌린다.
+        """
+        frame = self.frame_source.warm_up(self.get_dynamic_roi())
+        if frame is not None:
+            self.decide(frame, time.perf_counter())
+        self.input_scheduler.sink.warm_up()
+        self.input_scheduler.start()
+        self.reset_game_state()
+        self.stage_timer.reset()
+
+    def update_speed_estimate(self, profile, captured_at):
+        """열 프로파일로 장애물 이동 속도 측정 (속도 추정기를 사용할 때만)"""
+        if self.speed_estimator is None or profile is None:
+            return
+        self.speed_estimator.update(profile, self.get_dynamic_roi()['x1'], captured_at)
+        # 이번 프레임 측정값으로 파라미터 갱신 (TTC/쿨다운이 한 프레임 늦지 않도록)
+        self.speed_controller.tick()
+
+    def apply_speed_profile(self, profile):
+        """다시 불러온 속도 프로필 적용 (프로필 감시 스레드에서 호출, 다음 틱부터 적용)"""
+        self.speed_controller.set_profile(profile)
+        self.notify('profile_reload', {"name": profile.name})
+        self.log_event('speed_profile', {"name": profile.name, "profile": profile.profile})
+
+    def measure_obstacle(self, roi_img, captured_at):
+        """
+        열 프로파일 감지기로 가장 가까운 장애물의 거리/폭/높이와 TTC 측정
+
+        Returns:
+            tuple: (장애물 감지 여부, 평균 밝기, 장애물 픽셀 비율, 점프 시점 도달 여부)
+        """
+        engine = self.detection_engine
+        start = time.perf_counter()
+        engine.convert(roi_img)
+        prepared = time.perf_counter()
+        self.stage_timer.record('grayscale', prepared - start)
+
+        # 장애물 픽셀 마스크 (다크 모드 전환 포함)
+        avg_brightness, _ = engine.classify()
+        self.check_dark_mode()
+
+        obstacle = self.detector.measure(engine.mask, profile=engine.column_profile(), row_stride=engine.stride)
+        # TTC 계산 전에 이번 프레임으로 속도 갱신
+        self.update_speed_estimate(self.detector.last_profile, captured_at)
+        self.detector.estimate_ttc(
+            obstacle, self.get_dynamic_roi(), self.base_roi, self.speed_controller.get_speed_factor()
+        )
+        self.last_obstacle = obstacle
+        self.stage_timer.record('detect', time.perf_counter() - prepared)
+
+        if obstacle is None:
+            return False, avg_brightness, 0.0, False
+        return True, avg_brightness, obstacle.pixel_ratio, self.detector.should_jump(obstacle)
+
+    def measure_zones(self, roi_img, captured_at, now):
+        """
+        구역 감지: 픽셀 비율 방식과 같은 마스크에서 띠/구간별 장애물 픽셀 수를 구해 동작 선택
+        쿨다운 중에는 고른 동작이 버려지므로 구역 판단을 건너뜀
+
+        Returns:
+            tuple: (동작 필요 여부, 평균 밝기, 감지 비율, 동작)
+        """
+        engine = self.detection_engine
+        engine.threshold = self.brightness_threshold
+        start = time.perf_counter()
+        engine.convert(roi_img)
+        converted = time.perf_counter()
+        self.stage_timer.record('grayscale', converted - start)
+
+        avg_brightness, detect_ratio = engine.classify()
+        self.check_dark_mode()
+        if self.speed_estimator is not None:
+            self.last_profile = engine.column_profile()
+            self.update_speed_estimate(self.last_profile, captured_at)
+
+        action = None
+        if now >= self.next_jump_time:
+            ratio_threshold = self.speed_controller.get_dark_ratio_threshold(self.base_dark_ratio, self.min_dark_ratio)
+            action = self.zone_detector.evaluate(engine.mask, round(detect_ratio * engine.mask.size), ratio_threshold)
+        self.stage_timer.record('detect', time.perf_counter() - converted)
+        return action is not None, avg_brightness, detect_ratio, action
+
+    def monitor_game(self, roi_img, now):
+        """
+        게임 오버 감지 + 대기/재시작 처리 (라이브 루프에서 캡처 직후 호출, 리플레이/시뮬레이션은 사용하지 않음)
+
+        Returns:
+            bool: 이 프레임을 감지/점프 판단에 사용할지 여부 (게임 오버 대기 중이면 False)
+        """
+        monitor = self.game_monitor
+        # 화면이 멈춰 있으면 직전 판단이 같은 화면을 본 것이므로 그 감지 비율로 장애물이 보이는지 확인
+        ratio_threshold = self.speed_controller.get_dark_ratio_threshold(self.base_dark_ratio, self.min_dark_ratio)
+        event = monitor.update(roi_img, now, jumped=self.jump_count + self.duck_count > 0,
+                               obstacle=self.last_detect_ratio > ratio_threshold)
+        if event == 'game_over':
+            self.end_game()
+        elif event == 'resumed':
+            # 게임 오버 중 화면이 바뀜 (자동 재시작 전에 직접 다시 시작함)
+            self.begin_game(now)
+            return True
+
+        if not monitor.is_idle():
+            return True
+        if monitor.is_finished():
+            self.notify('games_done', {"max_games": monitor.max_games})
+            self.running = False
+        elif monitor.restart_due(now):
+            self.input_scheduler.jump(monitor.RESTART_KEY_DURATION)
+            monitor.restarts += 1
+            self.begin_game(now)
+        return False
+
+    def end_game(self):
+        """게임 오버: 이번 판 결과를 세션 기록에 저장하고 대기 상태로 전환"""
+        monitor = self.game_monitor
+        survival = monitor.survival_time()
+        self.log_event('game_over', {"game": monitor.games, "survival_seconds": round(survival, 1), "jump_count": self.jump_count,
+                                     "idle_interval_ms": round(monitor.idle_interval * 1000, 1)})
+        if self.black_box is not None:
+            # 장애물이 보이지 않아 freeze_time보다 오래 기다린 만큼 저장 구간을 늘려 충돌 전 프레임을 유지
+            frozen = monitor.over_at - monitor.last_change
+            self.black_box.dump('game_over', extra_seconds=max(frozen - monitor.freeze_time, 0.0))
+        self.save_report(survival, 'game_over')
+
+    def begin_game(self, now):
+        """다음 게임 시작: 게임별 상태(속도 컨트롤러 포함) 초기화 후 새 세션 행 기록"""
+        self.play_start_time = datetime.now()
+        self.reset_game_state()
+        self.game_monitor.start_game(now)
+        self.notify('game_start', {"game": self.game_monitor.games + 1})
+        if self.session_store is not None:
+            self.session_store.start_run(self.play_start_time)
+
+    def is_idle(self):
+        """게임 오버 후 다음 게임을 기다리는 중인지 여부"""
+        return self.game_monitor is not None and self.game_monitor.is_idle()
+
+    def get_loop_period(self, check_interval):
+        """다음 캡처까지 간격 (게임 오버 대기 중이면 대기 확인 간격)"""
+        if self.is_idle():
+            return self.game_monitor.idle_interval
+        return self.get_next_check_delay(check_interval)
+
+    def get_next_check_delay(self, check_interval):
+        """다음 체크까지 대기 시간 (열 프로파일 감지기는 TTC에 맞춰 조절)"""
+        if self.detector is None:
+            return check_interval
+        return self.detector.next_check_delay(check_interval)
+
     def save_debug_image(self, roi_img, jump_count):
-        """디버그용 ROI 이미지 저장"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-        filename = f"{self.debug_folder}/jump_{jump_count:04d}_{timestamp}.png"
-        
-        # RGB를 BGR로 변환 (OpenCV 저장용)
-        roi_bgr = cv2.cvtColor(roi_img, cv2.COLOR_RGB2BGR)
-        cv2.imwrite(filename, roi_bgr)
-        
-        return filename
+        """디버그용 ROI 이미지 저장 (백그라운드 저장 큐에 추가, 버려진 경우 None 반환)"""
+        if self.debug_writer is None:
+            return None
+        # 동작 번호는 게임마다 다시 세므로 여러 판을 이어서 실행하면 파일 이름에 게임 번호를 붙임
+        game = self.game_monitor.games + 1 if self.game_monitor is not None else None
+        return self.debug_writer.submit(roi_img, jump_count, game)
     
-    def jump(self, detect_ratio=0.10):
+    def get_jump_strength(self, detect_ratio):
         """
-        스페이스바를 눌러 점프 (픽셀 비율에 따라 점프 강도 조절)
+        픽셀 비율에 따른 점프 강도 결정
+        열 프로파일 감지기를 사용하면 마지막으로 측정한 장애물의 높이/폭으로 결정
 
-        Args:
-            detect_ratio: 감지된 픽셀 비율 (0.0 ~ 1.0)
+        Returns:
+            tuple: (키를 누를 시간(초), 점프 종류)
         """
-        # 픽셀 비율에 따른 점프 강도 결정
         WEAK_JUMP_THRESHOLD = 0.1  # 7% 이하면 약한 점프
         WEAK_JUMP_DURATION = 0.001   # 약한 점프: 1ms
         STRONG_JUMP_DURATION = 0.15  # 강한 점프: 150ms
 
+        if self.detector is not None:
+            if self.detector.is_strong_jump(self.last_obstacle):
+                return STRONG_JUMP_DURATION, "강한"
+            return WEAK_JUMP_DURATION, "약한"
+
         if detect_ratio <= WEAK_JUMP_THRESHOLD:
             # 약한 점프 (작은 장애물)
-            jump_duration = WEAK_JUMP_DURATION
-            jump_type = "약한"
-        else:
-            # 강한 점프 (큰 장애물)
-            jump_duration = STRONG_JUMP_DURATION
-            jump_type = "강한"
+            return WEAK_JUMP_DURATION, "약한"
+        # 강한 점프 (큰 장애물)
+        return STRONG_JUMP_DURATION, "강한"
+
+    def jump(self, detect_ratio=0.10):
+        """
+        스페이스바를 눌러 점프 (픽셀 비율에 따라 점프 강도 조절)
+        키를 뗄 시각만 예약하고 바로 반환하므로 감지 루프가 멈추지 않음
+
+        Args:
+            detect_ratio: 감지된 픽셀 비율 (0.0 ~ 1.0)
+        """
+        jump_duration, jump_type = self.get_jump_strength(detect_ratio)
 
-        # 스페이스바 누르기 (시간 조절)
-        pyautogui.keyDown('space')
-        time.sleep(jump_duration)
-        pyautogui.keyUp('space')
+        # 스페이스바 누르기 (뗄 시각은 스케줄러가 처리)
+        self.input_scheduler.jump(jump_duration)
 
         self.jump_count += 1
-        print(f"{jump_type} 점프! (총 {self.jump_count}번, {jump_duration*1000:.0f}ms)")
+        event = {
+            "jump": self.jump_count,
+            "type": jump_type,
+            "duration_ms": round(jump_duration * 1000, 1),
+            "detect_ratio": round(float(detect_ratio), 4),
+            "speed_factor": round(self.speed_controller.get_speed_factor(), 3)
+        }
+        obstacle = self.last_obstacle
+        if obstacle is not None and obstacle.ttc is not None:
+            event.update(distance=obstacle.distance, width=obstacle.width, height=obstacle.height,
+                         ttc_ms=round(obstacle.ttc * 1000, 1))
+        self.log_event('jump', event)
+
+    def log_prefix(self):
+        """출력 앞에 붙일 게임 이름 (이름이 없으면 빈 문자열)"""
+        return f"[{self.name}] " if self.name else ""
+
+    def log_event(self, kind, data, level='info'):
+        """세션 저장소에 이벤트 기록 + 콘솔/로그 파일 출력 (게임 경과 시간 기준, 둘 다 기다리지 않음)"""
+        if self.speed_controller.start_time is None:
+            self.notify(kind, data, level)
+            return
+        t = self.speed_controller.clock() - self.speed_controller.start_time
+        if self.session_store is not None:
+            self.session_store.log_event(kind, t, data)
+        self.events.emit(kind, data, level, self.name, t)
+
+    def notify(self, kind, data=None, level='info', t=None):
+        """콘솔/로그 파일에만 출력할 이벤트 (메시지는 event_bus.MESSAGES, 포맷팅은 출력 스레드에서)"""
+        self.events.emit(kind, data, level, self.name, t)
+
+    def act(self, action, detect_ratio):
+        """decide()가 고른 동작 실행 ('jump': 픽셀 비율에 따른 점프, 'duck': 웅크리기)"""
+        if action == 'duck':
+            self.duck(self.zone_detector.duck_duration if self.zone_detector is not None else 0.3)
+        else:
+            self.jump(detect_ratio)
+
+    def duck(self, duration=0.3):
+        """
+        아래 화살표를 눌러 웅크리기 (공중에서는 빠른 착지, 이미 누르고 있으면 떼는 시각만 늦춤)
+
+        Args:
+            duration: 누르고 있을 시간 (초)
+        """
+        self.input_scheduler.duck(duration)
+        self.duck_count += 1
+        event = {"duck": self.duck_count, "duration_ms": round(duration * 1000, 1),
+                 "speed_factor": round(self.speed_controller.get_speed_factor(), 3)}
+        if self.zone_detector is not None and self.zone_detector.last_zone is not None:
+            event["zone"] = self.zone_detector.last_zone[0]
+        self.log_event('duck', event)
+
+    def notify_action_detail(self, avg_brightness, detect_ratio, dark_mode, saved_file):
+        """점프/웅크리기 직후 판단 근거 (밝기, 픽셀 비율, 구역/장애물, 디버그 이미지) 이벤트"""
+        detail = {"brightness": round(avg_brightness, 1), "detect_ratio": round(float(detect_ratio), 4), "dark_mode": dark_mode}
+        if self.zone_detector is not None:
+            detail["zone"] = self.zone_detector.describe()
+        obstacle = self.last_obstacle
+        if obstacle is not None and obstacle.ttc is not None:
+            detail.update(distance=obstacle.distance, width=obstacle.width, height=obstacle.height,
+                          ttc_ms=round(obstacle.ttc * 1000, 1))
+        if self.debug_writer is not None:
+            detail["debug_file"] = saved_file
+        self.notify('action_detail', detail)
 
-    def save_report(self, elapsed_time):
-        """플레이 결과를 report.json에 저장"""
-        # 디버그 이미지 갯수 계산
-        debug_image_count = len([f for f in os.listdir(self.debug_folder) if f.endswith('.png')])
+    def save_report(self, elapsed_time, end_reason='stopped'):
+        """플레이 결과 요약을 세션 저장소에 기록"""
+        # 디버그 이미지 갯수 (저장기 통계 기준)
+        debug_stats = self.debug_writer.get_stats() if self.debug_writer else None
+        debug_image_count = debug_stats['written'] if debug_stats else 0
 
         # 플레이 결과 데이터
         play_result = {
+            "game": self.name,
             "play_start_time": self.play_start_time.strftime("%Y-%m-%d %H:%M:%S") if self.play_start_time else None,
             "total_play_time_seconds": round(elapsed_time, 1),
             "jump_count": self.jump_count,
+            "duck_count": self.duck_count,
             "debug_image_count": debug_image_count,
-            "roi": self.roi
+            "roi": self.roi,
+            "capture": self.frame_source.get_latency_stats(),
+            "input": self.input_scheduler.get_stats(),
+            "debug_writer": debug_stats
         }
+        if self.speed_estimator is not None:
+            play_result["speed_estimator"] = self.speed_estimator.get_stats()
+        if self.drift_checker is not None:
+            play_result["drift_check"] = self.drift_checker.get_stats()
+        play_result["detection_engine"] = self.detection_engine.get_stats()
+        play_result["speed_profile"] = {"name": self.speed_controller.profile.name}
+        if self.profile_reloader is not None:
+            play_result["speed_profile"].update(self.profile_reloader.get_stats())
+        if self.startup_timer is not None:
+            play_result["startup"] = self.startup_timer.summary()
+        if self.debug_archiver is not None:
+            play_result["debug_archive"] = self.debug_archiver.get_stats()
+        play_result["console"] = self.events.get_stats()
+        if self.game_monitor is not None:
+            play_result["game_over"] = self.game_monitor.get_stats()
+        if self.black_box is not None:
+            play_result["black_box"] = self.black_box.get_stats()
+        play_result["scheduler"] = self.loop_scheduler.get_stats()
+        play_result["stage_latency"] = self.stage_timer.summary()
+        if self.profiler is not None:
+            play_result["profiler"] = {
+                "output": self.profiler.output,
+                "samples": self.profiler.sample_count,
+                "top_functions": [
+                    {"function": name, "share": round(share, 4)} for name, share in self.profiler.top_functions()
+                ]
+            }
+        if self.pipeline_stats is not None:
+            play_result["pipeline"] = self.pipeline_stats
 
-        # 기존 report.json 로드 또는 새로 생성
-        if os.path.exists(self.report_file):
-            with open(self.report_file, 'r', encoding='utf-8') as f:
-                report_data = json.load(f)
-        else:
-            report_data = {"play_history": []}
+        # 세션 행에 요약 기록 (이벤트는 플레이 중 이미 기록됨)
+        if self.session_store is not None:
+            self.session_store.end_run(play_result, end_reason)
+        return play_result
+    
+    def print_speed_status(self, check_interval):
+        """속도 상태 이벤트 (콘솔 출력 간격마다 호출, 문자열 포맷팅과 출력은 이벤트 버스 스레드에서)"""
+        base_width = self.base_roi['x2'] - self.base_roi['x1']
+        capture_stats = self.frame_source.get_latency_stats()
+        scheduler_stats = self.loop_scheduler.get_stats()
+        self.log_event('status', {
+            "elapsed_seconds": round(self.speed_controller.clock() - self.speed_controller.start_time, 1),
+            "speed_factor": round(self.speed_controller.get_speed_factor(), 3),
+            "speed_source": "measured" if self.speed_controller.get_measured_speed_factor() is not None else "time",
+            "dark_mode": self.dark_mode,
+            "roi_shift_px": int(base_width * self.speed_controller.get_roi_expand_ratio()),
+            "check_interval_ms": round(check_interval * 1000, 1),
+            "jump_count": self.jump_count,
+            "capture_avg_ms": capture_stats['avg_ms'],
+            "overrun_ratio": scheduler_stats['overrun_ratio'],
+            "avg_jitter_ms": scheduler_stats['avg_jitter_ms'],
+            "stage_p95_ms": {stage: stats['p95_ms'] for stage, stats in self.stage_timer.summary().items()}
+        })
+
+    def run_sequential(self):
+        """단일 스레드 루프: 캡처 → 감지 → 점프 → 다음 마감 시각까지 대기"""
+        last_status_time = time.time()
+        self.loop_scheduler.start()
 
-        # 플레이 결과 추가
-        report_data["play_history"].append(play_result)
+        while self.running:
+            # 동적 파라미터 가져오기
+            check_interval = self.speed_controller.tick().check_interval
 
-        # report.json 저장
-        with open(self.report_file, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, ensure_ascii=False, indent=2)
+            # 상태 출력 간격마다 속도 상태 (마감을 자주 넘기면 다음 프레임으로 미룸, 게임 오버 대기 중에는 생략)
+            if time.time() - last_status_time >= self.events.status_interval and not self.loop_scheduler.should_shed('status') and not self.is_idle():
+                self.print_speed_status(check_interval)
+                last_status_time = time.time()
+
+            # 예약된 키 떼기 처리 (스케줄러 스레드를 쓰지 않는 경우)
+            if not self.input_scheduler.threaded:
+                self.input_scheduler.poll()
+
+            # 창 이동 감지 (확인 주기마다)
+            self.check_roi_drift()
+
+            # ROI 영역 캡처
+            roi_img = self.capture_roi()
+
+            # 게임 오버 감지 (대기 중이면 감지/점프 없이 느린 간격으로 화면만 확인)
+            if self.game_monitor is not None and not self.monitor_game(roi_img, time.perf_counter()):
+                self.loop_scheduler.wait_next(self.get_loop_period(check_interval))
+                continue
+
+            # 장애물 감지 + 동작 판단 (쿨다운 포함)
+            is_obstacle, avg_brightness, detect_ratio, action = self.decide(roi_img, time.perf_counter())
+
+            if action is not None:
+                # 점프(픽셀 비율에 따라 강도 조절) 또는 웅크리기 실행
+                start = time.perf_counter()
+                self.act(action, detect_ratio)
+                self.stage_timer.record('jump', time.perf_counter() - start)
+
+                # 디버그 이미지 저장 (마감을 자주 넘기면 건너뜀)
+                saved_file = None
+                if not self.loop_scheduler.should_shed('debug'):
+                    start = time.perf_counter()
+                    saved_file = self.save_debug_image(roi_img, self.jump_count + self.duck_count)
+                    self.stage_timer.record('debug_save', time.perf_counter() - start)
+                self.notify_action_detail(avg_brightness, detect_ratio, self.dark_mode, saved_file)
+
+            # 다음 마감 시각까지 대기 (캡처/감지/입력에 걸린 시간 차감, 열 프로파일 감지기는 TTC에 맞춰 조절)
+            self.loop_scheduler.wait_next(self.get_loop_period(check_interval))
+
+    def run_pipelined(self):
+        """파이프라인 모드: 캡처/감지/동작을 별도 스레드로 실행"""
+        from pipeline import PipelinedRunner
+
+        runner = PipelinedRunner(self, buffer_size=self.pipeline_config.get('buffer_size', 3))
+        try:
+            runner.run()
+        finally:
+            self.pipeline_stats = runner.get_stats()
+            runner.print_stats()
 
-        print(f"플레이 결과 저장: {self.report_file}")
-    
     def run(self):
         """
         게임 자동화 실행 (동적 속도 조정 적용)
@@ -275,105 +973,223 @@ class DinoGameBot:
             print("ROI 설정이 로드되지 않았습니다.")
             return
 
+        pipelined = self.pipeline_config.get('enabled', False)
+
         print("\n" + "=" * 60)
         print("Chrome Dino Game Automation 시작")
         print("=" * 60)
-        print(f"동적 속도 조정: 활성화")
+        print("동적 속도 조정: 활성화")
         print(f"  - 초기 체크 간격: {self.speed_controller.BASE_CHECK_INTERVAL*1000:.0f}ms")
         print(f"  - 초기 쿨다운: {self.speed_controller.BASE_JUMP_COOLDOWN*1000:.0f}ms")
         print(f"  - 최대 속도 배율: {self.speed_controller.MAX_SPEED_FACTOR:.2f}x (약 {self.speed_controller.TIME_TO_MAX:.0f}초 후)")
-        print(f"디버그 이미지 저장 위치: {self.debug_folder}/")
+        print(f"  - 속도 프로필: {self.speed_controller.profile.name}")
+        print(f"캡처 백엔드: {self.frame_source.name}")
+        print(f"실행 모드: {'파이프라인 (캡처/감지/동작 스레드 분리)' if pipelined else '단일 스레드'}")
+        print(f"콘솔 출력: {self.events.describe()}")
+        if self.debug_writer is not None:
+            print(f"디버그 이미지 저장 위치: {self.debug_folder}/")
+        if self.black_box is not None:
+            manual_str = ", Enter 키를 누르면 바로 저장" if self.black_box.manual_key else ""
+            print(f"블랙박스 저장 위치: {self.black_box.folder}/ (게임 오버/오류 시{manual_str})")
         print("\n게임을 시작하세요!")
         print("종료하려면 Ctrl+C를 누르세요.")
         print("=" * 60 + "\n")
 
+        self.start_session()
+
+        try:
+            if pipelined:
+                self.run_pipelined()
+            else:
+                self.run_sequential()
+            # 게임 오버 감지의 max_games를 모두 마쳐 루프가 끝남
+            self.finish_session('completed')
+
+        except (KeyboardInterrupt, EOFError) as e:
+            if isinstance(e, EOFError):
+                # 파일 재생 소스의 프레임이 모두 소진됨
+                print("\n\n재생할 프레임이 모두 소진되었습니다.")
+            else:
+                print("\n\n사용자에 의해 중단되었습니다.")
+            self.finish_session('eof' if isinstance(e, EOFError) else 'stopped')
+
+        except Exception:
+            # 예외 직전 구간을 블랙박스로 남기고 그대로 전달
+            if self.black_box is not None:
+                self.black_box.dump('error')
+            raise
+
+        finally:
+            self.shutdown()
+
+    def start_session(self):
+        """플레이 시작: 속도 컨트롤러, 입력 스케줄러, 디버그 저장기, 프로파일러, 세션 기록 시작"""
         self.running = True
         self.play_start_time = datetime.now()
+        self.events.start()
         self.speed_controller.start()
-        last_status_time = time.time()
+        self.input_scheduler.start()
+        if self.debug_writer is not None:
+            self.debug_writer.start()
+        if self.profiler is not None:
+            self.profiler.start()
+        if self.profile_reloader is not None:
+            self.profile_reloader.start()
+        if self.black_box is not None:
+            self.black_box.start()
+        if self.session_store is not None:
+            self.session_store.start_run(self.play_start_time)
+        if self.game_monitor is not None:
+            self.game_monitor.start_game(time.perf_counter())
 
-        try:
-            while self.running:
-                # 동적 파라미터 가져오기
-                check_interval = self.speed_controller.get_check_interval()
-                ratio_threshold = self.speed_controller.get_dark_ratio_threshold()
-                jump_cooldown = self.speed_controller.get_jump_cooldown()
-
-                # 10초마다 속도 상태 출력
-                if time.time() - last_status_time >= 10:
-                    factor = self.speed_controller.get_speed_factor()
-                    elapsed = time.time() - self.speed_controller.start_time
-                    mode_str = "다크" if self.dark_mode else "라이트"
-                    base_width = self.base_roi['x2'] - self.base_roi['x1']
-                    shift_pixels = int(base_width * self.speed_controller.get_roi_expand_ratio())
-                    print(f"[속도] {elapsed:.0f}초 | {factor:.2f}x | 모드: {mode_str} | ROI이동: +{shift_pixels}px | 체크: {check_interval*1000:.0f}ms")
-                    last_status_time = time.time()
-
-                # ROI 영역 캡처
-                roi_img = self.capture_roi()
-
-                # 장애물 감지 (라이트/다크 모드 자동 대응)
-                is_obstacle, avg_brightness, detect_ratio = self.is_obstacle_detected(
-                    roi_img, ratio_threshold=ratio_threshold
-                )
-
-                if is_obstacle:
-                    # 점프 실행 (픽셀 비율에 따라 강도 조절)
-                    self.jump(detect_ratio)
-
-                    # 디버그 이미지 저장
-                    saved_file = self.save_debug_image(roi_img, self.jump_count)
-                    mode_str = "밝은" if self.dark_mode else "어두운"
-                    print(f"  - 평균 밝기: {avg_brightness:.1f}, {mode_str} 픽셀 비율: {detect_ratio*100:.1f}%")
-                    print(f"  - 디버그 이미지 저장: {saved_file}")
-
-                    # 동적 쿨다운 적용
-                    time.sleep(jump_cooldown)
-
-                # 동적 체크 간격 적용
-                time.sleep(check_interval)
-
-        except KeyboardInterrupt:
-            elapsed = time.time() - self.speed_controller.start_time if self.speed_controller.start_time else 0
-            print("\n\n사용자에 의해 중단되었습니다.")
-            print(f"총 플레이 시간: {elapsed:.1f}초")
-            print(f"총 점프 횟수: {self.jump_count}번")
-            print(f"디버그 이미지: {self.jump_count}개 저장됨")
-
-            # 플레이 결과 저장
-            self.save_report(elapsed)
+    def finish_session(self, end_reason):
+        """플레이 종료 요약 출력 후 결과 저장"""
+        elapsed = self.speed_controller.clock() - self.speed_controller.start_time if self.speed_controller.start_time is not None else 0
+        # 대기 중인 이벤트를 먼저 출력해 요약이 마지막에 오도록
+        self.events.flush()
+        print(f"{self.log_prefix()}총 플레이 시간: {elapsed:.1f}초")
+        print(f"{self.log_prefix()}총 점프 횟수: {self.jump_count}번")
+        # 남은 디버그 이미지 저장 완료 대기
+        if self.debug_writer is not None:
+            self.debug_writer.close()
+            # 저장 실패 안내가 통계보다 먼저 나오도록
+            self.events.flush()
+            debug_stats = self.debug_writer.get_stats()
+            print(f"디버그 이미지: {debug_stats['written']}개 저장됨 (버림: {debug_stats['dropped']}개)")
+        capture_stats = self.frame_source.get_latency_stats()
+        print(f"캡처 지연 ({capture_stats['backend']}): 평균 {capture_stats['avg_ms']:.1f}ms, 최대 {capture_stats['max_ms']:.1f}ms")
+        for stage, stats in self.stage_timer.summary().items():
+            print(f"  - {stage}: p50 {stats['p50_ms']:.3f}ms | p95 {stats['p95_ms']:.3f}ms | p99 {stats['p99_ms']:.3f}ms | 최대 {stats['max_ms']:.3f}ms")
+        if self.profiler is not None:
+            self.profiler.stop()
+            self.events.flush()
+            for name, share in self.profiler.top_functions(5):
+                print(f"  - 프로파일 {share*100:5.1f}%: {name}")
+
+        if self.game_monitor is not None:
+            stats = self.game_monitor.get_stats()
+            print(f"{self.log_prefix()}게임 오버 감지: {stats['games']}판 종료, 자동 재시작 {stats['restarts']}번"
+                  f" (평균 생존 {stats['mean_survival_seconds'] or 0:.1f}초)")
+            if self.game_monitor.is_idle():
+                # 마지막 게임은 게임 오버 때 이미 기록됨
+                return
 
+        # 플레이 결과 저장
+        self.save_report(elapsed, end_reason)
+
+    def shutdown(self):
+        """누르고 있는 키가 남지 않도록 항상 정리하고 백엔드 자원 해제"""
         self.running = False
+        self.input_scheduler.stop()
+        self.input_scheduler.sink.close()
+        if self.profiler is not None:
+            self.profiler.stop()
+        if self.profile_reloader is not None:
+            self.profile_reloader.stop()
+        if self.session_store is not None:
+            # 요약 없이 닫히면 (예외 종료) 세션은 'incomplete'로 남고 이벤트는 보존됨
+            self.session_store.close()
+        if self.debug_writer is not None:
+            self.debug_writer.close()
+        if self.black_box is not None:
+            self.black_box.close()
+        if self.owns_events:
+            self.events.close()
+        if self.debug_archiver is not None and self.debug_archiver.is_busy():
+            print("이전 디버그 폴더 정리가 끝나기를 기다리는 중...")
+            self.debug_archiver.wait()
+        self.frame_source.close()
+        if self.recorder is not None:
+            self.recorder.close()
 
 
-def main():
-    """메인 함수"""
-    print("Chrome Dino Game Bot을 시작합니다...\n")
-    
-    # 봇 인스턴스 생성
-    bot = DinoGameBot()
-    
-    # ROI 설정 확인
-    if bot.roi is None:
-        print("\n프로그램을 종료합니다.")
-        return
-    
+def load_config(config_file='roi_config.json'):
+    """설정 파일 읽기 (없거나 읽을 수 없으면 안내 후 None)"""
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"오류: '{config_file}' 파일을 찾을 수 없습니다.")
+        print("먼저 calibrate.py를 실행하여 ROI를 설정해주세요.")
+    except Exception as e:
+        print(f"ROI 설정 로드 중 오류 발생: {e}")
+    return None
+
+
+def wait_for_enter():
+    """준비 안내 후 Enter 대기"""
     print("\n준비 사항:")
     print("1. Chrome 브라우저에서 chrome://dino 페이지를 열어주세요")
     print("2. 게임 화면을 calibrate.py에서 설정한 위치에 배치해주세요")
     print("3. 게임을 시작할 준비를 해주세요 (스페이스바를 눌러 시작)")
-    
+
     input("\n준비가 되면 Enter 키를 눌러주세요...")
-    
-    # 카운트다운
+
+
+def countdown(warm_up=None):
+    """
+    3초 카운트다운 (첫 1초 동안 워밍업 실행)
+
+    Args:
+        warm_up: 카운트다운 중에 실행할 함수 (1초를 넘기면 그만큼 카운트다운이 늦어짐)
+    """
     for i in range(3, 0, -1):
+        deadline = time.perf_counter() + 1.0
         print(f"{i}...")
-        time.sleep(1)
+        if i == 3 and warm_up is not None:
+            warm_up()
+        remaining = deadline - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
     print("시작!\n")
-    
-    # 봇 실행 (동적 속도 조정 자동 적용)
-    bot.run()
-    
+
+
+def main():
+    """메인 함수"""
+    startup = StartupTimer(STARTED_AT)
+    print("Chrome Dino Game Bot을 시작합니다...\n")
+
+    config = load_config()
+    if config is None:
+        print("\n프로그램을 종료합니다.")
+        return
+
+    # cv2/numpy/캡처/입력 모듈은 준비 안내를 기다리는 동안 백그라운드에서 불러옴
+    preloader = ModulePreloader(modules_for_config(config)).start()
+    startup.mark('imports')
+
+    wait_for_enter()
+    startup.mark('waiting', waiting=True)
+
+    if config.get('games'):
+        # 여러 게임 동시 실행 모드 (화면 캡처 한 번을 게임별 ROI로 나눠 사용)
+        from multi_game import MultiGameRunner
+
+        target = MultiGameRunner(config)
+    else:
+        # 봇 인스턴스 생성
+        target = DinoGameBot()
+
+        # ROI 설정 확인
+        if target.roi is None:
+            print("\n프로그램을 종료합니다.")
+            return
+    startup.mark('bot')
+
+    def warm_up():
+        preloader.wait()
+        target.warm_up()
+        startup.mark('warm_up')
+        startup.details['preload'] = preloader.get_stats()
+
+    # 카운트다운 동안 캡처/감지/입력 백엔드 워밍업
+    countdown(warm_up)
+    startup.mark('countdown', waiting=True)
+
+    # 봇 실행 (동적 속도 조정 자동 적용, 첫 프레임 판단 시 시작 시간 출력)
+    target.track_startup(startup)
+    target.run()
+
     print("\n프로그램이 종료되었습니다.")
 
 
@@ -0,0 +1,222 @@
+"""
+여러 게임 동시 실행 (MultiGameRunner)
+roi_config.json의 'games' 목록에 있는 게임마다 DinoGameBot을 하나씩 만들되,
+화면 캡처는 틱마다 모든 ROI를 포함하는 영역을 한 번만 수행하고 게임별 ROI는 복사 없이 잘라 쓴다.
+게임마다 속도 컨트롤러, 입력 대상, 디버그 폴더, 세션 기록이 따로 유지된다.
+
+설정 예:
+    "games": [
+        {"name": "left", "roi": {"x1": 120, "y1": 300, "x2": 220, "y2": 340}, "input": {"focus": [300, 250]}},
+        {"name": "right", "roi": {"x1": 1080, "y1": 300, "x2": 1180, "y2": 340}, "input": {"focus": [1260, 250]}}
+    ],
+    "multi_game": {"workers": 2}
+"""
+
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from event_bus import EventBus
+from frame_source import SharedCapture, SharedSliceSource, create_frame_source
+from loop_scheduler import LoopScheduler
+from main import DinoGameBot
+
+# 게임별 설정으로 넘기지 않는 항목 (여러 게임이 함께 쓰거나 게임 하나에만 의미가 있음)
+SHARED_SECTIONS = ('games', 'multi_game', 'capture', 'pipeline', 'profiler', 'record', 'scheduler', 'console')
+
+
+def build_game_config(config, game):
+    """
+    공통 설정 위에 게임 항목을 덮어써 게임별 설정 생성
+
+    Args:
+        config: 전체 설정
+        game: 'games' 목록의 항목 (name, roi 필수, 나머지 항목은 공통 설정을 덮어씀)
+    """
+    game_config = {key: value for key, value in config.items() if key not in SHARED_SECTIONS}
+    for key, value in game.items():
+        if isinstance(value, dict) and isinstance(game_config.get(key), dict):
+            game_config[key] = {**game_config[key], **value}
+        else:
+            game_config[key] = value
+
+    roi = game_config['roi']
+    game_config.setdefault('width', roi['x2'] - roi['x1'])
+    game_config.setdefault('height', roi['y2'] - roi['y1'])
+    return game_config
+
+
+class MultiGameRunner:
+    """
+    공유 캡처 기반 여러 게임 실행기
+
+    Args:
+        config: 'games' 목록을 포함한 전체 설정
+        debug_folder: 디버그 이미지 폴더 접두사 (게임별로 '<접두사>_<이름>', None이면 저장하지 않음)
+    """
+
+    def __init__(self, config, debug_folder='debug_captures'):
+        multi_config = config.get('multi_game', {})
+        # 감지 작업 스레드 수 (cv2/numpy 연산은 GIL을 풀기 때문에 스레드로 병렬 처리됨, 1 이하이면 순서대로 처리)
+        self.workers = multi_config.get('workers', 1)
+
+        self.shared = SharedCapture(create_frame_source(config.get('capture')))
+        self.loop_scheduler = LoopScheduler(**config.get('scheduler', {}))
+        # 콘솔/이벤트 로그 출력은 모든 게임이 하나를 공유 (출력에 게임 이름이 붙음, 한 줄 상태는 나란히 표시)
+        self.events = EventBus(**config.get('console', {}))
+        self.running = False
+        self.startup_timer = None  # 시작 시간 계측 (main()에서 연결, 첫 틱 판단까지 기록)
+        self.first_frame_pending = False
+
+        self.bots = []
+        for index, game in enumerate(config['games']):
+            game = dict(game)
+            game.setdefault('name', f"game{index + 1}")
+            game_config = build_game_config(config, game)
+
+            print(f"\n[{game['name']}] 게임 설정")
+            bot = DinoGameBot(
+                config_file=None,
+                debug_folder=f"{debug_folder}_{game['name']}" if debug_folder is not None else None
+            )
+            # 게임별 캡처는 공유 캡처에서 ROI만 잘라낸 뷰
+            bot.apply_config(game_config, frame_source=SharedSliceSource(self.shared))
+            # 마감 초과/선택 작업 건너뛰기는 공유 루프 기준
+            bot.loop_scheduler = self.loop_scheduler
+            bot.events = self.events
+            bot.owns_events = False
+            # 창 이동 감지 영역은 공유 캡처 영역 밖이므로 여러 게임 모드에서는 사용하지 않음
+            if bot.drift_checker is not None:
+                print(f"[{game['name']}] 여러 게임 모드에서는 창 이동 감지를 지원하지 않습니다.")
+                bot.drift_checker = None
+            self.bots.append(bot)
+
+    def track_startup(self, startup_timer):
+        """시작 시간 계측 연결 (첫 틱의 모든 게임 판단이 끝나면 'first_frame' 단계 기록)"""
+        self.startup_timer = startup_timer
+        self.first_frame_pending = True
+        for bot in self.bots:
+            bot.startup_timer = startup_timer
+
+    def warm_up(self):
+        """카운트다운 동안 공유 캡처 한 번 후 게임별 감지/입력 워밍업 (캡처 통계는 되돌림)"""
+        self.shared.grab([bot.get_dynamic_roi() for bot in self.bots])
+        for bot in self.bots:
+            bot.warm_up()
+        self.shared.frame_source.reset_stats()
+
+    def _detect(self, bot, region, captured_at):
+        """게임 하나의 ROI 뷰로 감지 + 점프 판단 (게임 오버 대기 중이면 판단 결과 None)"""
+        roi_img = bot.capture_roi(region)
+        if bot.game_monitor is not None and not bot.monitor_game(roi_img, captured_at):
+            return roi_img, None
+        return roi_img, bot.decide(roi_img, time.perf_counter(), captured_at)
+
+    def run(self):
+        """모든 게임 실행 (Ctrl+C로 종료)"""
+        print("\n" + "=" * 60)
+        print(f"Chrome Dino Game Automation 시작 (게임 {len(self.bots)}개)")
+        print("=" * 60)
+        print(f"캡처 백엔드: {self.shared.frame_source.name} (틱마다 한 번 캡처 후 게임별로 잘라 사용)")
+        print(f"감지 작업 스레드: {self.workers if self.workers > 1 else '사용 안 함 (순서대로 처리)'}")
+        print(f"콘솔 출력: {self.events.describe()}")
+        print("종료하려면 Ctrl+C를 누르세요.")
+        print("=" * 60 + "\n")
+
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='detect') if self.workers > 1 else None
+        for bot in self.bots:
+            bot.start_session()
+        self.running = True
+
+        try:
+            self._loop(executor)
+            # 모든 게임이 게임 오버 감지의 max_games를 마침
+            for bot in self.bots:
+                bot.finish_session('completed')
+
+        except (KeyboardInterrupt, EOFError) as e:
+            if isinstance(e, EOFError):
+                print("\n\n재생할 프레임이 모두 소진되었습니다.")
+            else:
+                print("\n\n사용자에 의해 중단되었습니다.")
+            for bot in self.bots:
+                bot.finish_session('eof' if isinstance(e, EOFError) else 'stopped')
+
+        except Exception:
+            # 예외 직전 구간을 게임별 블랙박스로 남기고 그대로 전달
+            for bot in self.bots:
+                if bot.black_box is not None:
+                    bot.black_box.dump('error')
+            raise
+
+        finally:
+            self.running = False
+            if executor is not None:
+                executor.shutdown(wait=True)
+            for bot in self.bots:
+                bot.shutdown()
+            # 공유 출력은 모든 게임이 정리된 뒤 한 번만 닫음 (게임별 정리 메시지까지 로그에 남도록)
+            self.events.close()
+            self.shared.close()
+
+    def _loop(self, executor):
+        """캡처 한 번 → 게임별 감지 → 점프/웅크리기 → 다음 마감 시각까지 대기"""
+        bots = self.bots
+        last_status_time = time.time()
+        self.loop_scheduler.start()
+
+        while self.running:
+            # 정해진 판수를 마친 게임은 제외 (게임 오버 감지의 max_games)
+            if not all(bot.running for bot in bots):
+                bots = [bot for bot in bots if bot.running]
+                if not bots:
+                    break
+
+            # 게임별 속도 파라미터 갱신 (틱마다 한 번)
+            for bot in bots:
+                bot.speed_controller.tick()
+
+            # 모든 게임의 동적 ROI를 포함하는 영역을 한 번만 캡처
+            regions = [bot.get_dynamic_roi() for bot in bots]
+            self.shared.grab(regions)
+            captured_at = time.perf_counter()
+
+            if executor is not None:
+                results = list(executor.map(self._detect, bots, regions, itertools.repeat(captured_at)))
+            else:
+                results = [self._detect(bot, region, captured_at) for bot, region in zip(bots, regions)]
+
+            if self.first_frame_pending:
+                self.first_frame_pending = False
+                self.startup_timer.mark('first_frame')
+                self.events.emit('first_frame', {"startup": self.startup_timer.format()})
+
+            for bot, (roi_img, result) in zip(bots, results):
+                # 예약된 키 떼기 처리 (스케줄러 스레드를 쓰지 않는 경우)
+                if not bot.input_scheduler.threaded:
+                    bot.input_scheduler.poll()
+                if result is None:
+                    continue
+                is_obstacle, avg_brightness, detect_ratio, action = result
+                if action is None:
+                    continue
+
+                start = time.perf_counter()
+                bot.act(action, detect_ratio)
+                bot.stage_timer.record('jump', time.perf_counter() - start)
+
+                if not self.loop_scheduler.should_shed('debug'):
+                    start = time.perf_counter()
+                    bot.save_debug_image(roi_img, bot.jump_count + bot.duck_count)
+                    bot.stage_timer.record('debug_save', time.perf_counter() - start)
+
+            # 상태 출력 간격마다 게임별 속도 상태 (마감을 자주 넘기면 미룸)
+            if time.time() - last_status_time >= self.events.status_interval and not self.loop_scheduler.should_shed('status'):
+                for bot in bots:
+                    if not bot.is_idle():
+                        bot.print_speed_status(bot.speed_controller.get_check_interval())
+                last_status_time = time.time()
+
+            # 가장 빠른 게임의 체크 간격에 맞춤 (모든 게임이 게임 오버 대기 중이면 대기 확인 간격)
+            period = min(bot.get_loop_period(bot.speed_controller.get_check_interval()) for bot in bots)
+            self.loop_scheduler.wait_next(period)
@@ -0,0 +1,233 @@
+"""
+캡처 → 감지 → 동작 파이프라인 모드
+캡처 스레드가 작은 링 버퍼를 채우고, 감지 루프는 항상 가장 최신 프레임만 읽으며,
+점프(키 입력)와 디버그 이미지 저장은 별도의 작업 스레드에서 처리한다.
+"""
+
+import queue
+import threading
+import time
+
+import numpy as np
+
+
+class LatestFrameBuffer:
+    """
+    최신 프레임 링 버퍼
+    슬롯 배열을 재사용하며, 읽는 중인 슬롯과 최신 슬롯은 덮어쓰지 않는다.
+    감지 측이 따라가지 못하면 오래된 프레임은 읽히지 않고 버려진다.
+    """
+
+    def __init__(self, capacity=3):
+        # 쓰기 슬롯 + 최신 슬롯 + 읽는 중인 슬롯을 위해 최소 3개 필요
+        self.capacity = max(3, capacity)
+        self._slots = [None] * self.capacity
+        self._timestamps = [0.0] * self.capacity
+        self._seqs = [0] * self.capacity
+        self._latest = None
+        self._reading = None
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    def put(self, frame, timestamp):
+        """프레임을 빈 슬롯에 복사한 뒤 최신 프레임으로 공개"""
+        with self._cond:
+            index = 0
+            while index == self._latest or index == self._reading:
+                index += 1
+
+        slot = self._slots[index]
+        if slot is None or slot.shape != frame.shape:
+            # ROI 크기가 바뀐 경우에만 재할당
+            slot = np.empty_like(frame)
+            self._slots[index] = slot
+        np.copyto(slot, frame)
+
+        with self._cond:
+            self._seq += 1
+            self._seqs[index] = self._seq
+            self._timestamps[index] = timestamp
+            self._latest = index
+            self._cond.notify_all()
+            return self._seq
+
+    def get_latest(self, last_seq, timeout=0.5):
+        """
+        last_seq 이후의 최신 프레임을 읽기 위해 잠금
+
+        Returns:
+            tuple: (프레임 번호, 캡처 시각, 프레임) 또는 새 프레임이 없으면 None
+        """
+        with self._cond:
+            if self._seq <= last_seq:
+                self._cond.wait(timeout)
+            if self._seq <= last_seq or self._latest is None:
+                return None
+            index = self._latest
+            self._reading = index
+            return self._seqs[index], self._timestamps[index], self._slots[index]
+
+    def release(self):
+        """읽기가 끝난 슬롯을 다시 쓰기 가능하게 함"""
+        with self._cond:
+            self._reading = None
+
+    def wake(self):
+        """대기 중인 감지 루프를 깨움 (종료 시)"""
+        with self._cond:
+            self._cond.notify_all()
+
+
+class PipelinedRunner:
+    """
+    DinoGameBot의 파이프라인 실행기
+
+    Args:
+        bot: DinoGameBot 인스턴스
+        buffer_size: 링 버퍼 슬롯 수 (최소 3)
+    """
+
+    def __init__(self, bot, buffer_size=3):
+        self.bot = bot
+        self.buffer = LatestFrameBuffer(buffer_size)
+        self.actions = queue.Queue(maxsize=1)
+        self.stop_event = threading.Event()
+        self.capture_error = None
+        self.start_time = None
+
+        self.frames_captured = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.actions_skipped = 0
+        self.total_staleness = 0.0
+        self.max_staleness = 0.0
+
+    def _capture_loop(self):
+        """캡처 스레드: 마감 시각마다 ROI를 캡처해 링 버퍼에 기록"""
+        scheduler = self.bot.loop_scheduler
+        scheduler.start()
+        try:
+            while not self.stop_event.is_set():
+                # 이번 틱의 속도 파라미터 (동적 ROI/체크 간격, 감지 스레드도 이 값을 사용)
+                params = self.bot.speed_controller.tick()
+
+                # 창 이동 감지도 캡처 백엔드를 쓰므로 캡처 스레드에서 실행
+                self.bot.check_roi_drift()
+                frame = self.bot.capture_roi()
+                self.buffer.put(frame, time.perf_counter())
+                self.frames_captured += 1
+
+                # 다음 마감 시각까지 대기 (캡처에 걸린 시간 차감, 게임 오버 대기 중이면 느린 간격, 종료 시 즉시 깨어남)
+                scheduler.wait_next(self.bot.get_loop_period(params.check_interval), sleep=self.stop_event.wait)
+        except BaseException as e:
+            self.capture_error = e
+        finally:
+            self.stop_event.set()
+            self.buffer.wake()
+
+    def _action_loop(self):
+        """동작 스레드: 점프/웅크리기 실행 후 디버그 이미지 저장"""
+        while True:
+            item = self.actions.get()
+            if item is None:
+                break
+            roi_img, avg_brightness, detect_ratio, dark_mode, action = item
+
+            start = time.perf_counter()
+            self.bot.act(action, detect_ratio)
+            self.bot.stage_timer.record('jump', time.perf_counter() - start)
+
+            # 캡처 마감을 자주 넘기면 디버그 이미지 저장은 건너뜀
+            saved_file = None
+            if not self.bot.loop_scheduler.should_shed('debug'):
+                start = time.perf_counter()
+                saved_file = self.bot.save_debug_image(roi_img, self.bot.jump_count + self.bot.duck_count)
+                self.bot.stage_timer.record('debug_save', time.perf_counter() - start)
+            self.bot.notify_action_detail(avg_brightness, detect_ratio, dark_mode, saved_file)
+
+    def run(self):
+        """감지 루프 실행 (호출한 스레드에서 동작, Ctrl+C로 종료)"""
+        bot = self.bot
+        self.start_time = time.perf_counter()
+        capture_thread = threading.Thread(target=self._capture_loop, name='capture', daemon=True)
+        action_thread = threading.Thread(target=self._action_loop, name='action', daemon=True)
+        capture_thread.start()
+        action_thread.start()
+
+        last_seq = 0
+        last_status_time = time.time()
+
+        try:
+            while bot.running:
+                item = self.buffer.get_latest(last_seq)
+                if item is None:
+                    if self.stop_event.is_set():
+                        break
+                    continue
+
+                seq, captured_at, roi_img = item
+                try:
+                    # 읽지 못하고 덮어써진 프레임 수 집계
+                    self.frames_dropped += seq - last_seq - 1
+                    last_seq = seq
+
+                    # 게임 오버 대기 중인 프레임은 감지/점프 판단에서 제외
+                    if bot.game_monitor is not None and not bot.monitor_game(roi_img, captured_at):
+                        continue
+
+                    is_obstacle, avg_brightness, detect_ratio, action = bot.decide(roi_img, time.perf_counter(), captured_at)
+
+                    now = time.perf_counter()
+                    staleness = now - captured_at
+                    self.total_staleness += staleness
+                    if staleness > self.max_staleness:
+                        self.max_staleness = staleness
+                    self.frames_processed += 1
+
+                    if action is not None:
+                        try:
+                            # 슬롯은 재사용되므로 동작 스레드에는 복사본 전달
+                            self.actions.put_nowait((roi_img.copy(), avg_brightness, detect_ratio, bot.dark_mode, action))
+                        except queue.Full:
+                            # 이전 동작이 아직 진행 중
+                            self.actions_skipped += 1
+                finally:
+                    self.buffer.release()
+
+                # 상태 출력 간격마다 속도/파이프라인 상태 (캡처 마감을 자주 넘기면 미룸)
+                if (time.time() - last_status_time >= bot.events.status_interval
+                        and not bot.loop_scheduler.should_shed('status') and not bot.is_idle()):
+                    bot.print_speed_status(bot.speed_controller.get_check_interval())
+                    bot.notify('pipeline', self.get_stats())
+                    last_status_time = time.time()
+        finally:
+            self.stop_event.set()
+            self.buffer.wake()
+            capture_thread.join(timeout=1.0)
+            self.actions.put(None)
+            action_thread.join(timeout=1.0)
+
+        if self.capture_error is not None:
+            raise self.capture_error
+
+    def get_stats(self):
+        """파이프라인 처리량/지연 통계 반환"""
+        elapsed = time.perf_counter() - self.start_time if self.start_time else 0.0
+        processed = self.frames_processed
+        return {
+            "frames_captured": self.frames_captured,
+            "frames_processed": processed,
+            "frames_dropped": self.frames_dropped,
+            "actions_skipped": self.actions_skipped,
+            "capture_fps": round(self.frames_captured / elapsed, 1) if elapsed else 0.0,
+            "process_fps": round(processed / elapsed, 1) if elapsed else 0.0,
+            "avg_staleness_ms": round(self.total_staleness / processed * 1000, 3) if processed else 0.0,
+            "max_staleness_ms": round(self.max_staleness * 1000, 3)
+        }
+
+    def print_stats(self):
+        """파이프라인 통계 출력"""
+        stats = self.get_stats()
+        print(f"[파이프라인] 캡처: {stats['frames_captured']} ({stats['capture_fps']:.1f}fps) | "
+              f"처리: {stats['frames_processed']} | 버림: {stats['frames_dropped']} | "
+              f"지연: 평균 {stats['avg_staleness_ms']:.1f}ms / 최대 {stats['max_staleness_ms']:.1f}ms")
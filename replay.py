@@ -0,0 +1,212 @@
+"""
+프레임 리플레이 벤치마크
+frame_recorder로 기록한 프레임을 시뮬레이션 시간으로 DinoGameBot의 감지/점프 판단 로직에 통과시켜
+프레임당 처리 지연 백분위수와 점프 판단을 측정하고, 다른 코드 버전의 결과와 일치율을 비교한다.
+화면과 키보드 없이 동작하므로 CI 환경에서도 실행할 수 있다.
+
+사용법:
+    python replay.py session_frames.npy --output replay_result.json
+    python replay.py session_frames.npy --baseline replay_result.json
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from frame_recorder import load_recording
+from input_sink import InputScheduler, RecordingSink
+from main import DinoGameBot, SpeedController
+
+# 프레임별 판단 코드
+DECISION_NONE = 0
+DECISION_WEAK_JUMP = 1
+DECISION_STRONG_JUMP = 2
+DECISION_DUCK = 3
+
+
+class ReplayRunner:
+    """
+    기록된 프레임을 시뮬레이션 시간으로 재생
+
+    Args:
+        recording_path: frame_recorder 기록 파일 (.npy)
+        config_file: 판단 로직에 사용할 설정 파일 (없으면 프레임 크기로 ROI를 구성)
+    """
+
+    def __init__(self, recording_path, config_file='roi_config.json'):
+        self.recording_path = recording_path
+        self.records = load_recording(recording_path)
+        self.sim_time = 0.0
+
+        if len(self.records) == 0:
+            raise ValueError(f"기록된 프레임이 없습니다: {recording_path}")
+
+        self.bot = self._create_bot(config_file)
+
+    def clock(self):
+        """시뮬레이션 시각 (기록된 게임 경과 시간)"""
+        return self.sim_time
+
+    def _create_bot(self, config_file):
+        height, width = self.records['frame'].shape[1:3]
+        config = {}
+        if config_file and os.path.exists(config_file):
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        else:
+            config = {
+                'roi': {'x1': 0, 'y1': 0, 'x2': int(width), 'y2': int(height)},
+                'width': int(width),
+                'height': int(height)
+            }
+
+        # 화면/키보드/디스크 없이 동작하도록 백엔드 교체
+        config = dict(config)
+        config['capture'] = {'backend': 'file', 'path': self.recording_path, 'loop': False}
+        config['input'] = {'backend': 'recording', 'threaded': False}
+        config.pop('record', None)
+        config.pop('black_box', None)
+        config.pop('pipeline', None)
+
+        bot = DinoGameBot(config_file=None, debug_folder=None)
+        bot.apply_config(config)
+        bot.speed_controller = SpeedController(clock=self.clock, estimator=bot.speed_estimator,
+                                               profile=bot.speed_controller.profile)
+        bot.input_scheduler = InputScheduler(RecordingSink(clock=self.clock), clock=self.clock, threaded=False)
+        return bot
+
+    def run(self):
+        """
+        모든 프레임 재생
+
+        Returns:
+            dict: 지연 백분위수, 점프 판단 및 프레임별 판단 결과
+        """
+        bot = self.bot
+        frame_count = len(self.records)
+        timestamps = np.asarray(self.records['t'], dtype=np.float64)
+        frames = self.records['frame']
+        latencies = np.empty(frame_count, dtype=np.float64)
+        decisions = np.zeros(frame_count, dtype=np.uint8)
+        ratios = np.empty(frame_count, dtype=np.float64)
+
+        # 기록 시작 시각을 게임 시작 시각으로 사용
+        self.sim_time = 0.0
+        bot.speed_controller.start()
+
+        for i in range(frame_count):
+            self.sim_time = float(timestamps[i])
+            roi_img = frames[i]
+
+            start = time.perf_counter()
+            bot.speed_controller.tick()
+            is_obstacle, avg_brightness, detect_ratio, action = bot.decide(roi_img, self.sim_time)
+            if action == 'duck':
+                bot.input_scheduler.duck(bot.zone_detector.duck_duration)
+            elif action == 'jump':
+                jump_duration, jump_type = bot.get_jump_strength(detect_ratio)
+                bot.input_scheduler.jump(jump_duration)
+            bot.input_scheduler.poll()
+            latencies[i] = time.perf_counter() - start
+
+            ratios[i] = detect_ratio
+            if action == 'duck':
+                decisions[i] = DECISION_DUCK
+            elif action == 'jump':
+                decisions[i] = DECISION_WEAK_JUMP if jump_type == "약한" else DECISION_STRONG_JUMP
+
+        latencies_ms = latencies * 1000
+        jumps = (decisions == DECISION_WEAK_JUMP) | (decisions == DECISION_STRONG_JUMP)
+        p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+        duration = float(timestamps[-1] - timestamps[0])
+
+        return {
+            "recording": self.recording_path,
+            "frame_count": frame_count,
+            "duration_seconds": round(duration, 3),
+            "latency_ms": {
+                "mean": round(float(latencies_ms.mean()), 4),
+                "p50": round(float(p50), 4),
+                "p95": round(float(p95), 4),
+                "p99": round(float(p99), 4),
+                "max": round(float(latencies_ms.max()), 4)
+            },
+            "jump_count": int(np.count_nonzero(jumps)),
+            "weak_jump_count": int(np.count_nonzero(decisions == DECISION_WEAK_JUMP)),
+            "strong_jump_count": int(np.count_nonzero(decisions == DECISION_STRONG_JUMP)),
+            "duck_count": int(np.count_nonzero(decisions == DECISION_DUCK)),
+            "jump_frames": np.flatnonzero(jumps).tolist(),
+            "decisions": decisions.tolist(),
+            "ratios": np.round(ratios, 5).tolist(),
+            "input": bot.input_scheduler.get_stats()
+        }
+
+
+def compare_results(result, baseline, max_examples=20):
+    """
+    두 리플레이 결과의 프레임별 점프 판단 일치율 비교
+
+    Returns:
+        dict: 일치율과 불일치 프레임 예시
+    """
+    current = np.asarray(result['decisions'], dtype=np.uint8)
+    previous = np.asarray(baseline['decisions'], dtype=np.uint8)
+    if len(current) != len(previous):
+        raise ValueError(f"프레임 수가 다릅니다: {len(current)} vs {len(previous)}")
+
+    mismatch = np.flatnonzero(current != previous)
+    current_jumps = set(np.flatnonzero(current).tolist())
+    previous_jumps = set(np.flatnonzero(previous).tolist())
+    union = current_jumps | previous_jumps
+
+    return {
+        "frame_agreement": round(1.0 - len(mismatch) / len(current), 5),
+        "jump_agreement": round(len(current_jumps & previous_jumps) / len(union), 5) if union else 1.0,
+        "mismatch_count": int(len(mismatch)),
+        "only_in_current": sorted(current_jumps - previous_jumps)[:max_examples],
+        "only_in_baseline": sorted(previous_jumps - current_jumps)[:max_examples],
+        "baseline_latency_ms": baseline.get('latency_ms'),
+        "current_latency_ms": result['latency_ms']
+    }
+
+
+def main():
+    """리플레이 벤치마크 CLI"""
+    parser = argparse.ArgumentParser(description="기록된 프레임으로 감지/점프 판단 로직을 재생하고 벤치마크합니다.")
+    parser.add_argument('recording', help="frame_recorder 기록 파일 (.npy)")
+    parser.add_argument('--config', default='roi_config.json', help="판단 로직에 사용할 설정 파일")
+    parser.add_argument('--output', help="결과를 저장할 JSON 파일")
+    parser.add_argument('--baseline', help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args()
+
+    runner = ReplayRunner(args.recording, config_file=args.config)
+    result = runner.run()
+
+    latency = result['latency_ms']
+    print(f"\n리플레이 완료: {result['frame_count']}프레임 ({result['duration_seconds']:.1f}초 분량)")
+    print(f"  - 프레임당 처리 시간: p50 {latency['p50']:.3f}ms | p95 {latency['p95']:.3f}ms | p99 {latency['p99']:.3f}ms | 최대 {latency['max']:.3f}ms")
+    print(f"  - 점프 판단: {result['jump_count']}번 (약한 {result['weak_jump_count']} / 강한 {result['strong_jump_count']})")
+    if result['duck_count']:
+        print(f"  - 웅크리기 판단: {result['duck_count']}번")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        comparison = compare_results(result, baseline)
+        result['comparison'] = comparison
+        print(f"  - 기준 결과와 일치율: 프레임 {comparison['frame_agreement']*100:.2f}% | 점프 {comparison['jump_agreement']*100:.2f}%")
+        if comparison['mismatch_count']:
+            print(f"  - 현재에만 있는 점프 프레임: {comparison['only_in_current']}")
+            print(f"  - 기준에만 있는 점프 프레임: {comparison['only_in_baseline']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+        print(f"결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+자동 ROI 찾기 (ROILocator, DriftChecker)
+화면에서 공룡 스프라이트와 지면 선을 템플릿 매칭으로 찾아 ROI를 계산한다.
+전체 해상도에서 바로 매칭하지 않고, 축소한 이미지(피라미드 윗단)에서 후보 위치를 먼저 찾은 뒤
+후보 주변의 작은 창에서만 원래 해상도로 다시 매칭하므로 4K 화면에서도 1초 안에 끝난다.
+
+플레이 중에는 DriftChecker가 마지막으로 찾은 공룡 위치 주변만 주기적으로 다시 매칭해
+Chrome 창이 움직이면 기본 ROI를 같은 만큼 옮긴다.
+
+매칭은 정규화 상관계수(TM_CCOEFF_NORMED)의 절댓값을 사용하므로 밤(색 반전) 화면에서도 찾는다.
+"""
+
+import os
+
+import cv2
+import numpy as np
+
+# 공룡 스프라이트 기본 크기 (배율 1.0, Chrome 100% 확대 기준)
+DINO_SIZE = (44, 47)
+
+# 템플릿 주변에 포함할 배경 여백 (px, 배율 1.0 기준)
+TEMPLATE_MARGIN = 4
+
+# 공룡 크기 대비 ROI 위치 (공룡 오른쪽 끝과 지면 선 기준)
+#   x1 = 공룡 오른쪽 + 폭 * ROI_GAP, x2 = x1 + 폭 * ROI_WIDTH
+#   y1 = 지면 - 높이 * ROI_TOP, y2 = 지면 - 높이 * ROI_BOTTOM
+ROI_GAP = 0.7
+ROI_WIDTH = 1.6
+ROI_TOP = 0.8
+ROI_BOTTOM = 0.06
+
+
+def make_dino_template(scale=1.0):
+    """
+    기본 공룡 실루엣 템플릿 (그레이스케일, 밝은 배경에 어두운 공룡 + 여백)
+    템플릿 이미지 파일이 없을 때 사용하며, 몸통(왼쪽 아래)과 머리(오른쪽 위) 두 덩어리로 근사한다.
+    """
+    width = int(round(DINO_SIZE[0] * scale))
+    height = int(round(DINO_SIZE[1] * scale))
+    margin = int(round(TEMPLATE_MARGIN * scale))
+    template = np.full((height + margin * 2, width + margin * 2), 247, dtype=np.uint8)
+
+    def fill(x, y, w, h):
+        template[margin + int(round(y * height)):margin + int(round((y + h) * height)),
+                 margin + int(round(x * width)):margin + int(round((x + w) * width))] = 83
+
+    fill(0.0, 0.35, 0.7, 0.65)   # 몸통
+    fill(0.45, 0.0, 0.55, 0.4)   # 머리
+    return template
+
+
+def to_gray(image):
+    """RGB 또는 그레이스케일 이미지를 그레이스케일로 변환"""
+    if image.ndim == 3:
+        return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    return image
+
+
+def match_scores(image, template):
+    """정규화 상관계수의 절댓값 (배경이 균일해 분산이 0인 위치는 0으로 처리)"""
+    scores = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+    scores = np.abs(scores, out=scores)
+    scores[~np.isfinite(scores) | (scores > 1.0)] = 0.0
+    return scores
+
+
+def find_peaks(scores, count, radius):
+    """
+    점수가 높은 위치 count개 (이미 고른 위치 주변 radius는 제외)
+
+    Returns:
+        list: (점수, x, y) 목록
+    """
+    scores = scores.copy()
+    peaks = []
+    for _ in range(count):
+        _, best, _, (x, y) = cv2.minMaxLoc(scores)
+        if best <= 0:
+            break
+        peaks.append((best, x, y))
+        scores[max(y - radius, 0):y + radius + 1, max(x - radius, 0):x + radius + 1] = 0.0
+    return peaks
+
+
+class ROILocator:
+    """
+    피라미드 템플릿 매칭 기반 공룡/지면 위치 찾기
+
+    Args:
+        template: 공룡 템플릿 이미지 파일 경로 (없으면 기본 실루엣 사용, 여백 포함)
+        scales: 찾을 공룡 크기 배율 목록 (화면 배율/브라우저 확대 대응)
+        min_score: 찾았다고 판단할 최소 매칭 점수 (0~1)
+        min_coarse_size: 축소 단계에서 템플릿의 짧은 변이 이보다 작아지지 않도록 축소 배수 결정 (px)
+        candidates: 축소 단계에서 원래 해상도로 다시 확인할 후보 수 (배율별)
+    """
+
+    def __init__(self, template=None, scales=(1.0, 1.25, 1.5, 2.0), min_score=0.6,
+                 min_coarse_size=12, candidates=3):
+        self.template_path = template
+        self.scales = tuple(scales)
+        self.min_score = min_score
+        self.min_coarse_size = min_coarse_size
+        self.candidates = candidates
+        self.base_template = None
+        if template and os.path.exists(template):
+            self.base_template = to_gray(cv2.cvtColor(cv2.imread(template), cv2.COLOR_BGR2RGB))
+        self._templates = {}
+
+    def get_template(self, scale):
+        """배율에 맞춘 템플릿 (파일 템플릿은 저장된 크기를 배율 1.0으로 간주)"""
+        template = self._templates.get(scale)
+        if template is None:
+            if self.base_template is None:
+                template = make_dino_template(scale)
+            elif scale == 1.0:
+                template = self.base_template
+            else:
+                height, width = self.base_template.shape
+                size = (int(round(width * scale)), int(round(height * scale)))
+                template = cv2.resize(self.base_template, size, interpolation=cv2.INTER_AREA)
+            self._templates[scale] = template
+        return template
+
+    def template_margin(self, scale):
+        """템플릿 가장자리의 배경 여백 (파일 템플릿은 공룡에 딱 맞게 잘려 있다고 가정)"""
+        return int(round(TEMPLATE_MARGIN * scale)) if self.base_template is None else 0
+
+    def locate(self, screen):
+        """
+        화면 전체에서 공룡 찾기 (축소 이미지에서 후보 → 원래 해상도로 후보 주변만 확인)
+
+        Args:
+            screen: 화면 이미지 (RGB 또는 그레이스케일)
+
+        Returns:
+            dict: {'x', 'y', 'width', 'height', 'scale', 'score'} 공룡 영역 (못 찾으면 None)
+        """
+        gray = to_gray(screen)
+        best = None
+
+        for scale in self.scales:
+            template = self.get_template(scale)
+            height, width = template.shape
+            if height > gray.shape[0] or width > gray.shape[1]:
+                continue
+
+            # 템플릿의 짧은 변이 min_coarse_size 이상 남는 가장 큰 2의 거듭제곱으로 축소
+            factor = 1
+            while min(height, width) // (factor * 2) >= self.min_coarse_size:
+                factor *= 2
+
+            if factor > 1:
+                small = cv2.resize(gray, (gray.shape[1] // factor, gray.shape[0] // factor), interpolation=cv2.INTER_AREA)
+                small_template = cv2.resize(template, (width // factor, height // factor), interpolation=cv2.INTER_AREA)
+                coarse = match_scores(small, small_template)
+                peaks = find_peaks(coarse, self.candidates, max(small_template.shape) // 2)
+            else:
+                peaks = [(0.0, 0, 0)]
+                coarse = None
+
+            for _, px, py in peaks:
+                if coarse is None:
+                    # 축소할 필요가 없는 작은 템플릿: 원래 해상도에서 전체 매칭
+                    x1, y1 = 0, 0
+                    window = gray
+                else:
+                    # 후보 주변 (축소 배수 2칸 여유)만 원래 해상도로 매칭
+                    pad = factor * 2
+                    x1 = max(px * factor - pad, 0)
+                    y1 = max(py * factor - pad, 0)
+                    x2 = min(px * factor + width + pad, gray.shape[1])
+                    y2 = min(py * factor + height + pad, gray.shape[0])
+                    window = gray[y1:y2, x1:x2]
+                    if window.shape[0] < height or window.shape[1] < width:
+                        continue
+
+                scores = match_scores(window, template)
+                _, score, _, (mx, my) = cv2.minMaxLoc(scores)
+                if best is None or score > best['score']:
+                    margin = self.template_margin(scale)
+                    best = {
+                        'x': x1 + mx + margin,
+                        'y': y1 + my + margin,
+                        'width': width - margin * 2,
+                        'height': height - margin * 2,
+                        'scale': scale,
+                        'score': round(float(score), 4)
+                    }
+
+        if best is None or best['score'] < self.min_score:
+            return None
+        return best
+
+    def find_ground(self, screen, dino):
+        """
+        공룡 발밑 근처에서 지면 선의 y 좌표 찾기
+        공룡 오른쪽으로 넓게 이어진 행 중 배경과 가장 다른 행을 지면 선으로 본다.
+
+        Returns:
+            int: 지면 선 y 좌표 (화면 좌표)
+        """
+        gray = to_gray(screen)
+        bottom = dino['y'] + dino['height']
+        search = max(int(dino['height'] * 0.2), 2)
+        x1 = min(dino['x'] + dino['width'], gray.shape[1] - 1)
+        x2 = min(x1 + dino['width'] * 8, gray.shape[1])
+        y1 = max(bottom - search, 0)
+        y2 = min(bottom + search, gray.shape[0])
+        if x2 <= x1 or y2 <= y1:
+            return bottom
+
+        strip = gray[y1:y2, x1:x2].astype(np.int16)
+        background = np.median(strip)
+        # 행마다 배경과 다른 픽셀 비율 (지면 선은 거의 모든 열에서 다름)
+        contrast = np.count_nonzero(np.abs(strip - background) > 40, axis=1) / strip.shape[1]
+        row = int(np.argmax(contrast))
+        if contrast[row] < 0.5:
+            return bottom
+        return y1 + row
+
+    def compute_roi(self, dino, ground_y):
+        """공룡 위치와 지면 선으로 감지 ROI 계산"""
+        x1 = dino['x'] + dino['width'] + int(round(dino['width'] * ROI_GAP))
+        x2 = x1 + int(round(dino['width'] * ROI_WIDTH))
+        y1 = ground_y - int(round(dino['height'] * ROI_TOP))
+        y2 = ground_y - max(int(round(dino['height'] * ROI_BOTTOM)), 1)
+        return {'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2}
+
+    def calibrate(self, screen):
+        """
+        화면에서 공룡과 지면 선을 찾아 ROI 계산
+
+        Returns:
+            dict: {'roi', 'anchor'} (anchor는 공룡 영역 + 'ground_y', 실행 중 위치 보정 기준) 또는 None
+        """
+        dino = self.locate(screen)
+        if dino is None:
+            return None
+        ground_y = self.find_ground(screen, dino)
+        anchor = dict(dino, ground_y=ground_y)
+        return {'roi': self.compute_roi(dino, ground_y), 'anchor': anchor}
+
+    def save_template(self, screen, dino, path):
+        """찾은 공룡 영역을 템플릿 파일로 저장 (실행 중 위치 보정은 실제 화면 모양으로 매칭)"""
+        gray = to_gray(screen)
+        patch = gray[dino['y']:dino['y'] + dino['height'], dino['x']:dino['x'] + dino['width']]
+        cv2.imwrite(path, patch)
+        return path
+
+
+class DriftChecker:
+    """
+    실행 중 창 이동 감지 (마지막 공룡 위치 주변만 다시 매칭)
+
+    공룡이 점프 중이면 매칭 점수가 떨어지므로 점수가 충분한 경우만 사용하고,
+    같은 이동량이 confirm번 연속 나와야 보정한다.
+
+    Args:
+        anchor: 보정 기준 공룡 영역 (calibrate()의 'anchor')
+        template: 공룡 템플릿 이미지 파일 경로 (없으면 기본 실루엣)
+        interval: 확인 주기 (초)
+        margin: 공룡 위치 주변 탐색 범위 (px)
+        min_score: 최소 매칭 점수
+        min_shift: 이보다 작은 이동은 무시 (px)
+        confirm: 같은 이동량이 연속으로 나와야 하는 횟수
+    """
+
+    def __init__(self, anchor, template=None, interval=5.0, margin=40, min_score=0.7, min_shift=2, confirm=2):
+        self.anchor = dict(anchor)
+        self.locator = ROILocator(template, scales=(1.0,), min_score=min_score)
+        scale = anchor.get('scale', 1.0) if self.locator.base_template is None else 1.0
+        self.template = self.locator.get_template(scale)
+        self.margin_px = self.locator.template_margin(scale)
+        self.interval = interval
+        self.margin = margin
+        self.min_score = min_score
+        self.min_shift = min_shift
+        self.confirm = confirm
+        self.next_check = 0.0
+        self.pending = None
+        self.pending_count = 0
+        self.check_count = 0
+        self.correction_count = 0
+
+    def region(self):
+        """다시 매칭할 화면 영역 (공룡 템플릿 + 탐색 범위)"""
+        x = self.anchor['x'] - self.margin_px - self.margin
+        y = self.anchor['y'] - self.margin_px - self.margin
+        height, width = self.template.shape
+        return {'x1': max(x, 0), 'y1': max(y, 0), 'x2': x + width + self.margin * 2, 'y2': y + height + self.margin * 2}
+
+    def due(self, now):
+        """확인할 때가 되었는지"""
+        return now >= self.next_check
+
+    def check(self, frame_source, now):
+        """
+        공룡 위치 주변을 캡처해 이동량 확인
+
+        Args:
+            frame_source: 캡처 백엔드 (probe()로 캡처해 감지 루프의 재생 위치/버퍼/지연 통계를 건드리지 않음)
+            now: 현재 시각 (초)
+
+        Returns:
+            tuple: 확정된 이동량 (dx, dy), 이동이 없거나 확정 전이면 None
+        """
+        self.next_check = now + self.interval
+        self.check_count += 1
+        region = self.region()
+        gray = to_gray(frame_source.probe(region))
+        if gray.shape[0] < self.template.shape[0] or gray.shape[1] < self.template.shape[1]:
+            return None
+
+        _, score, _, (mx, my) = cv2.minMaxLoc(match_scores(gray, self.template))
+        if score < self.min_score:
+            # 점프 중이거나 게임 화면이 가려짐
+            self.pending = None
+            self.pending_count = 0
+            return None
+
+        dx = region['x1'] + mx + self.margin_px - self.anchor['x']
+        dy = region['y1'] + my + self.margin_px - self.anchor['y']
+        if abs(dx) < self.min_shift and abs(dy) < self.min_shift:
+            self.pending = None
+            self.pending_count = 0
+            return None
+
+        if self.pending == (dx, dy):
+            self.pending_count += 1
+        else:
+            self.pending = (dx, dy)
+            self.pending_count = 1
+        if self.pending_count < self.confirm:
+            # 다음 확인을 앞당겨 빨리 확정
+            self.next_check = now + min(self.interval, 0.5)
+            return None
+
+        self.anchor['x'] += dx
+        self.anchor['y'] += dy
+        if 'ground_y' in self.anchor:
+            self.anchor['ground_y'] += dy
+        self.pending = None
+        self.pending_count = 0
+        self.correction_count += 1
+        return dx, dy
+
+    def get_stats(self):
+        """확인/보정 횟수와 현재 기준 위치"""
+        return {
+            "checks": self.check_count,
+            "corrections": self.correction_count,
+            "anchor": {key: self.anchor[key] for key in ('x', 'y') if key in self.anchor}
+        }
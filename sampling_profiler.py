@@ -0,0 +1,91 @@
+"""
+샘플링 프로파일러 (SamplingProfiler)
+백그라운드 스레드가 일정 간격으로 다른 스레드들의 호출 스택을 찍어 함수별 샘플 수를 모은다.
+함수 호출마다 훅을 거는 cProfile과 달리 감지 루프를 느리게 만들지 않으므로 실제 플레이 중에 켤 수 있다.
+결과는 collapsed stack 형식(한 줄에 '스레드;함수;함수 샘플수')으로 저장되어
+flamegraph.pl이나 speedscope로 바로 볼 수 있다.
+"""
+
+import collections
+import os
+import sys
+import threading
+
+
+class SamplingProfiler:
+    """
+    스택 샘플링 프로파일러
+
+    Args:
+        interval: 샘플링 간격 (초)
+        output: collapsed stack 결과 파일 경로
+        max_depth: 스택당 최대 프레임 수 (가장 안쪽 기준)
+        notify: 시작/저장 안내를 넘길 함수 (kind, data) - 콘솔에 직접 쓰지 않도록 봇의 notify를 연결
+    """
+
+    def __init__(self, interval=0.005, output='profile_stacks.txt', max_depth=64, notify=None):
+        self.interval = interval
+        self.output = output
+        self.max_depth = max_depth
+        self.notify = notify
+        self.stacks = collections.Counter()
+        self.sample_count = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """샘플링 스레드 시작"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name='profiler', daemon=True)
+        self._thread.start()
+        if self.notify is not None:
+            self.notify('profiler_start', {"interval_ms": round(self.interval * 1000, 1)})
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                self.stacks[self._collapse(names.get(thread_id, str(thread_id)), frame)] += 1
+            self.sample_count += 1
+
+    def _collapse(self, thread_name, frame):
+        """프레임 체인을 '스레드;바깥 함수;...;안쪽 함수' 문자열로 변환"""
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        names.append(thread_name)
+        return ';'.join(reversed(names))
+
+    def stop(self):
+        """샘플링을 멈추고 결과 저장"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+        with open(self.output, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        if self.notify is not None:
+            self.notify('profiler_saved', {"output": self.output, "samples": self.sample_count})
+
+    def top_functions(self, limit=10):
+        """
+        가장 많이 샘플링된 함수 (스택 맨 안쪽 기준)
+
+        Returns:
+            list: (함수, 비율) 목록
+        """
+        totals = collections.Counter()
+        for stack, count in self.stacks.items():
+            totals[stack.rsplit(';', 1)[-1]] += count
+        total = sum(totals.values())
+        return [(name, count / total) for name, count in totals.most_common(limit)] if total else []
@@ -0,0 +1,331 @@
+"""
+세션 기록 저장소 (SessionStore)
+플레이 결과를 report.json 전체를 다시 쓰는 대신 로컬 SQLite 파일에 추가 전용으로 기록한다.
+세션 시작 시 run 행을 만들고, 점프/상태 이벤트를 백그라운드 스레드가 묶어서 주기적으로 커밋하므로
+프로그램이 비정상 종료되어도 마지막 커밋까지의 기록이 남는다.
+
+사용법:
+    python session_store.py stats                 # 최고 기록, 평균 생존 시간, 분당 점프 수
+    python session_store.py list --limit 20       # 최근 세션 목록
+    python session_store.py show 12               # 세션 요약과 이벤트 수
+    python session_store.py events 12 --kind jump # 세션 이벤트
+    python session_store.py import report.json    # 기존 report.json 가져오기
+"""
+
+import argparse
+import json
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    ended_at TEXT,
+    play_seconds REAL,
+    jump_count INTEGER,
+    end_reason TEXT,
+    source TEXT NOT NULL DEFAULT 'live',
+    summary TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    t REAL NOT NULL,
+    kind TEXT NOT NULL,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS events_run_kind ON events(run_id, kind);
+"""
+
+# 종료 기록 없이 끝난 세션은 마지막 이벤트 시각을 플레이 시간으로 사용
+RUN_VIEW = """
+SELECT r.id, r.started_at, r.ended_at, r.source,
+       COALESCE(r.end_reason, 'incomplete') AS end_reason,
+       COALESCE(r.play_seconds, (SELECT MAX(t) FROM events e WHERE e.run_id = r.id), 0) AS play_seconds,
+       COALESCE(r.jump_count, (SELECT COUNT(*) FROM events e WHERE e.run_id = r.id AND e.kind = 'jump'), 0) AS jump_count
+FROM runs r
+"""
+
+
+def connect(path):
+    """저장소 파일 열기 (WAL 모드, 없으면 생성)"""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class SessionStore:
+    """
+    SQLite 추가 전용 세션 기록기
+
+    Args:
+        path: 저장소 파일 경로
+        flush_interval: 이벤트 커밋 주기 (초, 비정상 종료 시 잃을 수 있는 최대 기록 구간)
+        queue_size: 대기 이벤트 최대 개수 (가득 차면 새 이벤트를 버림)
+        notify: 세션 시작/저장 안내를 넘길 함수 (kind, data) - 감지 루프에서 콘솔에 직접 쓰지 않도록 봇의 notify를 연결
+    """
+
+    def __init__(self, path='sessions.db', flush_interval=1.0, queue_size=4096, notify=None):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.notify = notify
+        self.run_id = None
+        self.event_count = 0
+        self.dropped = 0
+        self._conn = None
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+
+    def start_run(self, started_at=None):
+        """
+        새 세션 행을 만들고 이벤트 기록 스레드 시작
+        end_run() 후 다시 호출하면 같은 파일에 다음 세션 행을 만든다 (게임 오버 후 자동 재시작 시 게임마다 한 행).
+
+        Returns:
+            int: 세션 번호
+        """
+        if self._conn is None:
+            self._conn = connect(self.path)
+        self.event_count = 0
+        self.dropped = 0
+        started_at = started_at or datetime.now()
+        cursor = self._conn.execute(
+            "INSERT INTO runs (started_at, source) VALUES (?, 'live')",
+            (started_at.strftime("%Y-%m-%d %H:%M:%S"),)
+        )
+        self._conn.commit()
+        self.run_id = cursor.lastrowid
+
+        self._thread = threading.Thread(target=self._write_loop, name='session-store', daemon=True)
+        self._thread.start()
+        if self.notify is not None:
+            self.notify('session_start', {"path": self.path, "run_id": self.run_id})
+        return self.run_id
+
+    def log_event(self, kind, t, data=None):
+        """
+        이벤트 기록 요청 (대기하지 않음, 큐가 가득 차면 버림)
+
+        Args:
+            kind: 이벤트 종류 ('jump', 'status' 등)
+            t: 게임 경과 시간 (초)
+            data: JSON으로 저장할 추가 정보
+        """
+        run_id = self.run_id
+        if run_id is None:
+            return
+        try:
+            # 세션 번호는 넣을 때 정함 (세션이 바뀌는 중에 꺼내도 원래 세션에 기록)
+            self._queue.put_nowait((run_id, t, kind, data))
+        except queue.Full:
+            self.dropped += 1
+
+    def _write_loop(self):
+        """묶어서 삽입하고 flush_interval마다 커밋"""
+        running = True
+        while running:
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        """이벤트 묶음 삽입 후 커밋 (이번 세션 이벤트 수만 셈)"""
+        if not batch:
+            return
+        self._conn.executemany(
+            "INSERT INTO events (run_id, t, kind, data) VALUES (?, ?, ?, ?)",
+            [(run_id, t, kind, json.dumps(data, ensure_ascii=False) if data is not None else None)
+             for run_id, t, kind, data in batch]
+        )
+        self._conn.commit()
+        self.event_count += sum(1 for item in batch if item[0] == self.run_id)
+
+    def end_run(self, summary, end_reason='stopped'):
+        """
+        남은 이벤트를 기록하고 세션 요약 저장
+
+        Args:
+            summary: 플레이 결과 요약 (save_report의 play_result)
+            end_reason: 종료 사유 ('stopped', 'eof', 'error' 등)
+        """
+        if self.run_id is None:
+            return
+        self._stop_writer()
+        self._conn.execute(
+            "UPDATE runs SET ended_at = ?, play_seconds = ?, jump_count = ?, end_reason = ?, summary = ? WHERE id = ?",
+            (
+                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                summary.get('total_play_time_seconds'),
+                summary.get('jump_count'),
+                end_reason,
+                json.dumps(summary, ensure_ascii=False),
+                self.run_id
+            )
+        )
+        self._conn.commit()
+        if self.notify is not None:
+            self.notify('session_end', {"path": self.path, "run_id": self.run_id,
+                                        "events": self.event_count, "dropped": self.dropped})
+        # 다음 start_run() 전까지 들어오는 이벤트는 버림 (기록 스레드가 없음)
+        self.run_id = None
+
+    def _stop_writer(self):
+        """기록 스레드 종료 후 큐에 남은 이벤트까지 기록 (종료 신호 뒤에 들어온 이벤트 포함)"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                batch.append(item)
+        self._write_batch(batch)
+
+    def close(self):
+        """기록 스레드 종료 후 파일 닫기 (end_run 없이 닫으면 세션은 'incomplete'로 남음)"""
+        if self._conn is None:
+            return
+        self._stop_writer()
+        self._conn.close()
+        self._conn = None
+        self.run_id = None
+
+
+def import_report(conn, report_path):
+    """
+    기존 report.json의 play_history를 세션으로 가져오기 (이미 가져온 세션은 건너뜀)
+
+    Returns:
+        tuple: (가져온 세션 수, 건너뛴 세션 수)
+    """
+    with open(report_path, 'r', encoding='utf-8') as f:
+        report_data = json.load(f)
+
+    imported = {row[0] for row in conn.execute("SELECT summary FROM runs WHERE source = 'import'")}
+    rows = []
+    skipped = 0
+    for entry in report_data.get('play_history', []):
+        summary = json.dumps(entry, ensure_ascii=False)
+        if summary in imported:
+            skipped += 1
+            continue
+        imported.add(summary)
+        rows.append((
+            entry.get('play_start_time') or '',
+            entry.get('total_play_time_seconds'),
+            entry.get('jump_count'),
+            summary
+        ))
+    conn.executemany(
+        "INSERT INTO runs (started_at, play_seconds, jump_count, end_reason, source, summary) "
+        "VALUES (?, ?, ?, 'stopped', 'import', ?)",
+        rows
+    )
+    conn.commit()
+    return len(rows), skipped
+
+
+def query_stats(conn):
+    """전체 세션 집계: 세션 수, 최고 기록, 평균 생존 시간, 분당 점프 수"""
+    row = conn.execute(
+        f"SELECT COUNT(*), AVG(play_seconds), MAX(play_seconds), SUM(play_seconds), SUM(jump_count) FROM ({RUN_VIEW})"
+    ).fetchone()
+    best = conn.execute(
+        f"SELECT id, started_at, play_seconds, jump_count FROM ({RUN_VIEW}) ORDER BY play_seconds DESC LIMIT 1"
+    ).fetchone()
+    count, mean_seconds, max_seconds, total_seconds, total_jumps = row
+    return {
+        "runs": count,
+        "mean_play_seconds": round(mean_seconds, 1) if mean_seconds is not None else None,
+        "best_run": {"id": best[0], "started_at": best[1], "play_seconds": best[2], "jump_count": best[3]} if best else None,
+        "jumps_per_minute": round(total_jumps / total_seconds * 60, 2) if total_seconds else None
+    }
+
+
+def main():
+    """세션 기록 조회 CLI"""
+    parser = argparse.ArgumentParser(description="플레이 세션 기록을 조회합니다.")
+    parser.add_argument('--db', default='sessions.db', help="세션 저장소 파일")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('stats', help="최고 기록, 평균 생존 시간, 분당 점프 수")
+    list_parser = subparsers.add_parser('list', help="최근 세션 목록")
+    list_parser.add_argument('--limit', type=int, default=20)
+    show_parser = subparsers.add_parser('show', help="세션 요약")
+    show_parser.add_argument('run_id', type=int)
+    events_parser = subparsers.add_parser('events', help="세션 이벤트")
+    events_parser.add_argument('run_id', type=int)
+    events_parser.add_argument('--kind', help="이벤트 종류 (jump, status 등)")
+    import_parser = subparsers.add_parser('import', help="기존 report.json 가져오기")
+    import_parser.add_argument('report', help="report.json 경로")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+
+    if args.command == 'stats':
+        stats = query_stats(conn)
+        print(f"세션 수: {stats['runs']}")
+        if stats['runs']:
+            best = stats['best_run']
+            print(f"평균 생존 시간: {stats['mean_play_seconds']:.1f}초")
+            print(f"최고 기록: 세션 #{best['id']} ({best['started_at']}) {best['play_seconds']:.1f}초, 점프 {best['jump_count']}번")
+            if stats['jumps_per_minute'] is not None:
+                print(f"분당 점프 수: {stats['jumps_per_minute']:.1f}")
+
+    elif args.command == 'list':
+        rows = conn.execute(f"SELECT * FROM ({RUN_VIEW}) ORDER BY id DESC LIMIT ?", (args.limit,)).fetchall()
+        for run_id, started_at, ended_at, source, end_reason, play_seconds, jump_count in rows:
+            print(f"#{run_id:<5} {started_at:<19} {play_seconds:8.1f}초  점프 {jump_count:5d}  {end_reason:<10} {source}")
+
+    elif args.command == 'show':
+        row = conn.execute("SELECT summary FROM runs WHERE id = ?", (args.run_id,)).fetchone()
+        if row is None:
+            print(f"세션 #{args.run_id}이(가) 없습니다.")
+            return
+        counts = conn.execute(
+            "SELECT kind, COUNT(*) FROM events WHERE run_id = ? GROUP BY kind", (args.run_id,)
+        ).fetchall()
+        summary = json.loads(row[0]) if row[0] else {"end_reason": "incomplete"}
+        summary["event_counts"] = dict(counts)
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+    elif args.command == 'events':
+        sql = "SELECT t, kind, data FROM events WHERE run_id = ?"
+        params = [args.run_id]
+        if args.kind:
+            sql += " AND kind = ?"
+            params.append(args.kind)
+        for t, kind, data in conn.execute(sql + " ORDER BY t", params):
+            print(f"{t:8.2f}s {kind:<8} {data or ''}")
+
+    elif args.command == 'import':
+        count, skipped = import_report(conn, args.report)
+        skipped_str = f" (이미 가져온 {skipped}개는 건너뜀)" if skipped else ""
+        print(f"{args.report}에서 {count}개 세션을 가져왔습니다: {args.db}{skipped_str}")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
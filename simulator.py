@@ -0,0 +1,626 @@
+"""
+헤드리스 Dino 게임 시뮬레이터
+NumPy로 게임 화면(지면, 선인장, 새, 낮/밤 반전)을 그려 DinoGameBot의 캡처 백엔드(FrameSource)와
+키 입력 백엔드(InputSink)를 동시에 대신한다. 시뮬레이션 시간으로 실행하면 실제 시간보다 빠르게
+수천 번의 게임을 돌려 생존 시간, 반응 지연, 프레임당 CPU 비용을 측정할 수 있다.
+
+사용법:
+    python simulator.py --games 200 --seed 0
+    python simulator.py --realtime
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from frame_source import FrameSource
+from input_sink import InputScheduler, InputSink
+from main import DinoGameBot, SpeedController
+from session_store import connect
+from speed_profile import compile_profile
+
+
+class Obstacle:
+    """장애물 (게임 캔버스 좌표, 위쪽 y 기준)"""
+
+    def __init__(self, kind, x, y, width, height, speed_offset=0.0):
+        self.kind = kind
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.speed_offset = speed_offset
+        self.entered_roi_at = None  # ROI에 처음 들어온 시각 (반응 지연 측정용)
+        self.reacted = False
+
+
+class DinoSimulator(FrameSource, InputSink):
+    """
+    Dino 게임 시뮬레이터 (Chrome 공룡 게임의 물리 상수를 60fps 기준으로 근사)
+
+    Args:
+        seed: 장애물 배치 난수 시드
+        realtime: True이면 실제 시간으로 진행 (bot.run()과 함께 사용), False이면 advance()로 진행
+    """
+
+    name = 'simulator'
+
+    # 가상 화면과 게임 캔버스 위치
+    SCREEN_WIDTH = 800
+    SCREEN_HEIGHT = 300
+    GAME_X = 100
+    GAME_Y = 100
+    GAME_WIDTH = 600
+    GAME_HEIGHT = 150
+    GROUND_Y = 140  # 지면 (캔버스 좌표)
+
+    # 색상 (라이트 모드 기준, 밤에는 반전)
+    BACKGROUND = 247
+    FOREGROUND = 83
+
+    # 60fps 기준 물리 상수
+    FPS = 60
+    BASE_SPEED = 6.0  # px/frame (최대 속도 배율 2.17 → 약 13)
+    GRAVITY = 0.6
+    INITIAL_JUMP_VELOCITY = -10.0
+    DROP_VELOCITY = -5.0
+    MIN_JUMP_HEIGHT = 35
+    MAX_JUMP_Y = 30  # 이 높이보다 올라가면 점프 종료 (캔버스 좌표)
+    SPEED_DROP_COEFFICIENT = 3
+    GAP_COEFFICIENT = 0.6
+
+    # 스프라이트 크기
+    DINO_X = 50
+    DINO_SIZE = (44, 47)
+    DINO_DUCK_SIZE = (59, 30)
+    CACTUS_SMALL = (17, 35)
+    CACTUS_LARGE = (25, 50)
+    BIRD_SIZE = (46, 40)
+    BIRD_HEIGHTS = (100, 75, 50)  # 위쪽 y (100: 지면 근처, 75: 웅크려야 함, 50: 지나감)
+    BIRD_MIN_SPEED_FACTOR = 1.42  # 이 속도 배율 이상에서만 새 등장
+
+    # 낮/밤 전환 주기 (초)
+    NIGHT_INTERVAL = 40.0
+    NIGHT_DURATION = 12.0
+    RESTART_DELAY = 0.75  # 게임 오버 후 재시작 키를 무시하는 시간 (초, Chrome의 GAMEOVER_CLEAR_TIME)
+
+    def __init__(self, seed=0, realtime=False):
+        FrameSource.__init__(self)
+        self.realtime = realtime
+        self.speed_curve = compile_profile()  # 실제 게임 속도 곡선 (기본 프로필, 봇의 프로필과 무관)
+        self.scheduler = None
+        self._lock = threading.RLock()
+        self._buffer = None
+        self._realtime_start = time.perf_counter()  # 실시간 모드 시계 기준 (재시작해도 바꾸지 않음)
+        self._game_start = 0.0  # 현재 게임이 시작된 시계 시각 (실시간 모드)
+        self.reset(seed)
+
+    # ------------------------------------------------------------------
+    # 게임 상태
+    # ------------------------------------------------------------------
+
+    def reset(self, seed=None):
+        """새 게임 시작"""
+        with self._lock:
+            if seed is not None:
+                self.rng = np.random.default_rng(seed)
+            self.time = 0.0
+            self._frame_time = 0.0  # 물리 갱신이 끝난 시각
+            # 시계는 봇의 속도 컨트롤러도 쓰므로 되돌리지 않고, 게임 시간 기준만 옮김
+            self._game_start = self.clock() if self.realtime else 0.0
+            self.distance = 0.0
+            self.game_over = False
+            self.game_over_time = None
+            self.dino_y = float(self.GROUND_Y - self.DINO_SIZE[1])
+            self.velocity = 0.0
+            self.jumping = False
+            self.reached_min_height = False
+            self.jump_released = False  # 최소 높이 전에 키를 뗀 경우 도달 즉시 점프 종료
+            self.speed_drop = False
+            self.ducking = False
+            self.keys = set()
+            self.obstacles = []
+            self.next_obstacle_x = float(self.GAME_WIDTH)
+            self.jump_count = 0
+            self.reaction_latencies = []
+            self.roi = None
+
+    def clock(self):
+        """시뮬레이션 시각 (초, 실시간 모드에서는 재시작해도 계속 증가)"""
+        if self.realtime:
+            return time.perf_counter() - self._realtime_start
+        return self.time
+
+    def game_time(self):
+        """현재 게임 시작 후 경과 시간 (초, 물리 갱신 기준)"""
+        if self.realtime:
+            return self.clock() - self._game_start
+        return self.time
+
+    def speed(self):
+        """현재 장애물 이동 속도 (px/frame), 기본 속도 프로필의 시간 곡선을 따름 (시계는 게임 시작 시 0)"""
+        return self.BASE_SPEED * self.speed_curve.factor_at(self.game_time())
+
+    def is_night(self):
+        """밤(색상 반전) 여부"""
+        cycle = self.time % self.NIGHT_INTERVAL
+        return self.time >= self.NIGHT_INTERVAL and cycle < self.NIGHT_DURATION
+
+    def score(self):
+        """Chrome 공룡 게임과 같은 방식의 점수 (이동 거리 기반)"""
+        return int(self.distance * 0.025)
+
+    def advance(self, dt):
+        """시뮬레이션 시간을 dt초 진행 (60fps 단위로 물리 갱신)"""
+        self.advance_to(self.time + dt)
+
+    def advance_to(self, target_time):
+        """target_time까지 물리 갱신"""
+        with self._lock:
+            step = 1.0 / self.FPS
+            while not self.game_over and self._frame_time + step <= target_time:
+                self._frame_time += step
+                self.time = self._frame_time
+                if self.scheduler is not None and not self.scheduler.threaded:
+                    # 예약된 키 떼기를 물리 단계마다 처리
+                    self.scheduler.poll()
+                self._update_frame()
+            self.time = max(self.time, target_time) if not self.game_over else self.time
+
+    def _update_frame(self):
+        speed = self.speed()
+
+        # 공룡
+        if self.jumping:
+            frames = 1
+            if self.speed_drop:
+                frames = self.SPEED_DROP_COEFFICIENT
+            self.dino_y += self.velocity * frames
+            self.velocity += self.GRAVITY * frames
+            ground = self.GROUND_Y - self.DINO_SIZE[1]
+            if self.dino_y < ground - self.MIN_JUMP_HEIGHT:
+                self.reached_min_height = True
+            if self.dino_y < self.MAX_JUMP_Y or self.speed_drop or self.jump_released:
+                self._end_jump()
+            if self.dino_y >= ground:
+                self.dino_y = float(ground)
+                self.velocity = 0.0
+                self.jumping = False
+                self.speed_drop = False
+                self.reached_min_height = False
+        self.ducking = not self.jumping and 'down' in self.keys
+
+        # 장애물 이동 및 생성
+        for obstacle in self.obstacles:
+            obstacle.x -= speed + obstacle.speed_offset
+        self.obstacles = [o for o in self.obstacles if o.x + o.width > 0]
+        self.next_obstacle_x -= speed
+        if self.next_obstacle_x <= self.GAME_WIDTH:
+            self._spawn_obstacle(speed)
+
+        self.distance += speed
+        self._track_roi()
+
+        if self._check_collision():
+            self.game_over = True
+            self.game_over_time = self.time
+
+    def _spawn_obstacle(self, speed):
+        factor = speed / self.BASE_SPEED
+        x = max(self.next_obstacle_x, float(self.GAME_WIDTH))
+
+        if factor >= self.BIRD_MIN_SPEED_FACTOR and self.rng.random() < 0.25:
+            width, height = self.BIRD_SIZE
+            y = float(self.rng.choice(self.BIRD_HEIGHTS))
+            speed_offset = float(self.rng.choice((-0.8, 0.8)))
+            obstacle = Obstacle('bird', x, y, width, height, speed_offset)
+            min_gap = 150
+        else:
+            large = self.rng.random() < 0.5
+            unit_width, height = self.CACTUS_LARGE if large else self.CACTUS_SMALL
+            # 속도가 빠를수록 여러 개가 붙은 선인장 등장
+            max_group = 1 if factor < 1.3 else (2 if factor < 1.7 else 3)
+            group = int(self.rng.integers(1, max_group + 1))
+            width = unit_width * group
+            obstacle = Obstacle('cactus_large' if large else 'cactus_small', x, float(self.GROUND_Y - height), width, height)
+            min_gap = 120
+
+        self.obstacles.append(obstacle)
+        gap = round(width * speed + min_gap * self.GAP_COEFFICIENT)
+        self.next_obstacle_x = x + width + float(self.rng.uniform(gap, gap * 1.5))
+
+    def _dino_box(self):
+        if self.ducking:
+            width, height = self.DINO_DUCK_SIZE
+            return self.DINO_X, self.GROUND_Y - height, width, height
+        width, height = self.DINO_SIZE
+        return self.DINO_X, self.dino_y, width, height
+
+    def _check_collision(self):
+        # 스프라이트 여백을 고려해 충돌 상자를 안쪽으로 줄임
+        dx, dy, dw, dh = self._dino_box()
+        dx1, dy1, dx2, dy2 = dx + 6, dy + 4, dx + dw - 6, dy + dh - 4
+        for o in self.obstacles:
+            ox1, oy1, ox2, oy2 = o.x + 2, o.y + 2, o.x + o.width - 2, o.y + o.height - 2
+            if dx1 < ox2 and ox1 < dx2 and dy1 < oy2 and oy1 < dy2:
+                return True
+        return False
+
+    def _end_jump(self):
+        if self.reached_min_height and self.velocity < self.DROP_VELOCITY:
+            self.velocity = self.DROP_VELOCITY
+
+    def _track_roi(self):
+        """장애물이 봇의 ROI에 처음 들어온 시각 기록"""
+        if self.roi is None:
+            return
+        roi_x2 = self.roi['x2'] - self.GAME_X
+        roi_y1 = self.roi['y1'] - self.GAME_Y
+        roi_y2 = self.roi['y2'] - self.GAME_Y
+        for o in self.obstacles:
+            if o.entered_roi_at is None and o.x < roi_x2 and o.y < roi_y2 and o.y + o.height > roi_y1:
+                o.entered_roi_at = self.time
+
+    # ------------------------------------------------------------------
+    # InputSink
+    # ------------------------------------------------------------------
+
+    def key_down(self, key):
+        with self._lock:
+            if self.realtime:
+                self.advance_to(self.game_time())
+            self.keys.add(key)
+            if key == 'space' and not self.jumping and not self.game_over:
+                self.jumping = True
+                self.velocity = self.INITIAL_JUMP_VELOCITY - self.speed() / 10
+                self.reached_min_height = False
+                self.jump_released = False
+                self.jump_count += 1
+                self._record_reaction()
+            elif key == 'down' and self.jumping:
+                # 공중에서 아래 키: 빠른 착지
+                self.speed_drop = True
+                self.velocity = 1.0
+
+    def key_up(self, key):
+        with self._lock:
+            if self.realtime:
+                self.advance_to(self.game_time())
+            self.keys.discard(key)
+            if key == 'space' and self.game_over:
+                # 실시간 모드: Chrome처럼 게임 오버 후 잠시 뒤 스페이스바를 떼면 다시 시작 (봇의 게임 오버 감지용)
+                if self.realtime and self.game_time() - self.game_over_time >= self.RESTART_DELAY:
+                    roi = self.roi
+                    self.reset()
+                    self.roi = roi
+            elif key == 'space' and self.jumping:
+                self.jump_released = True
+                self._end_jump()
+            elif key == 'down':
+                self.speed_drop = False
+
+    def _record_reaction(self):
+        for o in self.obstacles:
+            if o.entered_roi_at is not None and not o.reacted:
+                o.reacted = True
+                self.reaction_latencies.append(self.time - o.entered_roi_at)
+
+    # ------------------------------------------------------------------
+    # FrameSource
+    # ------------------------------------------------------------------
+
+    def _grab(self, region):
+        with self._lock:
+            if self.realtime:
+                self.advance_to(self.game_time())
+            return self.render(region)
+
+    def probe(self, region):
+        """감지 루프가 보고 있는 버퍼를 덮어쓰지 않도록 별도 버퍼에 그림 (시뮬레이션 시간은 진행하지 않음)"""
+        with self._lock:
+            buffer, self._buffer = self._buffer, None
+            try:
+                return self.render(region)
+            finally:
+                self._buffer = buffer
+
+    def render(self, region=None):
+        """
+        지정한 화면 영역만 그려서 반환 (반환 버퍼는 다음 호출 시 재사용됨)
+
+        Args:
+            region: {'x1', 'y1', 'x2', 'y2'} 화면 좌표 (None이면 가상 화면 전체)
+        """
+        if region is None:
+            region = {'x1': 0, 'y1': 0, 'x2': self.SCREEN_WIDTH, 'y2': self.SCREEN_HEIGHT}
+        height = region['y2'] - region['y1']
+        width = region['x2'] - region['x1']
+
+        if self._buffer is None or self._buffer.shape[:2] != (height, width):
+            self._buffer = np.empty((height, width, 3), dtype=np.uint8)
+        buffer = self._buffer
+
+        night = self.is_night()
+        background = 255 - self.BACKGROUND if night else self.BACKGROUND
+        foreground = 255 - self.FOREGROUND if night else self.FOREGROUND
+        buffer.fill(background)
+
+        def fill(x, y, w, h):
+            # 캔버스 좌표 사각형을 영역에 맞게 잘라서 채움
+            x1 = max(int(round(x)) + self.GAME_X - region['x1'], 0)
+            y1 = max(int(round(y)) + self.GAME_Y - region['y1'], 0)
+            x2 = min(int(round(x + w)) + self.GAME_X - region['x1'], width)
+            y2 = min(int(round(y + h)) + self.GAME_Y - region['y1'], height)
+            if x1 < x2 and y1 < y2:
+                buffer[y1:y2, x1:x2] = foreground
+
+        # 지면 선
+        fill(0, self.GROUND_Y - 2, self.GAME_WIDTH, 1)
+
+        # 공룡 (몸통 + 머리)
+        dx, dy, dw, dh = self._dino_box()
+        fill(dx, dy + dh * 0.35, dw * 0.7, dh * 0.65)
+        fill(dx + dw * 0.45, dy, dw * 0.55, dh * 0.4)
+
+        # 장애물
+        for o in self.obstacles:
+            if o.kind == 'bird':
+                fill(o.x, o.y + o.height * 0.3, o.width, o.height * 0.4)
+                fill(o.x + o.width * 0.3, o.y, o.width * 0.3, o.height)
+            else:
+                unit = self.CACTUS_LARGE[0] if o.kind == 'cactus_large' else self.CACTUS_SMALL[0]
+                for i in range(int(o.width // unit)):
+                    cx = o.x + i * unit
+                    fill(cx + unit * 0.3, o.y, unit * 0.4, o.height)
+                    fill(cx, o.y + o.height * 0.3, unit, o.height * 0.3)
+
+        return buffer
+
+    # ------------------------------------------------------------------
+    # 봇 연결
+    # ------------------------------------------------------------------
+
+    def default_config(self, detector='ratio', measure_speed=False):
+        """
+        봇용 기본 설정 (공룡 바로 앞의 지면 영역을 ROI로 사용)
+
+        Args:
+            detector: 'ratio' (픽셀 비율), 'column' (열 프로파일 + TTC) 또는 'zones' (띠별 점프/웅크리기)
+            measure_speed: True이면 시간 곡선 대신 장애물 이동으로 측정한 속도 사용
+        """
+        x1 = self.GAME_X + self.DINO_X + self.DINO_SIZE[0] + 30
+        # 구역 감지는 가장 높은 새까지 보이도록 ROI를 위로 넓힘
+        y1 = self.GAME_Y + (50 if detector == 'zones' else 100)
+        roi = {'x1': x1, 'y1': y1, 'x2': x1 + 70, 'y2': self.GAME_Y + 135}
+        config = {
+            'roi': roi,
+            'width': roi['x2'] - roi['x1'],
+            'height': roi['y2'] - roi['y1'],
+            'input': {'backend': 'recording', 'threaded': False}
+        }
+        if detector == 'column':
+            config['detector'] = {
+                'type': 'column',
+                'base_speed': self.BASE_SPEED * self.FPS,
+                'dino_x': self.GAME_X + self.DINO_X + self.DINO_SIZE[0]
+            }
+        elif detector == 'zones':
+            # 공룡 쪽 30% 구간에서만 동작 (먼 장애물은 다가올 때까지 판단에 쓰지 않음)
+            config['detector'] = {'type': 'zones', 'slices': [0.3, 1.0], 'act_slices': 1}
+        if measure_speed:
+            config['speed_estimator'] = {'enabled': True, 'base_speed': self.BASE_SPEED * self.FPS}
+        return config
+
+    def attach(self, bot):
+        """봇의 캡처/입력 백엔드와 시계를 시뮬레이터로 교체"""
+        bot.frame_source = self
+        bot.speed_controller = SpeedController(clock=self.clock, estimator=bot.speed_estimator,
+                                               profile=bot.speed_controller.profile)
+        self.scheduler = InputScheduler(self, clock=self.clock, threaded=self.realtime)
+        bot.input_scheduler = self.scheduler
+        self.roi = bot.get_dynamic_roi()
+
+
+class SimulationRunner:
+    """
+    시뮬레이션 시간으로 봇과 시뮬레이터를 번갈아 실행 (실제 시간보다 빠름)
+
+    Args:
+        bot: DinoGameBot 인스턴스 (attach()로 시뮬레이터에 연결됨)
+        simulator: DinoSimulator 인스턴스
+        frame_latency: 캡처 → 키 입력까지의 지연 (시뮬레이션 시간, 초)
+    """
+
+    def __init__(self, bot, simulator, frame_latency=0.0):
+        self.bot = bot
+        self.simulator = simulator
+        self.frame_latency = frame_latency
+
+    def run_game(self, seed, max_time=300.0):
+        """
+        게임 한 판 실행
+
+        Returns:
+            dict: 생존 시간, 점수, 점프 수, 반응 지연, 프레임당 CPU 비용
+        """
+        bot = self.bot
+        sim = self.simulator
+        sim.reset(seed)
+        bot.reset_game_state()
+
+        frames = 0
+        cpu_time = 0.0
+        render_before = sim.total_grab_time
+
+        while not sim.game_over and sim.time < max_time:
+            check_interval = bot.speed_controller.tick().check_interval
+            sim.roi = bot.get_dynamic_roi()
+
+            captured_at = sim.time
+            start = time.perf_counter()
+            roi_img = bot.capture_roi()
+            cpu_time += time.perf_counter() - start
+
+            # 처리 지연만큼 게임이 진행된 뒤 키 입력
+            if self.frame_latency:
+                sim.advance(self.frame_latency)
+
+            start = time.perf_counter()
+            is_obstacle, avg_brightness, detect_ratio, action = bot.decide(roi_img, sim.time, captured_at)
+            if action == 'duck':
+                bot.input_scheduler.duck(bot.zone_detector.duck_duration)
+                bot.duck_count += 1
+            elif action == 'jump':
+                jump_duration, _ = bot.get_jump_strength(detect_ratio)
+                bot.input_scheduler.jump(jump_duration)
+                bot.jump_count += 1
+            bot.input_scheduler.poll()
+            cpu_time += time.perf_counter() - start
+            frames += 1
+
+            delay = bot.get_next_check_delay(check_interval)
+            sim.advance(max(delay - self.frame_latency, 1.0 / sim.FPS))
+
+        bot.input_scheduler.release_all()
+        latencies = np.asarray(sim.reaction_latencies) * 1000
+        render_time = sim.total_grab_time - render_before
+
+        return {
+            "seed": seed,
+            "survival_seconds": round(sim.game_over_time if sim.game_over else sim.time, 3),
+            "game_over": sim.game_over,
+            "score": sim.score(),
+            "jump_count": bot.jump_count,
+            "duck_count": bot.duck_count,
+            "frames": frames,
+            "reaction_latency_ms": round(float(latencies.mean()), 3) if len(latencies) else None,
+            "cpu_per_frame_ms": round(cpu_time / frames * 1000, 4) if frames else 0.0,
+            "render_per_frame_ms": round(render_time / frames * 1000, 4) if frames else 0.0
+        }
+
+
+def summarize(results):
+    """여러 게임 결과 요약"""
+    survival = np.array([r['survival_seconds'] for r in results])
+    latencies = np.array([r['reaction_latency_ms'] for r in results if r['reaction_latency_ms'] is not None])
+    cpu = np.array([r['cpu_per_frame_ms'] for r in results])
+    return {
+        "games": len(results),
+        "survival_seconds": {
+            "mean": round(float(survival.mean()), 3),
+            "p50": round(float(np.percentile(survival, 50)), 3),
+            "max": round(float(survival.max()), 3)
+        },
+        "mean_score": round(float(np.mean([r['score'] for r in results])), 1),
+        "reaction_latency_ms": round(float(latencies.mean()), 3) if len(latencies) else None,
+        "cpu_per_frame_ms": round(float(cpu.mean()), 4)
+    }
+
+
+def check_restart(games=2, detector='ratio', pipelined=False, seed=0):
+    """
+    실시간 자동 재시작 확인: 게임 오버 감지로 여러 판을 이어서 실행한 뒤
+    판마다 생존 시간이 양수인지, 봇의 경과 시간이 시뮬레이터의 게임 시간과 맞는지 검사
+
+    Returns:
+        list: 문제 설명 목록 (비어 있으면 통과)
+    """
+    simulator = DinoSimulator(seed=seed, realtime=True)
+    bot = DinoGameBot(config_file=None, debug_folder=None)
+    config = simulator.default_config(detector)
+    config['game_over'] = {'enabled': True, 'freeze_time': 1.0, 'long_freeze_time': 3.0, 'max_games': games}
+    config['pipeline'] = {'enabled': pipelined}
+
+    with tempfile.TemporaryDirectory() as folder:
+        config['session_store'] = {'path': os.path.join(folder, 'sessions.db')}
+        bot.apply_config(config)
+        simulator.attach(bot)
+        bot.run()
+
+        problems = []
+        survival_times = bot.game_monitor.survival_times
+        if len(survival_times) != games:
+            problems.append(f"끝난 판 수 {len(survival_times)} (기대값 {games})")
+        problems.extend(f"{game}판째 생존 시간이 양수가 아님: {survival:.2f}초"
+                        for game, survival in enumerate(survival_times, 1) if survival <= 0)
+
+        controller = bot.speed_controller
+        elapsed = controller.clock() - controller.start_time
+        game_time = simulator.game_time()
+        if elapsed <= 0:
+            problems.append(f"마지막 판의 경과 시간이 양수가 아님: {elapsed:.2f}초")
+        # 봇은 재시작 키를 누를 때, 시뮬레이터는 키를 뗄 때 새 게임을 시작하므로 키 누름 시간만큼 차이가 남
+        if abs(elapsed - game_time) > 0.5:
+            problems.append(f"봇 경과 시간 {elapsed:.2f}초와 시뮬레이터 게임 시간 {game_time:.2f}초가 다름")
+
+        conn = connect(config['session_store']['path'])
+        for run_id, play_seconds in conn.execute("SELECT id, play_seconds FROM runs ORDER BY id"):
+            if play_seconds is None or play_seconds <= 0:
+                problems.append(f"세션 #{run_id}의 플레이 시간이 양수가 아님: {play_seconds}")
+        conn.close()
+    return problems
+
+
+def main():
+    """시뮬레이터 CLI"""
+    parser = argparse.ArgumentParser(description="헤드리스 Dino 게임 시뮬레이터로 봇을 평가합니다.")
+    parser.add_argument('--games', type=int, help="실행할 게임 수 (기본값: 100, --check-restart는 2)")
+    parser.add_argument('--seed', type=int, default=0, help="첫 게임의 난수 시드")
+    parser.add_argument('--max-time', type=float, default=300.0, help="게임당 최대 시뮬레이션 시간 (초)")
+    parser.add_argument('--latency', type=float, default=0.0, help="캡처 → 키 입력 지연 (초)")
+    parser.add_argument('--detector', choices=('ratio', 'column', 'zones'), default='ratio', help="감지 방식")
+    parser.add_argument('--measure-speed', action='store_true', help="장애물 이동으로 측정한 속도 사용 (시간 곡선 대체)")
+    parser.add_argument('--realtime', action='store_true', help="실제 시간으로 bot.run() 실행 (Ctrl+C로 종료)")
+    parser.add_argument('--output', help="게임별 결과를 저장할 JSON 파일")
+    parser.add_argument('--check-restart', action='store_true',
+                        help="실시간으로 --games판(기본 2판)을 자동 재시작하며 봇과 시뮬레이터의 게임 시간이 맞는지 확인")
+    parser.add_argument('--pipeline', action='store_true', help="--check-restart를 파이프라인 모드로 실행")
+    args = parser.parse_args()
+
+    if args.check_restart:
+        games = args.games or 2
+        problems = check_restart(games, args.detector, args.pipeline, args.seed)
+        for problem in problems:
+            print(f"실패: {problem}")
+        print("\n재시작 확인: " + ("실패" if problems else f"통과 ({games}판)"))
+        sys.exit(1 if problems else 0)
+
+    simulator = DinoSimulator(seed=args.seed, realtime=args.realtime)
+    bot = DinoGameBot(config_file=None, debug_folder=None)
+    bot.apply_config(simulator.default_config(args.detector, args.measure_speed))
+    simulator.attach(bot)
+
+    if args.realtime:
+        bot.run()
+        return
+
+    runner = SimulationRunner(bot, simulator, frame_latency=args.latency)
+    start = time.perf_counter()
+    results = []
+    for i in range(args.games or 100):
+        results.append(runner.run_game(args.seed + i, max_time=args.max_time))
+    wall_time = time.perf_counter() - start
+
+    summary = summarize(results)
+    simulated = sum(r['survival_seconds'] for r in results)
+    print(f"\n시뮬레이션 완료: {summary['games']}게임 ({wall_time:.1f}초 소요, 실제 시간 대비 {simulated / wall_time:.0f}배속)")
+    print(f"  - 생존 시간: 평균 {summary['survival_seconds']['mean']:.1f}초 | 중앙값 {summary['survival_seconds']['p50']:.1f}초 | 최대 {summary['survival_seconds']['max']:.1f}초")
+    print(f"  - 평균 점수: {summary['mean_score']:.0f}")
+    if summary['reaction_latency_ms'] is not None:
+        print(f"  - 반응 지연 (ROI 진입 → 점프): 평균 {summary['reaction_latency_ms']:.1f}ms")
+    print(f"  - 프레임당 CPU 비용: {summary['cpu_per_frame_ms']:.3f}ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"summary": summary, "games": results}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
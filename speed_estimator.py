@@ -0,0 +1,175 @@
+"""
+측정 기반 게임 속도 추정기 (SpeedEstimator)
+연속한 두 프레임의 열 프로파일(열별 장애물 픽셀 수)의 변화량(장애물 가장자리)을
+1차원 상호상관으로 비교하여 장애물 이동 거리를 구하고, 이를 평활화한 화면 px/초 속도로 제공한다.
+일시정지/재시작/프레임 지연으로 실제 속도가 시간 곡선에서 벗어나도 측정값을 따라간다.
+"""
+
+import numpy as np
+
+
+class SpeedEstimator:
+    """
+    열 프로파일 상호상관 속도 추정기
+
+    Args:
+        base_speed: 속도 배율 1.0일 때 장애물 이동 속도 (화면 px/초)
+        smoothing: 지수 평활 계수 (0~1, 클수록 새 측정값을 많이 반영)
+        min_confidence: 측정으로 인정할 최소 정규화 상관값 (0~1)
+        min_speed_factor: 이보다 느린 측정은 버림 (정지 화면, 고정된 물체)
+        max_speed_factor: 이보다 빠른 측정은 버림 (다른 장애물과 잘못 짝지은 경우)
+        outlier_ratio: 현재 추정값과 이 비율 이상 차이 나면 이상값으로 보류
+        relock_count: 이상값이 연속으로 이 횟수만큼 나오면 새 속도로 다시 맞춤 (재시작 등)
+        max_age: 마지막으로 인정된 측정 이후 이 시간(초)이 지나면 추정값을 쓰지 않음
+    """
+
+    def __init__(self, base_speed=360.0, smoothing=0.3, min_confidence=0.6, min_speed_factor=0.5,
+                 max_speed_factor=3.0, outlier_ratio=0.4, relock_count=3, max_age=2.0):
+        self.base_speed = base_speed
+        self.smoothing = smoothing
+        self.min_confidence = min_confidence
+        self.min_speed_factor = min_speed_factor
+        self.max_speed_factor = max_speed_factor
+        self.outlier_ratio = outlier_ratio
+        self.relock_count = relock_count
+        self.max_age = max_age
+        self.reset()
+
+    def reset(self):
+        """새 게임 시작 시 추정 상태 초기화"""
+        self.speed = None  # 평활화된 속도 (px/초)
+        self.last_sample = None  # 마지막으로 인정된 측정값 (px/초)
+        self.last_confidence = 0.0
+        self._prev_profile = None
+        self._prev_x1 = None
+        self._prev_time = None
+        self._last_update_time = None
+        self._last_accept_time = None
+        self._outliers = []  # 연속된 이상값 (재고정 판단용)
+        self.sample_count = 0
+        self.accepted_count = 0
+        self.rejected_count = 0
+
+    def update(self, profile, roi_x1, timestamp):
+        """
+        새 프레임의 열 프로파일로 속도 측정
+
+        Args:
+            profile: 열별 장애물 픽셀 수 (ROI 너비 길이)
+            roi_x1: 프레임을 캡처한 ROI의 화면 x1 (동적 ROI 이동 보정용)
+            timestamp: 프레임 캡처 시각 (초)
+
+        Returns:
+            float: 이번 프레임에서 인정된 측정값 (px/초), 측정하지 못했으면 None
+        """
+        prev_profile, prev_x1, prev_time = self._prev_profile, self._prev_x1, self._prev_time
+        # 열 프로파일의 변화량(가장자리)으로 비교: 평평한 장애물이나 ROI 경계에 걸린 장애물도 위치가 분명함
+        self._prev_profile = np.diff(np.asarray(profile, dtype=np.float32))
+        self._prev_x1 = roi_x1
+        self._prev_time = timestamp
+        self._last_update_time = timestamp
+
+        if prev_profile is None or len(prev_profile) != len(self._prev_profile):
+            return None
+        dt = timestamp - prev_time
+        if dt <= 0 or not prev_profile.any() or not self._prev_profile.any():
+            # 두 프레임 모두에 장애물이 보일 때만 측정
+            return None
+
+        self.sample_count += 1
+        sample = self._measure(prev_profile, self._prev_profile, prev_x1 - roi_x1, dt)
+        if sample is None:
+            self.rejected_count += 1
+            return None
+
+        if self.get_speed() is None:
+            # 첫 측정이거나 오래 측정하지 못함 → 새 측정값으로 시작
+            self.speed = sample
+        elif abs(sample - self.speed) > self.speed * self.outlier_ratio:
+            # 잘못 짝지은 측정일 수 있으므로 보류, 같은 값이 연속되면 속도가 실제로 바뀐 것으로 봄
+            self._outliers.append(sample)
+            if len(self._outliers) < self.relock_count:
+                self.rejected_count += 1
+                return None
+            if np.ptp(self._outliers) > np.median(self._outliers) * self.outlier_ratio:
+                self._outliers.pop(0)
+                self.rejected_count += 1
+                return None
+            self.speed = float(np.median(self._outliers))
+        else:
+            self.speed += self.smoothing * (sample - self.speed)
+
+        self._outliers = []
+        self.last_sample = sample
+        self._last_accept_time = timestamp
+        self.accepted_count += 1
+        return sample
+
+    def _measure(self, prev, curr, roi_shift, dt):
+        """
+        두 프로파일 변화량의 상호상관 최댓값으로 이동 거리 측정
+
+        Args:
+            roi_shift: 이전 ROI x1 - 현재 ROI x1 (ROI가 오른쪽으로 이동하면 음수)
+
+        Returns:
+            float: 측정 속도 (px/초) 또는 신뢰할 수 없으면 None
+        """
+        width = len(curr)
+        prev_energy = float(np.dot(prev, prev))
+        curr_energy = float(np.dot(curr, curr))
+
+        # 화면 이동 거리 = roi_shift + ROI 내 이동(lag), 허용 속도 범위의 lag만 탐색
+        min_lag = max(int(np.floor(self.base_speed * self.min_speed_factor * dt - roi_shift)), 0)
+        max_lag = min(int(np.ceil(self.base_speed * self.max_speed_factor * dt - roi_shift)), width - 2)
+        if min_lag > max_lag:
+            return None
+
+        # correlation[width - 1 + lag] = sum(prev[n + lag] * curr[n])
+        correlation = np.correlate(prev, curr, mode='full')
+        window = correlation[width - 1 + min_lag:width + max_lag]
+        best = int(np.argmax(window))
+        peak = float(window[best])
+
+        self.last_confidence = peak / np.sqrt(prev_energy * curr_energy)
+        if self.last_confidence < self.min_confidence:
+            return None
+
+        # 포물선 보간으로 서브픽셀 위치 보정
+        lag = float(min_lag + best)
+        index = width - 1 + min_lag + best
+        if 0 < index < len(correlation) - 1:
+            left, right = correlation[index - 1], correlation[index + 1]
+            denominator = left - 2 * peak + right
+            if denominator < 0:
+                lag += 0.5 * (left - right) / denominator
+
+        speed = float(roi_shift + lag) / dt
+        if not (self.base_speed * self.min_speed_factor <= speed <= self.base_speed * self.max_speed_factor):
+            return None
+        return speed
+
+    def get_speed(self):
+        """평활화된 속도 (px/초), 측정값이 없거나 오래되었으면 None"""
+        if self.speed is None or self._last_accept_time is None:
+            return None
+        if self._last_update_time - self._last_accept_time > self.max_age:
+            return None
+        return self.speed
+
+    def get_speed_factor(self):
+        """측정 속도를 base_speed 대비 배율로 반환 (사용할 수 없으면 None)"""
+        speed = self.get_speed()
+        return speed / self.base_speed if speed is not None else None
+
+    def get_stats(self):
+        """속도 추정 통계 반환"""
+        speed = self.get_speed()
+        return {
+            "base_speed": self.base_speed,
+            "speed_px_per_sec": round(float(speed), 1) if speed is not None else None,
+            "speed_factor": round(float(speed) / self.base_speed, 3) if speed is not None else None,
+            "samples": self.sample_count,  # 두 프레임 모두 장애물이 보인 횟수
+            "accepted": self.accepted_count,
+            "rejected": self.rejected_count
+        }
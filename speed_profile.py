@@ -0,0 +1,300 @@
+"""
+선언형 속도 프로필 (SpeedProfile)
+속도 곡선과 속도에 따른 동적 파라미터(체크 간격, 점프 쿨다운, 어두운 픽셀 비율 임계값, ROI 확장)를
+설정으로 정의하고, 시작할 때 경과 시간 → 파라미터 조회 테이블로 미리 계산한다.
+감지 루프는 틱마다 테이블을 한 번 조회해 모든 파라미터를 함께 얻는다 (math.log 등 계산 없음).
+측정 기반 속도 추정을 쓰는 경우를 위해 속도 배율 → 파라미터 테이블도 함께 만든다.
+
+프로필 파일 (roi_config.json의 'speed_profile' 항목으로 지정, 실행 중 수정하면 다시 불러옴):
+    {
+        "active": "default",
+        "profiles": {
+            "default": {},
+            "fast_start": {"curve": [[0, 1.2], [60, 1.8], [150, 2.17]], "jump_cooldown": 0.25}
+        }
+    }
+
+사용법 (프로필 파라미터 표 출력):
+    python speed_profile.py speed_profiles.json --name fast_start
+
+불러올 때는 표준 라이브러리만 사용한다 (main.py가 시작할 때 불러옴, numpy는 테이블을 계산할 때 불러옴).
+"""
+
+import argparse
+import collections
+import json
+import math
+import os
+import threading
+import time
+
+# 기본 프로필 (기존 SpeedController 상수와 같음)
+DEFAULT_PROFILE = {
+    "max_speed_factor": 2.17,  # 최대 속도 배율
+    "time_to_max": 180.0,  # 최대 속도까지 걸리는 시간 (초, 'log'/'linear' 곡선)
+    "curve": "log",  # 'log', 'linear' 또는 [[경과 시간(초), 속도 배율], ...] (사이는 선형 보간)
+    "check_interval": 0.05,  # 속도 1.0일 때 체크 간격 (초, 속도에 반비례)
+    "jump_cooldown": 0.30,  # 속도 1.0일 때 점프 쿨다운 (초, 속도에 반비례)
+    "dark_ratio": 0.05,  # 속도 1.0일 때 어두운 픽셀 비율 임계값
+    "min_dark_ratio": 0.03,  # 최대 속도일 때 어두운 픽셀 비율 임계값
+    "max_roi_expand": 0.5,  # 최대 속도일 때 ROI 확장 비율
+    "table_step": 0.01,  # 경과 시간 테이블 간격 (초)
+    "factor_step": 0.001  # 속도 배율 테이블 간격 (측정 기반 속도용)
+}
+
+# 틱마다 조회하는 동적 파라미터
+SpeedParams = collections.namedtuple(
+    'SpeedParams', ['speed_factor', 'check_interval', 'jump_cooldown', 'dark_ratio', 'roi_expand', 'progress']
+)
+
+
+def resolve_profile(profile=None):
+    """기본값 위에 프로필 항목을 덮어쓴 전체 프로필 (알 수 없는 항목은 오류)"""
+    profile = dict(profile or {})
+    unknown = set(profile) - set(DEFAULT_PROFILE)
+    if unknown:
+        raise ValueError(f"알 수 없는 속도 프로필 항목: {', '.join(sorted(unknown))} (사용 가능: {', '.join(DEFAULT_PROFILE)})")
+    return {**DEFAULT_PROFILE, **profile}
+
+
+def make_curve(profile):
+    """
+    경과 시간 → 속도 배율 함수와 곡선 길이 (초, 이후는 마지막 값 유지)
+    함수는 float와 numpy 배열을 모두 받는다 (배열로 테이블을 한 번에 계산).
+
+    Args:
+        profile: resolve_profile()로 만든 전체 프로필
+    """
+    import numpy as np
+
+    max_factor = profile['max_speed_factor']
+    curve = profile['curve']
+
+    if curve == 'log':
+        duration = profile['time_to_max']
+        return (lambda t: 1.0 + (max_factor - 1.0) * (np.log(1 + 2 * t / duration) / math.log(3))), duration
+    if curve == 'linear':
+        duration = profile['time_to_max']
+        return (lambda t: 1.0 + (max_factor - 1.0) * t / duration), duration
+    if not isinstance(curve, list) or not curve:
+        raise ValueError(f"알 수 없는 속도 곡선: {curve} ('log', 'linear' 또는 [[초, 배율], ...])")
+
+    times = [float(t) for t, _ in curve]
+    factors = [float(f) for _, f in curve]
+    if times != sorted(times) or times[0] < 0:
+        raise ValueError("속도 곡선의 시간은 0 이상이고 오름차순이어야 합니다.")
+    return (lambda t: np.interp(t, times, factors)), times[-1]
+
+
+class CompiledProfile:
+    """
+    조회 테이블로 미리 계산한 속도 프로필
+
+    Args:
+        profile: 프로필 항목 (빠진 항목은 DEFAULT_PROFILE 값)
+        name: 프로필 이름 (출력/세션 기록용)
+    """
+
+    def __init__(self, profile=None, name='default'):
+        import numpy as np
+
+        self.name = name
+        self.profile = resolve_profile(profile)
+        profile = self.profile
+        if profile['max_speed_factor'] <= 1.0:
+            raise ValueError("max_speed_factor는 1.0보다 커야 합니다.")
+
+        curve, duration = make_curve(profile)
+        self.curve = curve
+        self.duration = duration
+
+        # 경과 시간 테이블 (곡선 끝 이후는 마지막 항목)
+        self.time_rate = 1.0 / profile['table_step']
+        count = int(math.ceil(duration * self.time_rate)) + 1
+        elapsed = np.minimum(np.arange(count) / self.time_rate, duration)
+        self.time_table = self._build_table(curve(elapsed))
+        self._last_time_index = count - 1
+
+        # 속도 배율 테이블 (1.0 ~ 최대 속도 배율)
+        self.factor_rate = 1.0 / profile['factor_step']
+        count = int(math.ceil((profile['max_speed_factor'] - 1.0) * self.factor_rate)) + 1
+        self.factor_table = self._build_table(1.0 + np.arange(count) / self.factor_rate)
+        self._last_factor_index = count - 1
+
+    def _build_table(self, factors):
+        """속도 배율 배열 → SpeedParams 목록 (배열 연산으로 한 번에 계산)"""
+        import numpy as np
+
+        profile = self.profile
+        max_factor = profile['max_speed_factor']
+        factors = np.clip(factors, 1.0, max_factor)
+        progress = (factors - 1.0) / (max_factor - 1.0)
+        dark_ratio = profile['dark_ratio']
+        columns = (
+            factors,
+            profile['check_interval'] / factors,
+            profile['jump_cooldown'] / factors,
+            dark_ratio - (dark_ratio - profile['min_dark_ratio']) * progress,
+            profile['max_roi_expand'] * progress,
+            progress
+        )
+        return list(map(SpeedParams._make, zip(*(column.tolist() for column in columns))))
+
+    def params(self, factor):
+        """속도 배율 하나에 대한 전체 파라미터"""
+        return self._build_table([factor])[0]
+
+    def factor_at(self, elapsed):
+        """경과 시간(초)의 속도 배율을 곡선에서 직접 계산 (테이블 없이 정확한 값, 시뮬레이터/오프라인 도구용)"""
+        factor = float(self.curve(min(max(elapsed, 0.0), self.duration)))
+        return min(max(factor, 1.0), self.profile['max_speed_factor'])
+
+    def at_time(self, elapsed):
+        """경과 시간(초)의 파라미터 (테이블 조회 한 번)"""
+        index = int(elapsed * self.time_rate + 0.5)
+        if index > self._last_time_index:
+            index = self._last_time_index
+        elif index < 0:
+            index = 0
+        return self.time_table[index]
+
+    def at_factor(self, factor):
+        """측정한 속도 배율의 파라미터 (테이블 조회 한 번, 1.0 ~ 최대 속도 배율로 제한)"""
+        index = int((factor - 1.0) * self.factor_rate + 0.5)
+        if index > self._last_factor_index:
+            index = self._last_factor_index
+        elif index < 0:
+            index = 0
+        return self.factor_table[index]
+
+
+# 같은 프로필을 여러 번 만들 때 (시뮬레이터/리플레이의 컨트롤러 교체) 테이블 재계산 방지
+_compiled_cache = {}
+
+
+def compile_profile(profile=None, name='default'):
+    """프로필 항목을 조회 테이블로 변환 (같은 내용이면 이전 결과 재사용)"""
+    key = (name, json.dumps(profile or {}, sort_keys=True))
+    compiled = _compiled_cache.get(key)
+    if compiled is None:
+        compiled = CompiledProfile(profile, name)
+        _compiled_cache[key] = compiled
+    return compiled
+
+
+def load_profile_file(path, name=None):
+    """
+    프로필 파일에서 프로필 하나를 읽어 조회 테이블로 변환
+
+    Args:
+        path: 프로필 파일 경로
+        name: 프로필 이름 (None이면 파일의 'active', 없으면 'default')
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    profiles = data.get('profiles', {})
+    name = name or data.get('active', 'default')
+    if name not in profiles:
+        if name != 'default':
+            raise ValueError(f"속도 프로필 '{name}'이(가) {path}에 없습니다. (있는 프로필: {', '.join(profiles) or '없음'})")
+        return compile_profile(None, name)
+    return compile_profile(profiles[name], name)
+
+
+class SpeedProfileReloader:
+    """
+    프로필 파일 변경 감시 (백그라운드 스레드에서 수정 시각 확인 후 다시 불러오기)
+    파일 읽기와 테이블 계산은 감시 스레드에서 하고, 감지 루프는 새 테이블로 바뀐 참조만 보게 된다.
+    잘못된 파일이면 오류를 알리고 이전 프로필을 유지한다.
+
+    Args:
+        path: 프로필 파일 경로
+        name: 프로필 이름 (None이면 파일의 'active', 'active'를 바꿔 실행 중 프로필 전환 가능)
+        on_reload: 새 프로필(CompiledProfile)을 받을 함수
+        interval: 파일 확인 간격 (초)
+        notify: 다시 불러오기 실패 안내를 넘길 함수 (kind, data, level) - 감시 스레드에서 콘솔에 직접 쓰지 않도록 봇의 notify를 연결
+    """
+
+    def __init__(self, path, name=None, on_reload=None, interval=1.0, notify=None):
+        self.path = path
+        self.name = name
+        self.on_reload = on_reload
+        self.notify = notify
+        self.interval = interval
+        self.reload_count = 0
+        self.error_count = 0
+        self._mtime = self._stat()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _stat(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self):
+        """지금 파일 내용으로 프로필 읽기 (시작할 때 사용)"""
+        self._mtime = self._stat()
+        return load_profile_file(self.path, self.name)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch_loop, name='speed-profile', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _watch_loop(self):
+        while not self._stop.wait(self.interval):
+            mtime = self._stat()
+            if mtime is None or mtime == self._mtime:
+                continue
+            self._mtime = mtime
+            try:
+                profile = load_profile_file(self.path, self.name)
+            except Exception as e:
+                self.error_count += 1
+                if self.notify is not None:
+                    self.notify('profile_reload_failed', {"path": self.path, "error": str(e)}, level='warning')
+                continue
+            self.reload_count += 1
+            if self.on_reload is not None:
+                self.on_reload(profile)
+
+    def get_stats(self):
+        return {"path": self.path, "reloads": self.reload_count, "errors": self.error_count}
+
+
+def main():
+    """프로필 파라미터 표 출력"""
+    parser = argparse.ArgumentParser(description="속도 프로필의 경과 시간별 파라미터를 출력합니다.")
+    parser.add_argument('path', nargs='?', help="프로필 파일 (없으면 기본 프로필)")
+    parser.add_argument('--name', help="프로필 이름 (기본값: 파일의 'active')")
+    parser.add_argument('--step', type=float, default=30.0, help="출력할 경과 시간 간격 (초)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    profile = load_profile_file(args.path, args.name) if args.path else compile_profile()
+    elapsed = time.perf_counter() - start
+    print(f"프로필 '{profile.name}': 테이블 {len(profile.time_table)} + {len(profile.factor_table)}개 항목 "
+          f"({elapsed * 1000:.1f}ms)")
+    print(f"{'경과(초)':>8} {'속도':>6} {'체크(ms)':>9} {'쿨다운(ms)':>10} {'픽셀 비율':>9} {'ROI 확장':>8}")
+    t = 0.0
+    while True:
+        p = profile.at_time(t)
+        print(f"{t:8.0f} {p.speed_factor:6.2f} {p.check_interval * 1000:9.1f} {p.jump_cooldown * 1000:10.1f} "
+              f"{p.dark_ratio * 100:8.2f}% {p.roi_expand * 100:7.1f}%")
+        if t >= profile.duration:
+            break
+        t = min(t + args.step, profile.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+구간별 처리 시간 계측 (StageTimer)
+감지 루프의 각 구간(캡처, 그레이스케일 변환, 감지, 점프, 디버그 저장)에 걸린 시간을
+고정 버킷 히스토그램에 누적하여 p50/p95/p99를 계산한다.
+기록은 버킷 카운터 하나를 올리는 것뿐이므로 매 프레임 호출해도 부담이 작다.
+"""
+
+import bisect
+
+import numpy as np
+
+# 구간 이름과 출력용 라벨 (상태 줄/보고서 순서)
+STAGE_LABELS = {
+    'capture': '캡처',
+    'grayscale': '변환',
+    'detect': '감지',
+    'jump': '점프',
+    'debug_save': '저장'
+}
+
+
+class LatencyHistogram:
+    """
+    로그 간격 고정 버킷 지연 시간 히스토그램
+
+    Args:
+        min_value: 가장 작은 버킷 경계 (초)
+        max_value: 가장 큰 버킷 경계 (초, 이보다 크면 마지막 버킷에 기록)
+        buckets_per_decade: 10배 구간당 버킷 수 (클수록 백분위수가 정확)
+    """
+
+    def __init__(self, min_value=1e-6, max_value=10.0, buckets_per_decade=20):
+        decades = np.log10(max_value / min_value)
+        count = int(round(decades * buckets_per_decade)) + 1
+        self.edges = np.logspace(np.log10(min_value), np.log10(max_value), count).tolist()
+        self.counts = [0] * (len(self.edges) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value):
+        """값 하나를 기록 (초)"""
+        self.counts[bisect.bisect_left(self.edges, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q):
+        """
+        백분위수 (버킷 위쪽 경계 기준, 최댓값을 넘지 않음)
+
+        Args:
+            q: 0~100
+        """
+        if self.count == 0:
+            return 0.0
+        target = self.count * q / 100.0
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target and bucket_count:
+                upper = self.edges[index] if index < len(self.edges) else self.max
+                return min(upper, self.max)
+        return self.max
+
+    def summary(self):
+        """통계 요약 (ms 단위)"""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 4) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 4),
+            "p95_ms": round(self.percentile(95) * 1000, 4),
+            "p99_ms": round(self.percentile(99) * 1000, 4),
+            "max_ms": round(self.max * 1000, 4)
+        }
+
+
+class StageTimer:
+    """
+    구간별 지연 시간 히스토그램 모음
+
+    Args:
+        enabled: False이면 기록하지 않음 (계측 비용 제거)
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.reset()
+
+    def record(self, stage, elapsed):
+        """구간 처리 시간 기록 (초)"""
+        if not self.enabled:
+            return
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = LatencyHistogram()
+            self.histograms[stage] = histogram
+        histogram.record(elapsed)
+
+    def reset(self):
+        """기록 초기화 (기본 구간은 미리 만들어 두어 다른 스레드에서 읽는 중에 dict가 바뀌지 않게 함)"""
+        self.histograms = {stage: LatencyHistogram() for stage in STAGE_LABELS}
+
+    def _ordered_stages(self):
+        """기록이 있는 구간 (기본 구간 순서 → 추가 구간)"""
+        return [stage for stage, histogram in list(self.histograms.items()) if histogram.count]
+
+    def summary(self):
+        """구간별 통계 요약 (세션 요약용)"""
+        return {stage: self.histograms[stage].summary() for stage in self._ordered_stages()}
@@ -0,0 +1,141 @@
+"""
+시작 시간 계측과 무거운 모듈 미리 불러오기
+main()은 준비 안내를 바로 띄우고, 사용자가 Enter를 누르기를 기다리는 동안 백그라운드 스레드에서
+cv2/numpy/캡처/입력 모듈을 불러온다. 단계별 소요 시간은 StartupTimer에 기록하여
+사용자 대기/카운트다운 시간을 뺀 '시작 → 첫 프레임' 시간을 보고한다.
+
+이 모듈은 표준 라이브러리만 사용한다 (main.py가 가장 먼저 불러옴).
+"""
+
+import importlib
+import threading
+import time
+
+# 감지 루프가 사용하는 무거운 모듈 (불러오는 순서대로)
+HEAVY_MODULES = (
+    'numpy', 'cv2',
+    'frame_source', 'detection_engine', 'detector', 'zones', 'speed_estimator', 'stage_timer',
+    'debug_writer', 'frame_recorder', 'black_box', 'pipeline', 'roi_locator'
+)
+
+# 시작 단계 이름과 출력용 라벨
+PHASE_LABELS = {
+    'imports': '모듈 로드',
+    'bot': '봇 생성',
+    'warm_up': '워밍업',
+    'first_frame': '첫 프레임'
+}
+
+# 캡처/입력 백엔드별 추가 모듈
+BACKEND_MODULES = {
+    'fullscreen': ('PIL.ImageGrab',),
+    'bbox': ('PIL.ImageGrab',),
+    'mss': ('mss',),
+    'pyautogui': ('pyautogui',)
+}
+
+
+def modules_for_config(config):
+    """설정에서 사용하는 백엔드까지 포함한 미리 불러올 모듈 목록"""
+    modules = list(HEAVY_MODULES)
+    backends = (
+        config.get('capture', {}).get('backend', 'bbox'),
+        config.get('input', {}).get('backend', 'pyautogui')
+    )
+    for backend in backends:
+        modules.extend(BACKEND_MODULES.get(backend, ()))
+    if config.get('games'):
+        modules.append('multi_game')
+    return modules
+
+
+class ModulePreloader:
+    """
+    백그라운드 스레드에서 모듈 불러오기
+    같은 모듈을 메인 스레드가 동시에 불러오면 import 잠금으로 먼저 시작한 쪽이 끝날 때까지 기다리므로,
+    미리 불러오기가 끝나기 전에 봇을 만들어도 안전하다.
+    설치되지 않은 모듈은 건너뛰고, 실제 사용하는 곳에서 원래 오류 메시지가 나온다.
+
+    Args:
+        modules: 모듈 이름 목록
+    """
+
+    def __init__(self, modules):
+        self.modules = list(modules)
+        self.timings = {}  # 모듈 → 불러오는 데 걸린 시간 (초)
+        self.failed = []
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._load, name='preload', daemon=True)
+        self._thread.start()
+        return self
+
+    def _load(self):
+        for name in self.modules:
+            start = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except Exception:
+                self.failed.append(name)
+                continue
+            self.timings[name] = time.perf_counter() - start
+
+    def wait(self, timeout=None):
+        """미리 불러오기 완료 대기 (끝났으면 True)"""
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def get_stats(self):
+        """모듈별 불러오기 시간 (ms, 이미 불러온 모듈은 0에 가까움)"""
+        return {
+            "modules_ms": {name: round(elapsed * 1000, 1) for name, elapsed in self.timings.items()},
+            "failed": self.failed
+        }
+
+
+class StartupTimer:
+    """
+    시작 단계별 소요 시간 기록
+    단계가 끝날 때마다 mark()를 호출하며, 사용자 입력이나 카운트다운처럼 봇이 기다리기만 한 구간은
+    waiting=True로 표시해 '시작 → 첫 프레임' 시간에서 뺀다.
+
+    Args:
+        started_at: 시작 시각 (perf_counter 기준, None이면 지금)
+    """
+
+    def __init__(self, started_at=None, clock=time.perf_counter):
+        self.clock = clock
+        self.started_at = clock() if started_at is None else started_at
+        self.last_mark = self.started_at
+        self.phases = []  # (단계 이름, 소요 시간(초), 대기 구간 여부)
+        self.details = {}  # 추가 기록 (예: 미리 불러온 모듈별 시간)
+
+    def mark(self, name, waiting=False):
+        """직전 mark() 이후 경과 시간을 단계 하나로 기록하고 반환 (초)"""
+        now = self.clock()
+        elapsed = now - self.last_mark
+        self.last_mark = now
+        self.phases.append((name, elapsed, waiting))
+        return elapsed
+
+    def active_time(self):
+        """대기 구간을 뺀 시작 → 마지막 단계까지의 시간 (초)"""
+        return sum(elapsed for _, elapsed, waiting in self.phases if not waiting)
+
+    def summary(self):
+        """단계별 시간 요약 (세션 기록용, ms)"""
+        return {
+            "phases_ms": {name: round(elapsed * 1000, 1) for name, elapsed, waiting in self.phases if not waiting},
+            "waiting_ms": round(sum(elapsed for _, elapsed, waiting in self.phases if waiting) * 1000, 1),
+            "startup_to_first_frame_ms": round(self.active_time() * 1000, 1),
+            **self.details
+        }
+
+    def format(self):
+        """출력용 한 줄 요약"""
+        parts = [f"{PHASE_LABELS.get(name, name)} {elapsed * 1000:.0f}ms"
+                 for name, elapsed, waiting in self.phases if not waiting]
+        return f"{' → '.join(parts)} (합계 {self.active_time() * 1000:.0f}ms, 대기 제외)"
@@ -0,0 +1,315 @@
+"""
+디버그 이미지 오프라인 재채점 / 파라미터 스윕
+debug_captures* 폴더(png/jpg, npy, session.npz)에 쌓인 점프 시점 ROI 이미지를 프로세스 풀로 나누어 읽고,
+is_obstacle_detected와 같은 규칙(밝기 임계값, 속도에 따른 픽셀 비율 임계값, 다크 모드 전환)을
+임계값 격자 전체에 대해 한 번에 다시 적용하여 설정별로 각 프레임을 어떻게 판단했을지 기록한다.
+
+이미지는 작업 단위(chunk)마다 한 장씩 읽어 밝기 히스토그램만 남기므로 폴더 전체를 메모리에 올리지 않는다.
+히스토그램 누적합 하나로 모든 밝기 임계값의 어두운 픽셀 비율을 동시에 구한다.
+
+사용법:
+    python sweep.py                                  # 현재 폴더의 debug_captures* 전체
+    python sweep.py archives/ --workers 8 --output sweep_result.npz --csv sweep_summary.csv
+    python sweep.py --thresholds 96,112,128,144 --weak-cutoffs 0.07,0.1,0.15
+"""
+
+import argparse
+import csv
+import glob
+import itertools
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from main import SpeedController
+
+# 현재 기본 설정 (main.py의 is_obstacle_detected / SpeedController / get_jump_strength)
+DEFAULT_THRESHOLD = 128
+DEFAULT_WEAK_CUTOFF = 0.1
+
+# 프레임별 판단 코드 (replay.py와 같음)
+DECISION_NONE = 0
+DECISION_WEAK_JUMP = 1
+DECISION_STRONG_JUMP = 2
+
+IMAGE_PATTERNS = ('*.png', '*.jpg', '*.jpeg', '*.bmp', '*.npy')
+NAME_PATTERN = re.compile(r'jump_(\d+)_(\d{8}_\d{6}_\d{3})')
+
+
+def find_archives(paths):
+    """
+    디버그 이미지 폴더 목록 (인자가 없으면 현재 폴더의 debug_captures*)
+
+    Returns:
+        list: 폴더 경로 (이름순)
+    """
+    if not paths:
+        paths = sorted(glob.glob('debug_captures*'))
+    folders = []
+    for path in paths:
+        if not os.path.isdir(path):
+            continue
+        children = [p for p in sorted(glob.glob(os.path.join(path, 'debug_captures*'))) if os.path.isdir(p)]
+        # 여러 아카이브를 모아 둔 상위 폴더도 허용
+        folders.extend(children if children else [path])
+    return folders
+
+
+def list_items(folder):
+    """
+    폴더의 이미지 항목 목록 (게임 번호 → 점프 번호순)
+
+    Returns:
+        list: (폴더, 파일 경로, npz 항목 이름 또는 None)
+    """
+    items = []
+    for pattern in IMAGE_PATTERNS:
+        for path in glob.glob(os.path.join(folder, pattern)):
+            items.append((folder, path, None))
+    archive = os.path.join(folder, 'session.npz')
+    if os.path.exists(archive):
+        with np.load(archive) as npz:
+            items.extend((folder, archive, name) for name in npz.files)
+    return sorted(items, key=lambda item: item[2] or os.path.basename(item[1]))
+
+
+def parse_name(name):
+    """파일 이름에서 점프 번호와 저장 시각 추출 (형식이 다르면 None)"""
+    match = NAME_PATTERN.search(name)
+    if match is None:
+        return None, None
+    timestamp = datetime.strptime(match.group(2), "%Y%m%d_%H%M%S_%f").timestamp()
+    return int(match.group(1)), timestamp
+
+
+def load_rgb(path, member=None, npz=None):
+    """이미지 한 장을 RGB uint8 배열로 읽기"""
+    if member is not None:
+        return np.asarray(npz[member])
+    if path.endswith('.npy'):
+        return np.load(path)
+    bgr = cv2.imread(path, cv2.IMREAD_COLOR)
+    if bgr is None:
+        return None
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+
+def scan_chunk(items, thresholds):
+    """
+    작업 프로세스: 이미지를 한 장씩 읽어 밝기 임계값별 어두운 픽셀 비율 계산
+
+    Args:
+        items: list_items() 항목 일부
+        thresholds: 밝기 임계값 배열
+
+    Returns:
+        tuple: (항목 이름 목록, 저장 시각 배열, 어두운 픽셀 비율 행렬 (이미지 수, 임계값 수))
+    """
+    thresholds = np.asarray(thresholds)
+    names = []
+    timestamps = []
+    ratios = []
+    npz_cache = {}
+
+    try:
+        for folder, path, member in items:
+            npz = None
+            if member is not None:
+                npz = npz_cache.get(path)
+                if npz is None:
+                    npz = npz_cache[path] = np.load(path)
+            roi_img = load_rgb(path, member, npz)
+            if roi_img is None:
+                continue
+
+            gray = cv2.cvtColor(roi_img, cv2.COLOR_RGB2GRAY)
+            # 누적 히스토그램: cumulative[t - 1] = (gray < t)인 픽셀 수
+            cumulative = np.cumsum(np.bincount(gray.ravel(), minlength=256))
+            ratios.append(cumulative[thresholds - 1] / gray.size)
+
+            name = member or os.path.basename(path)
+            names.append(os.path.join(folder, name))
+            timestamps.append(parse_name(name)[1] or np.nan)
+    finally:
+        for npz in npz_cache.values():
+            npz.close()
+
+    return names, np.asarray(timestamps, dtype=np.float64), np.asarray(ratios, dtype=np.float32).reshape(-1, len(thresholds))
+
+
+def apply_dark_mode(dark_ratios, folder_ids):
+    """
+    폴더별로 순서대로 다크 모드를 추적하여 감지 비율 계산
+    (어두운 비율 95% 이상 → 다크 모드, 5% 이하 → 라이트 모드, 그 사이는 이전 모드 유지)
+    디버그 이미지는 점프 시점 프레임만 있어 DetectionEngine의 배경 밝기 추적을 그대로 재현할 수 없으므로,
+    한 번에 바뀌는 낮/밤 전환에서 같은 결과를 내는 비율 규칙으로 근사한다.
+
+    Returns:
+        numpy.ndarray: 감지 비율 (다크 모드에서는 밝은 픽셀 비율)
+    """
+    detect_ratios = dark_ratios.copy()
+    dark_mode = np.zeros(dark_ratios.shape[1], dtype=bool)
+    previous_folder = None
+    for i in range(len(dark_ratios)):
+        if folder_ids[i] != previous_folder:
+            dark_mode[:] = False
+            previous_folder = folder_ids[i]
+        row = dark_ratios[i]
+        dark_mode = (dark_mode | (row >= 0.95)) & ~(row <= 0.05)
+        detect_ratios[i, dark_mode] = 1.0 - row[dark_mode]
+    return detect_ratios
+
+
+def session_progress(timestamps, folder_ids):
+    """
+    폴더 첫 이미지 기준 경과 시간으로 시간 곡선 속도 진행도 계산 (0: 시작, 1: 최대 속도)
+    첫 점프 전 시간은 알 수 없으므로 실제보다 약간 느린 속도로 추정됨
+    """
+    controller = SpeedController()
+    elapsed = 0.0
+    controller.clock = lambda: elapsed
+    controller.start_time = 0.0
+
+    progress = np.zeros(len(timestamps), dtype=np.float64)
+    for folder in np.unique(folder_ids):
+        mask = folder_ids == folder
+        times = timestamps[mask]
+        start = np.nanmin(times) if np.isfinite(times).any() else np.nan
+        values = []
+        for t in times:
+            elapsed = t - start if np.isfinite(t) else 0.0
+            values.append(controller.get_time_curve_speed_factor())
+        progress[mask] = (np.asarray(values) - 1.0) / (controller.MAX_SPEED_FACTOR - 1.0)
+    return progress
+
+
+def build_settings(thresholds, base_ratios, min_ratios, weak_cutoffs):
+    """설정 격자 (MIN_DARK_RATIO > BASE_DARK_RATIO 조합은 제외)"""
+    return [
+        (t, base, low, weak)
+        for t, base, low, weak in itertools.product(thresholds, base_ratios, min_ratios, weak_cutoffs)
+        if low <= base
+    ]
+
+
+def classify(detect_ratios, progress, thresholds, settings):
+    """
+    설정별 프레임 판단 (0: 감지 안 됨, 1: 약한 점프, 2: 강한 점프)
+
+    Returns:
+        numpy.ndarray: (설정 수, 프레임 수) uint8
+    """
+    column = {t: i for i, t in enumerate(thresholds)}
+    decisions = np.zeros((len(settings), len(detect_ratios)), dtype=np.uint8)
+    for s, (t, base, low, weak) in enumerate(settings):
+        ratio = detect_ratios[:, column[t]]
+        # SpeedController.get_dark_ratio_threshold와 같은 선형 보간
+        ratio_threshold = base - (base - low) * progress
+        detected = ratio > ratio_threshold
+        decisions[s] = detected * np.where(ratio <= weak, DECISION_WEAK_JUMP, DECISION_STRONG_JUMP)
+    return decisions
+
+
+def parse_list(text, cast=float):
+    return [cast(value) for value in text.split(',') if value]
+
+
+def main():
+    """파라미터 스윕 CLI"""
+    controller = SpeedController()
+    parser = argparse.ArgumentParser(description="디버그 이미지 폴더로 감지 파라미터를 병렬 재채점합니다.")
+    parser.add_argument('paths', nargs='*', help="디버그 이미지 폴더 (기본값: ./debug_captures*)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="작업 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument('--chunk', type=int, default=64, help="작업 단위당 이미지 수")
+    parser.add_argument('--thresholds', default='64,80,96,112,128,144,160,176,192', help="밝기 임계값 목록")
+    parser.add_argument('--base-ratios', default='0.03,0.05,0.07,0.1', help="BASE_DARK_RATIO 목록")
+    parser.add_argument('--min-ratios', default='0.02,0.03,0.05', help="MIN_DARK_RATIO 목록")
+    parser.add_argument('--weak-cutoffs', default='0.05,0.07,0.1,0.15', help="약한/강한 점프 기준 비율 목록")
+    parser.add_argument('--top', type=int, default=20, help="출력할 설정 수")
+    parser.add_argument('--output', help="프레임별 판단을 저장할 .npz 파일")
+    parser.add_argument('--csv', help="설정별 요약을 저장할 CSV 파일")
+    args = parser.parse_args()
+
+    thresholds = sorted(set(parse_list(args.thresholds, int)) | {DEFAULT_THRESHOLD})
+    base_ratios = sorted(set(parse_list(args.base_ratios)) | {controller.BASE_DARK_RATIO})
+    min_ratios = sorted(set(parse_list(args.min_ratios)) | {controller.MIN_DARK_RATIO})
+    weak_cutoffs = sorted(set(parse_list(args.weak_cutoffs)) | {DEFAULT_WEAK_CUTOFF})
+    settings = build_settings(thresholds, base_ratios, min_ratios, weak_cutoffs)
+    current_setting = (DEFAULT_THRESHOLD, controller.BASE_DARK_RATIO, controller.MIN_DARK_RATIO, DEFAULT_WEAK_CUTOFF)
+
+    folders = find_archives(args.paths)
+    items = [item for folder in folders for item in list_items(folder)]
+    if not items:
+        print("재채점할 디버그 이미지가 없습니다.")
+        return
+    print(f"{len(folders)}개 폴더, 이미지 {len(items)}장 | 설정 {len(settings)}개 | 작업 프로세스 {args.workers}개")
+
+    # 작업 단위로 나누어 병렬 처리 (결과는 순서대로 다시 합침)
+    start = time.perf_counter()
+    chunks = [items[i:i + args.chunk] for i in range(0, len(items), args.chunk)]
+    results = [None] * len(chunks)
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(scan_chunk, chunk, thresholds): i for i, chunk in enumerate(chunks)}
+        for done, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            if done % 50 == 0 or done == len(chunks):
+                print(f"  진행: {done}/{len(chunks)} 작업 단위")
+    scan_time = time.perf_counter() - start
+
+    names = [name for result in results for name in result[0]]
+    timestamps = np.concatenate([result[1] for result in results])
+    dark_ratios = np.concatenate([result[2] for result in results])
+    folder_ids = np.asarray([os.path.dirname(name) for name in names])
+
+    detect_ratios = apply_dark_mode(dark_ratios, folder_ids)
+    progress = session_progress(timestamps, folder_ids)
+    decisions = classify(detect_ratios, progress, thresholds, settings)
+
+    current = decisions[settings.index(current_setting)]
+    detected = np.count_nonzero(decisions, axis=1) / decisions.shape[1]
+    weak = np.count_nonzero(decisions == DECISION_WEAK_JUMP, axis=1) / decisions.shape[1]
+    agreement = np.count_nonzero(decisions == current, axis=1) / decisions.shape[1]
+
+    print(f"\n재채점 완료: {len(names)}장 ({scan_time:.1f}초, 초당 {len(names) / scan_time:.0f}장)")
+    print("점프 시점 이미지이므로 감지율이 높을수록 현재 봇의 점프 판단을 더 많이 재현합니다.")
+    print(f"{'임계값':>6} {'BASE':>6} {'MIN':>6} {'약한기준':>8} {'감지율':>8} {'약한':>7} {'강한':>7} {'현재와 일치':>10}")
+    order = np.lexsort((-agreement, -detected))
+    shown = list(order[:args.top])
+    current_index = settings.index(current_setting)
+    if current_index not in shown:
+        shown.append(current_index)
+    for s in shown:
+        t, base, low, weak_cut = settings[s]
+        marker = ' ← 현재' if s == current_index else ''
+        print(f"{t:>6} {base:>6.3f} {low:>6.3f} {weak_cut:>8.3f} {detected[s]*100:>7.1f}% {weak[s]*100:>6.1f}% "
+              f"{(detected[s] - weak[s])*100:>6.1f}% {agreement[s]*100:>9.1f}%{marker}")
+
+    if args.output:
+        np.savez_compressed(
+            args.output,
+            names=np.asarray(names),
+            settings=np.asarray(settings, dtype=np.float64),
+            decisions=decisions,
+            dark_ratios=dark_ratios,
+            thresholds=np.asarray(thresholds)
+        )
+        print(f"프레임별 판단 저장: {args.output}")
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['threshold', 'base_dark_ratio', 'min_dark_ratio', 'weak_cutoff',
+                             'detected', 'weak', 'strong', 'agreement_with_current'])
+            for s, (t, base, low, weak_cut) in enumerate(settings):
+                writer.writerow([t, base, low, weak_cut, round(detected[s], 5), round(weak[s], 5),
+                                 round(detected[s] - weak[s], 5), round(agreement[s], 5)])
+        print(f"설정별 요약 저장: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+구역별 장애물 판단 (ZoneDetector)
+캘리브레이션한 ROI를 가로 띠(지면, 낮은 공중, 높은 공중)와 세로 구간(공룡 쪽부터 앞쪽으로)으로 나누고,
+감지 엔진이 픽셀 비율 판단에 쓰는 장애물 마스크를 그대로 구역별 뷰(복사 없음)로 나눠 장애물 픽셀 수를 센다.
+구역은 서로 겹치지 않으므로 모든 구역을 세어도 마스크를 한 번 읽는 것과 같고, 새 버퍼도 만들지 않는다.
+
+대부분의 프레임은 장애물이 없거나 작으므로, 엔진이 이미 센 전체 장애물 픽셀 수로 어떤 동작 구역도
+임계값을 넘을 수 없으면 구역을 세지 않고 바로 '동작 없음'을 반환한다 (픽셀 비율 방식과 같은 비용).
+장애물이 있는 프레임도 판단이 정해지는 구역에서 멈추므로 보통 구역 한두 개만 센다.
+
+동작 구간(가까운 act_slices개)을 가까운 구간부터, 구간 안에서는 띠 우선순위 순서로 확인해
+장애물이 있는 첫 구역이 판단을 정한다. 먼 구간의 장애물은 다가올 때까지 판단에 쓰지 않으므로
+멀리 있는 선인장이 공룡 바로 앞의 새를 가리지 않는다. 같은 구간에서는 지면 띠가 우선하고,
+선인장의 앞쪽 가지처럼 큰 장애물의 앞부분만 공중 띠에 보이는 경우는 구간 바로 뒤(lookahead 폭)에
+우선순위가 더 높은 띠의 장애물이 이어지는지 확인해 그 띠가 구간에 들어올 때까지 기다린다.
+- 지면 띠 (선인장, 지면 근처 새): 점프
+- 낮은 공중 띠 (서 있는 공룡의 머리 높이 새): 웅크리기
+- 높은 공중 띠 (머리 위로 지나가는 새): 동작 없음
+
+기본 띠 비율은 ROI가 가장 높은 새의 위쪽(공룡 머리보다 약 45px 위)부터 지면 선 바로 위까지일 때
+Chrome 공룡 게임의 새 높이(위쪽 y 50/75/100)와 공룡 크기(서 있을 때 47px, 웅크릴 때 30px)에 맞춘 값이다.
+
+설정 예 (roi_config.json):
+    "detector": {"type": "zones", "slices": [0.3, 1.0], "act_slices": 1, "duck_duration": 0.3}
+"""
+
+import cv2
+
+# 띠 기본값: ROI 높이 비율 (위쪽 0 ~ 아래쪽 1), 목록 순서가 우선순위
+DEFAULT_BANDS = (
+    {"name": "ground", "top": 0.79, "bottom": 1.0, "action": "jump"},
+    {"name": "low", "top": 0.49, "bottom": 0.79, "action": "duck"},
+    {"name": "high", "top": 0.0, "bottom": 0.49, "action": None}
+)
+
+ZONE_ACTIONS = ('jump', 'duck', None)
+
+
+class ZoneDetector:
+    """
+    띠 x 구간 구역별 동작 판단
+
+    Args:
+        bands: 띠 목록 ({"name", "top", "bottom", "action"}, top/bottom은 ROI 높이 비율, 순서가 우선순위)
+        slices: 세로 구간의 오른쪽 경계 (ROI 너비 비율, 공룡 쪽부터 오름차순, 마지막은 1.0)
+        act_slices: 가까운 쪽부터 몇 개 구간에서 동작할지 (None이면 모든 구간, 나머지 먼 구간은 판단에 쓰지 않음)
+        duck_duration: 웅크리기 유지 시간 (초, 새가 낮은 공중 띠에 남아 있으면 다음 판단에서 연장)
+        lookahead: 구간 바로 뒤에서 같은 장애물의 뒷부분을 확인할 폭 (ROI 너비 비율)
+    """
+
+    def __init__(self, bands=None, slices=(1.0,), act_slices=None, duck_duration=0.3, lookahead=0.15):
+        self.bands = [dict(band) for band in (bands or DEFAULT_BANDS)]
+        for band in self.bands:
+            if band.get('action') not in ZONE_ACTIONS:
+                raise ValueError(f"알 수 없는 구역 동작: {band.get('action')} (사용 가능: jump, duck, null)")
+            if not 0.0 <= band['top'] < band['bottom'] <= 1.0:
+                raise ValueError(f"띠 범위가 올바르지 않습니다: {band}")
+        self.slices = sorted(float(edge) for edge in slices)
+        if not self.slices or self.slices[-1] != 1.0:
+            self.slices.append(1.0)
+        self.act_slices = min(act_slices or len(self.slices), len(self.slices))
+        self.duck_duration = duck_duration
+        self.lookahead = lookahead
+
+        self._mask = None  # 구역 뷰를 만든 마스크 버퍼 (엔진이 버퍼를 다시 만들 때만 바뀜)
+        self._zones = []  # (마스크 뷰, 구간 번호, 띠 이름, 동작, 면적, 뒤쪽 확인 뷰) - 동작 구간만, 가까운 구간부터, 구간 안에서는 띠 우선순위 순서
+        self._min_action_area = None  # 동작 구역 중 가장 작은 면적 (빠른 판단용)
+        self.last_zone = None  # 마지막으로 동작을 고른 구역 (띠 이름, 구간 번호)
+
+    def prepare(self, mask):
+        """마스크 버퍼를 구역별 뷰로 나눔 (엔진이 버퍼를 다시 만들 때만)"""
+        height, width = mask.shape
+        edges = [0] + [round(edge * width) for edge in self.slices]
+        lookahead = max(round(self.lookahead * width), 1)
+        rows = [(round(band['top'] * height), round(band['bottom'] * height)) for band in self.bands]
+
+        # 먼 구간은 판단에 쓰지 않으므로 구역을 만들지 않음
+        self._zones = []
+        for slice_index in range(self.act_slices):
+            x1, x2 = edges[slice_index], edges[slice_index + 1]
+            for band_index, band in enumerate(self.bands):
+                y1, y2 = rows[band_index]
+                area = (y2 - y1) * (x2 - x1)
+                if area <= 0:
+                    continue
+                # 구간 바로 뒤 좁은 띠에서 우선순위가 더 높은 띠를 확인할 뷰 (같은 장애물의 뒷부분인지)
+                guards = []
+                for guard_y1, guard_y2 in rows[:band_index]:
+                    guard_area = (guard_y2 - guard_y1) * (min(x2 + lookahead, width) - x2)
+                    if guard_area > 0:
+                        guards.append((mask[guard_y1:guard_y2, x2:x2 + lookahead], guard_area))
+                self._zones.append((mask[y1:y2, x1:x2], slice_index, band['name'], band['action'], area, guards))
+        # 뒤쪽의 동작 없는 띠 구역은 장애물이 있어도 결과가 같으므로 세지 않음
+        while self._zones and self._zones[-1][3] is None:
+            self._zones.pop()
+        action_areas = [area for _, _, _, action, area, _ in self._zones if action is not None]
+        self._min_action_area = min(action_areas) if action_areas else None
+        self._mask = mask
+
+    def evaluate(self, mask, obstacle_pixels, ratio_threshold):
+        """
+        구역별 장애물 픽셀 비율로 동작 선택
+
+        Args:
+            mask: 장애물 픽셀 마스크 (DetectionEngine.mask, 0/1 uint8)
+            obstacle_pixels: 마스크 전체의 장애물 픽셀 수 (엔진이 이미 센 값)
+            ratio_threshold: 구역 면적 대비 장애물 픽셀 비율 임계값 (속도에 따라 낮아짐)
+
+        Returns:
+            str: 'jump', 'duck' 또는 None
+        """
+        if mask is not self._mask:
+            self.prepare(mask)
+        # 모든 장애물 픽셀이 한 구역에 모여도 임계값을 넘지 못하면 구역을 세지 않음
+        if self._min_action_area is None or obstacle_pixels <= self._min_action_area * ratio_threshold:
+            return None
+
+        for view, slice_index, name, action, area, guards in self._zones:
+            if cv2.countNonZero(view) > area * ratio_threshold:
+                # 가장 가까운 구간에서 우선순위가 가장 높은 띠의 장애물이 판단을 정함 (높은 공중 띠의 새는 지나감)
+                if action is None:
+                    return None
+                # 구간 바로 뒤에 우선순위가 더 높은 띠의 장애물이 이어지면 선인장 앞쪽 가지 같은 큰 장애물의
+                # 앞부분이므로, 그 띠가 구간에 들어올 때까지 기다림
+                for guard_view, guard_area in guards:
+                    if cv2.countNonZero(guard_view) > guard_area * ratio_threshold:
+                        return None
+                self.last_zone = (name, slice_index)
+                return action
+        return None
+
+    def describe(self):
+        """마지막으로 동작을 고른 구역 (출력용)"""
+        if self.last_zone is None:
+            return "-"
+        name, slice_index = self.last_zone
+        return f"{name} 띠, {slice_index + 1}번째 구간"